@@ -1,7 +1,12 @@
 import datetime
-import tkinter as tk
-from tkinter import messagebox
+import traceback
 from utils import log
+from lazy_import import lazy_module
+
+# 신규 사용자 등록 팝업에서만 사용
+tk = lazy_module("tkinter")
+messagebox = lazy_module("tkinter.messagebox")
+simpledialog = lazy_module("tkinter.simpledialog")
 
 
 class AuthManager:
@@ -49,7 +54,6 @@ class AuthManager:
             
         except Exception as e:
             log(f"❌ 신규 사용자 등록 실패: {e}", "❌")
-            import traceback
             traceback.print_exc()
             return False
     
@@ -122,9 +126,6 @@ class AuthManager:
                 
                 # 사용자 이름 입력 받기 (기본값: "신규사용자")
                 try:
-                    import tkinter as tk
-                    from tkinter import simpledialog
-                    
                     root = tk.Tk()
                     root.withdraw()
                     
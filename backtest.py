@@ -0,0 +1,555 @@
+"""
+그리드 매매 백테스트
+과거 현재가 (CSV 파일 또는 price_samples 저장소) 를 실전 매매와 같은 규칙으로 재생
+- 티어 매칭: sheet_layout.match_tier_by_quantity (잔고 → 티어, 잔고 차이만큼 주문량 보정 / 로그·텔레그램 없음)
+- 주문 판단: final_trade_check 와 같은 조건 순서 (매수/매도 금지, 마지막 티어, 평단가, 가격 차이, 수량)
+- 미체결: 체결로 티어가 바뀌어 목표가와 달라진 주문은 취소 (reconcile_unfilled 와 같은 기준)
+- 체결: 지정가에 도달한 샘플에서 지정가로 전량 체결, 수수료 차감
+- 자동 차단: 예수금 부족 / 매수 가격 차이 과다 / 잔고 차이 과다 시 매수·매도 금지 (실전과 같이 해제 안 함)
+
+주문이나 체결이 없는 구간은 상태가 그대로이므로, 다음 사건(주문/체결) 위치를
+numpy 로 구간 단위 한 번에 찾음 → 1년치 분봉(약 10만 개)도 수 초 안에 완료
+numpy 가 없으면 같은 판정을 순수 파이썬으로 수행 (결과 동일, 느림)
+
+사용법:
+    python backtest.py --prices TQQQ.csv --tiers tiers.csv      # CSV 가격 + 티어 표 (V6:AC30 복사본)
+    python backtest.py --ticker TQQQ --days 20 --sheet 시트1    # 저장된 현재가 샘플 + 시트의 티어 표
+"""
+
+import csv
+import time
+import argparse
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # 없으면 순수 파이썬으로 판정
+
+from utils import safe_float
+from google_sheet import GoogleSheetManager
+from order_manager import price_side_ok, price_gap_ok
+from order_ledger import same_price
+from sheet_layout import FIELDS, a1_to_rowcol, to_grid, match_tier_by_quantity, sheet_float
+from price_samples import PriceSampleStore, PRICE_SAMPLES_DIR
+
+try:
+    from config import BACKTEST_FEE_RATE, BACKTEST_CASH
+except ImportError:
+    BACKTEST_FEE_RATE = 0.0025  # 매수/매도 수수료율 (체결 금액 대비)
+    BACKTEST_CASH = 0           # 시작 예수금 (0이면 무제한, 예수금 부족 차단 없음)
+
+SCAN_CHUNK = 1024  # 다음 사건 탐색 시 한 번에 판정할 샘플 수 (못 찾으면 두 배씩 늘림)
+SIDES = ("BUY", "SELL")
+
+# CSV 열 이름 후보 (소문자 비교)
+PRICE_COLUMNS = ("price", "close", "현재가", "종가")
+LOW_COLUMNS = ("low", "저가")
+HIGH_COLUMNS = ("high", "고가")
+TIME_COLUMNS = ("ts", "time", "date", "datetime", "timestamp", "시각", "일시")
+
+
+def _as_array(values):
+    if np is not None:
+        return np.asarray(values, dtype=np.float64)
+    return list(values)
+
+
+def load_price_csv(path):
+    """
+    가격 CSV 로드 (첫 줄은 열 이름)
+    가격 열: price/close/현재가/종가 중 하나, 저가/고가/시각 열은 있으면 사용
+
+    Returns:
+        dict: {'price', 'low', 'high', 'ts'} (없는 열은 None)
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+
+        def column(names):
+            for name in names:
+                if name in header:
+                    return header.index(name)
+            return None
+
+        price_col = column(PRICE_COLUMNS)
+        if price_col is None:
+            raise ValueError(f"가격 열이 없습니다 ({'/'.join(PRICE_COLUMNS)}): {path}")
+        low_col, high_col, ts_col = column(LOW_COLUMNS), column(HIGH_COLUMNS), column(TIME_COLUMNS)
+
+        price, low, high, ts = [], [], [], []
+        for row in reader:
+            if len(row) <= price_col or not row[price_col].strip():
+                continue
+            p = safe_float(row[price_col])
+            price.append(p)
+            if low_col is not None:
+                low.append(safe_float(row[low_col], p) if len(row) > low_col else p)
+            if high_col is not None:
+                high.append(safe_float(row[high_col], p) if len(row) > high_col else p)
+            if ts_col is not None:
+                ts.append(row[ts_col].strip() if len(row) > ts_col else "")
+
+    return {
+        'price': _as_array(price),
+        'low': _as_array(low) if low_col is not None else None,
+        'high': _as_array(high) if high_col is not None else None,
+        'ts': ts if ts_col is not None else None
+    }
+
+
+def load_price_samples(ticker, days=0, base_dir=PRICE_SAMPLES_DIR):
+    """
+    price_samples 저장소에서 현재가 로드
+
+    Args:
+        ticker: 종목 코드
+        days: 최근 N일 (0이면 전체)
+        base_dir: 저장 위치
+
+    Returns:
+        dict: load_price_csv 와 같은 형식 (저가/고가 없음)
+    """
+    store = PriceSampleStore(base_dir, enabled=False)
+    selected = store.days(ticker)
+    if days > 0:
+        selected = selected[-days:]
+    if not selected:
+        return {'price': _as_array([]), 'low': None, 'high': None, 'ts': []}
+
+    start = datetime.strptime(selected[0], '%Y-%m-%d').timestamp()
+    price, ts = [], []
+    for r in store.range(ticker, start):
+        price.extend(r.price.tolist())
+        ts.extend(datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S') for t in r.ts.tolist())
+    return {'price': _as_array(price), 'low': None, 'high': None, 'ts': ts}
+
+
+def load_tier_csv(path):
+    """
+    티어 표 CSV (시트 V6:AC30 을 그대로 복사한 8개 열: 티어명, 잔고, X, 평단가, 매수가, 매수량, 매도가, 매도량)
+    → match_tier_by_quantity 가 읽는 시트 격자 (첫 줄이 열 이름이면 건너뜀, 읽은 티어 행까지만)
+    """
+    top, left = a1_to_rowcol(FIELDS['tiers'].a1.split(':')[0])
+    values = {}
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = [row for row in csv.reader(f) if any(v.strip() for v in row)]
+    if rows and safe_float(rows[0][1] if len(rows[0]) > 1 else "", None) is None:
+        rows = rows[1:]
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row[:8]):
+            values[(top + r, left + c)] = value.strip()
+    return to_grid(values, rows=top - 1 + len(rows))
+
+
+class GridBacktest:
+    """티어 표 기반 그리드 매매 재생"""
+
+    def __init__(self, sheet_data, last_tier=None, fee_rate=BACKTEST_FEE_RATE, cash=BACKTEST_CASH,
+                 avg_source="prev", buy_stop=False, sell_stop=False):
+        """
+        Args:
+            sheet_data: 시트 격자 (load_trading_data 의 sheet_data 또는 load_tier_csv 결과)
+            last_tier: 마지막 티어 (E12, 이 티어에서는 매수 안 함)
+            fee_rate: 수수료율
+            cash: 시작 예수금 (0이면 무제한)
+            avg_source: 평단가 조건 기준
+                "prev" - 직전 샘플 가격 (실전과 같음: 평단가 자리에 직전 사이클이 쓴 K8 현재가가 전달됨)
+                "tier" - 티어 표의 평단가 (Y열)
+            buy_stop: 시작 시 매수 금지 (E18)
+            sell_stop: 시작 시 매도 금지 (E20)
+        """
+        self.sheet_data = sheet_data
+        self.last_tier = last_tier
+        self.fee_rate = fee_rate
+        self.cash = cash
+        self.avg_source = avg_source
+        self.initial_stops = {"BUY": bool(buy_stop), "SELL": bool(sell_stop)}
+        self._tiers = {}  # {잔고: 티어 데이터} (같은 잔고는 한 번만 매칭)
+
+    def tier_for(self, balance):
+        """잔고 → 티어 데이터 (match_tier_by_quantity 결과 + 평단가)"""
+        if balance not in self._tiers:
+            tier = match_tier_by_quantity(self.sheet_data, balance)
+            if tier:
+                tier['avg_price'] = sheet_float(self.sheet_data[tier['row_idx'] - 1][24])  # Y열
+            self._tiers[balance] = tier
+        return self._tiers[balance]
+
+    # ------------------------------------------------------------------
+    # 구간 판정
+    # ------------------------------------------------------------------
+    def _first(self, cond, start, end, *columns):
+        """
+        start 이후 cond(열 값...) 가 처음 참인 위치 (없으면 end)
+        numpy 면 SCAN_CHUNK 부터 두 배씩 늘린 구간을 한 번에 판정, 아니면 샘플별 판정
+        """
+        lo, size = start, SCAN_CHUNK
+        while lo < end:
+            hi = min(end, lo + size)
+            if np is not None:
+                mask = cond(*(col[lo:hi] if isinstance(col, np.ndarray) else col for col in columns))
+                hit = np.flatnonzero(mask)
+                if hit.size:
+                    return lo + int(hit[0])
+            else:
+                for i in range(lo, hi):
+                    if cond(*(col[i] if isinstance(col, list) else col for col in columns)):
+                        return i
+            lo, size = hi, size * 2
+        return end
+
+    def _avg(self, tier, avg, i):
+        return tier['avg_price'] if self.avg_source == "tier" else avg[i]
+
+    def _trigger(self, side, tier, stops, avg):
+        """
+        주문 판단이 필요한 샘플 조건 (상태가 같은 동안 final_trade_check 결과가 바뀌는 첫 샘플)
+
+        Returns:
+            tuple: (조건 함수, 평단가 열) - 주문 불가 상태면 None
+        """
+        if stops[side] or not tier:
+            return None
+        avg_col = tier['avg_price'] if self.avg_source == "tier" else avg
+        if side == "BUY":
+            if str(tier['curr_tier']) == str(self.last_tier):
+                return None
+            buy_p = tier['buy_p']
+            if tier['buy_q'] > 0:
+                # 평단가 조건을 통과하면 주문하거나 (가격 차이 과다로) 매수 금지 → 어느 쪽이든 상태 변화
+                return (lambda p, a: price_side_ok("BUY", p, a)), avg_col
+            return (lambda p, a: price_side_ok("BUY", p, a) & _not(price_gap_ok("BUY", buy_p, p))), avg_col
+        if tier['sell_q'] <= 0:
+            return None
+        sell_p = tier['sell_p']
+        return (lambda p, a: price_side_ok("SELL", p, a) & price_gap_ok("SELL", sell_p, p)), avg_col
+
+    def _check(self, side, tier, stops, price, avg_price):
+        """한 샘플에서의 최종 판단 (final_trade_check 와 같은 순서) → (주문 가능 여부, 사유)"""
+        if side == "BUY":
+            if stops["BUY"]:
+                return False, "매수금지"
+            if str(tier['curr_tier']) == str(self.last_tier):
+                return False, "마지막티어"
+            if not price_side_ok("BUY", price, avg_price):
+                return False, "평단가"
+            if not price_gap_ok("BUY", float(tier['buy_p']), price):
+                return False, "가격차이과다"
+            if tier['buy_q'] <= 0:
+                return False, "매수량없음"
+            return True, "매수조건충족"
+        if stops["SELL"]:
+            return False, "매도금지"
+        if not price_side_ok("SELL", price, avg_price):
+            return False, "평단가"
+        if not price_gap_ok("SELL", float(tier['sell_p']), price):
+            return False, "가격차이과다"
+        if tier['sell_q'] <= 0:
+            return False, "매도량없음"
+        return True, "매도조건충족"
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run(self, price, balance=0, low=None, high=None):
+        """
+        가격 이력 재생
+
+        Args:
+            price: 현재가 열 (numpy 배열 또는 list, 샘플 1개 = 매매 사이클 1회)
+            balance: 시작 잔고
+            low: 샘플별 저가 (있으면 매수 체결 판정에 사용)
+            high: 샘플별 고가 (있으면 매도 체결 판정에 사용)
+
+        Returns:
+            dict: 체결 목록, 잔고/예수금 변화, 주문/취소/차단 집계 (summarize() 입력)
+        """
+        started = time.perf_counter()
+        n = len(price)
+        if np is not None:
+            price = np.asarray(price, dtype=np.float64)
+            low = price if low is None else np.asarray(low, dtype=np.float64)
+            high = price if high is None else np.asarray(high, dtype=np.float64)
+            avg = np.concatenate((price[:1], price[:-1])) if n else price
+        else:
+            price = list(price)
+            low = price if low is None else list(low)
+            high = price if high is None else list(high)
+            avg = price[:1] + price[:-1]
+
+        cash = float(self.cash)
+        stops = dict(self.initial_stops)
+        orders = {"BUY": None, "SELL": None}  # {'price', 'qty', 'tier', 'placed'}
+        counts = {key: {"BUY": 0, "SELL": 0} for key in ('placed', 'filled', 'cancelled')}
+        fills = []                          # [(샘플, 방향, 티어, 가격, 수량, 수수료)]
+        changes = [(0, balance, cash)]      # 잔고/예수금이 바뀐 샘플 [(샘플, 잔고, 예수금)]
+        stop_events = []                    # [(샘플, 사유)]
+        tier = None
+        i = 0
+
+        while i < n:
+            # 1. 미체결 주문 체결 (이전 샘플에서 낸 주문만)
+            for side in SIDES:
+                order = orders[side]
+                if order is None or order['placed'] >= i:
+                    continue
+                if (side == "BUY" and low[i] <= order['price']) or (side == "SELL" and high[i] >= order['price']):
+                    amount = order['price'] * order['qty']
+                    fee = amount * self.fee_rate
+                    if side == "BUY":
+                        balance += order['qty']
+                        cash -= amount + fee
+                    else:
+                        balance -= order['qty']
+                        cash += amount - fee
+                    fills.append((i, side, order['tier'], order['price'], order['qty'], fee))
+                    counts['filled'][side] += 1
+                    changes.append((i, balance, cash))
+                    orders[side] = None
+
+            # 2. 잔고로 티어 매칭 + 잔고 차이 자동 차단
+            tier = self.tier_for(balance)
+            if tier and tier['stock_diff']:
+                diff = tier['stock_diff']
+                if diff > 0 and diff > tier['original_buy_q'] and not stops["BUY"]:
+                    stops["BUY"] = True
+                    stop_events.append((i, f"잔고 초과({diff:+d}주) → 매수 금지"))
+                elif diff < 0 and abs(diff) > tier['original_sell_q'] and not stops["SELL"]:
+                    stops["SELL"] = True
+                    stop_events.append((i, f"잔고 부족({diff:+d}주) → 매도 금지"))
+
+            # 3. 목표가와 다른 미체결 주문 취소
+            for side in SIDES:
+                order = orders[side]
+                target = (tier['buy_p'] if side == "BUY" else tier['sell_p']) if tier else 0
+                if order is not None and not (target > 0 and same_price(order['price'], target)):
+                    counts['cancelled'][side] += 1
+                    orders[side] = None
+
+            # 4. 미체결이 없는 방향 주문 판단
+            if tier:
+                p = float(price[i])
+                avg_price = float(self._avg(tier, avg, i))
+                for side in SIDES:
+                    if orders[side] is not None:
+                        continue
+                    ok, reason = self._check(side, tier, stops, p, avg_price)
+                    if side == "BUY" and reason == "가격차이과다":
+                        stops["BUY"] = True
+                        stop_events.append((i, "가격 차이 과다 → 매수 금지"))
+                    if not ok:
+                        continue
+                    order_p = float(tier['buy_p'] if side == "BUY" else tier['sell_p'])
+                    qty = int(tier['buy_q'] if side == "BUY" else min(tier['sell_q'], balance))
+                    if qty <= 0:
+                        continue
+                    if side == "BUY" and self.cash and order_p * qty * (1 + self.fee_rate) > cash:
+                        stops["BUY"] = True
+                        stop_events.append((i, "예수금 부족 → 매수 금지"))
+                        continue
+                    orders[side] = {'price': order_p, 'qty': qty, 'tier': tier['curr_tier'], 'placed': i}
+                    counts['placed'][side] += 1
+
+            # 5. 다음 사건 위치 (체결 또는 주문 판단이 바뀌는 샘플)
+            nxt = n
+            for side in SIDES:
+                order = orders[side]
+                if order is not None:
+                    limit = order['price']
+                    if side == "BUY":
+                        nxt = min(nxt, self._first(lambda lo: lo <= limit, i + 1, nxt, low))
+                    else:
+                        nxt = min(nxt, self._first(lambda hi: hi >= limit, i + 1, nxt, high))
+                else:
+                    trigger = self._trigger(side, tier, stops, avg)
+                    if trigger:
+                        cond, avg_col = trigger
+                        nxt = min(nxt, self._first(cond, i + 1, nxt, price, avg_col))
+            i = nxt
+
+        return {
+            'bars': n,
+            'price': price,
+            'cash': float(self.cash),
+            'fee_rate': self.fee_rate,
+            'fills': fills,
+            'changes': changes,
+            'counts': counts,
+            'unfilled': [dict(order, side=side) for side, order in orders.items() if order is not None],
+            'stop_events': stop_events,
+            'final_tier': tier['curr_tier'] if tier else None,
+            'elapsed': time.perf_counter() - started
+        }
+
+
+def _not(mask):
+    """스칼라/배열 공통 부정"""
+    if np is not None and isinstance(mask, np.ndarray):
+        return ~mask
+    return not mask
+
+
+def equity_curve(price, changes):
+    """
+    샘플별 평가금액 (예수금 + 잔고 x 현재가)
+
+    Args:
+        price: 현재가 열
+        changes: run() 의 잔고/예수금 변화 [(샘플, 잔고, 예수금)]
+    """
+    if np is not None:
+        at = np.array([c[0] for c in changes])
+        seg = np.searchsorted(at, np.arange(len(price)), side='right') - 1
+        bal = np.array([c[1] for c in changes], dtype=np.float64)[seg]
+        cash = np.array([c[2] for c in changes], dtype=np.float64)[seg]
+        return cash + bal * price
+    curve = []
+    k = 0
+    for i, p in enumerate(price):
+        while k + 1 < len(changes) and changes[k + 1][0] <= i:
+            k += 1
+        curve.append(changes[k][2] + changes[k][1] * p)
+    return curve
+
+
+def max_drawdown(curve):
+    """최대 낙폭 → (금액, 고점 대비 비율 %) (고점이 0 이하면 비율은 None)"""
+    if np is not None:
+        if not len(curve):
+            return 0.0, None
+        peak = np.maximum.accumulate(curve)
+        dd = peak - curve
+        worst = int(np.argmax(dd))
+        pct = dd[worst] / peak[worst] * 100 if peak[worst] > 0 else None
+        return float(dd[worst]), pct
+    peak, worst, worst_peak = float('-inf'), 0.0, 0.0
+    for value in curve:
+        peak = max(peak, value)
+        if peak - value > worst:
+            worst, worst_peak = peak - value, peak
+    return worst, (worst / worst_peak * 100 if worst_peak > 0 else None)
+
+
+def tier_occupancy(result, tier_for):
+    """
+    티어별 체류 샘플 수와 체결 횟수
+
+    Returns:
+        dict: {티어명: {'bars', 'BUY', 'SELL'}} (잔고가 바뀐 순서)
+    """
+    occupancy = {}
+    changes = result['changes']
+    for k, (start, balance, _) in enumerate(changes):
+        end = changes[k + 1][0] if k + 1 < len(changes) else result['bars']
+        tier = tier_for(balance)
+        name = tier['curr_tier'] if tier else "매칭실패"
+        entry = occupancy.setdefault(name, {'bars': 0, 'BUY': 0, 'SELL': 0})
+        entry['bars'] += end - start
+    for _, side, name, _, _, _ in result['fills']:
+        occupancy.setdefault(name, {'bars': 0, 'BUY': 0, 'SELL': 0})[side] += 1
+    return occupancy
+
+
+def summarize(result, tier_for):
+    """run() 결과 → 손익/낙폭/티어 점유율 요약"""
+    curve = equity_curve(result['price'], result['changes'])
+    start_equity = result['changes'][0][2] + result['changes'][0][1] * float(result['price'][0]) if result['bars'] else 0.0
+    end_equity = float(curve[-1]) if result['bars'] else start_equity
+    dd, dd_pct = max_drawdown(curve)
+    _, balance, cash = result['changes'][-1]
+    funded = result['cash'] > 0  # 예수금 무제한이면 평가금액이 손익 곡선이므로 비율 생략
+    return {
+        'pnl': end_equity - start_equity,
+        'return_pct': (end_equity - start_equity) / start_equity * 100 if funded and start_equity > 0 else None,
+        'fees': sum(f[5] for f in result['fills']),
+        'max_drawdown': dd,
+        'max_drawdown_pct': dd_pct if funded else None,
+        'final_balance': balance,
+        'final_cash': cash,
+        'occupancy': tier_occupancy(result, tier_for)
+    }
+
+
+def print_report(result, summary, ts=None, show_trades=False):
+    counts = result['counts']
+    bars = result['bars']
+    period = f"{ts[0]} ~ {ts[-1]} / " if ts else ""
+    print(f"\n📊 {period}샘플 {bars:,}개 / 재생 {result['elapsed']:.2f}초 ({'numpy' if np is not None else 'python'})")
+
+    ret = f" ({summary['return_pct']:+.2f}%)" if summary['return_pct'] is not None else ""
+    dd_pct = f" ({summary['max_drawdown_pct']:.2f}%)" if summary['max_drawdown_pct'] is not None else ""
+    print(f"\n💰 손익: ${summary['pnl']:,.2f}{ret} / 수수료: ${summary['fees']:,.2f} (수수료율 {result['fee_rate'] * 100:.3f}%)")
+    print(f"📉 최대 낙폭: ${summary['max_drawdown']:,.2f}{dd_pct}")
+    print(f"📦 최종 잔고: {summary['final_balance']}주 / 최종 예수금: ${summary['final_cash']:,.2f} / 티어: {result['final_tier']}")
+
+    print(f"\n🧾 주문 집계 (매수 / 매도)")
+    for key, label in (('placed', "주문"), ('filled', "체결"), ('cancelled', "취소(목표가 변경)")):
+        print(f"  {label:<14}{counts[key]['BUY']:>6}{counts[key]['SELL']:>8}")
+    for order in result['unfilled']:
+        print(f"  ⏳ 미체결 잔여: {order['side']} {order['price']} x {order['qty']}주 (티어 {order['tier']})")
+    for i, reason in result['stop_events']:
+        at = ts[i] if ts else f"#{i}"
+        print(f"  🔒 {at}: {reason}")
+
+    print(f"\n🪜 티어 점유율")
+    print(f"{'티어':<10}{'점유율':>8}{'샘플':>10}{'매수':>6}{'매도':>6}")
+    for name, entry in summary['occupancy'].items():
+        share = entry['bars'] / bars * 100 if bars else 0
+        print(f"{str(name):<10}{share:>7.1f}%{entry['bars']:>10,}{entry['BUY']:>6}{entry['SELL']:>6}")
+
+    if show_trades:
+        print(f"\n📒 체결 내역")
+        for i, side, name, p, qty, fee in result['fills']:
+            at = ts[i] if ts else f"#{i}"
+            print(f"  {at}  {side:<4} {str(name):<6} {p:>10.2f} x {qty:<5} 수수료 {fee:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="그리드 매매 백테스트")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--prices', help="가격 CSV (price/close 열, low/high/ts 열은 선택)")
+    source.add_argument('--ticker', help="price_samples 저장소의 종목 코드")
+    parser.add_argument('--days', type=int, default=0, help="--ticker 사용 시 최근 N일만 (0이면 전체)")
+    parser.add_argument('--samples-dir', default=PRICE_SAMPLES_DIR, help="현재가 샘플 저장 폴더")
+    tiers = parser.add_mutually_exclusive_group(required=True)
+    tiers.add_argument('--tiers', help="티어 표 CSV (시트 V6:AC30 복사본)")
+    tiers.add_argument('--sheet', help="구글 시트 이름 (티어 표, 마지막 티어, 매수/매도 금지 사용)")
+    parser.add_argument('--last-tier', help="마지막 티어 (E12)")
+    parser.add_argument('--balance', type=int, default=0, help="시작 잔고")
+    parser.add_argument('--cash', type=float, default=BACKTEST_CASH, help="시작 예수금 (0이면 무제한)")
+    parser.add_argument('--fee', type=float, default=BACKTEST_FEE_RATE, help="수수료율 (0.0025 = 0.25%%)")
+    parser.add_argument('--avg', choices=("prev", "tier"), default="prev",
+                        help="평단가 조건 기준 (prev: 직전 샘플 가격 - 실전과 같음 / tier: 티어 표 평단가)")
+    parser.add_argument('--trades', action='store_true', help="체결 내역 출력")
+    args = parser.parse_args()
+
+    last_tier, buy_stop, sell_stop = args.last_tier, False, False
+    if args.sheet:
+        data = GoogleSheetManager().load_trading_data(args.sheet)
+        if not data:
+            print(f"❌ 시트({args.sheet}) 로드 실패")
+            return
+        sheet_data = data['sheet_data']
+        last_tier = last_tier or data['last_tier']
+        buy_stop, sell_stop = data['fields']['buy_stop'], data['fields']['sell_stop']
+        ticker = args.ticker or data['ticker']
+    else:
+        sheet_data = load_tier_csv(args.tiers)
+        ticker = args.ticker
+
+    series = load_price_csv(args.prices) if args.prices else load_price_samples(ticker, args.days, args.samples_dir)
+    if not len(series['price']):
+        print("❌ 재생할 가격 데이터가 없습니다.")
+        return
+
+    engine = GridBacktest(sheet_data, last_tier=last_tier, fee_rate=args.fee, cash=args.cash,
+                          avg_source=args.avg, buy_stop=buy_stop, sell_stop=sell_stop)
+    print(f"🧪 백테스트 시작: 샘플 {len(series['price']):,}개 / 시작 잔고 {args.balance}주")
+    result = engine.run(series['price'], balance=args.balance, low=series['low'], high=series['high'])
+    print_report(result, summarize(result, engine.tier_for), series['ts'], args.trades)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+변화 없는 시트 건너뛰기 (매매 사이클 게이트)
+시트를 전체 처리(종목 입력, 계좌 선택, 잔고/미체결 확인, 시트 쓰기)하기 전에
+현재가만 먼저 읽어 마지막 전체 처리 때와 비교
+- 현재가, 확인된 잔고, 시트 내용(A1:AC30 해시), 시장 세션이 모두 같고
+- 미체결 주문이 없으면 → 주문 판단이 바뀔 수 없으므로 이번 사이클은 건너뜀
+- GATE_FULL_EVERY 번 연속 건너뛰면 한 번은 반드시 전체 처리 (수동 매매 등 대비)
+"""
+
+import hashlib
+
+from utils import log, get_market_session
+
+try:
+    from config import GATE_ENABLED, GATE_FULL_EVERY
+except ImportError:
+    GATE_ENABLED = True     # 변화 없는 시트 건너뛰기 사용 여부
+    GATE_FULL_EVERY = 10    # 연속으로 건너뛸 수 있는 최대 사이클 수
+
+
+def sheet_hash(sheet_data):
+    """시트 데이터(2차원 값 목록) 해시"""
+    return hashlib.blake2b(repr(sheet_data).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def valid_quote(price):
+    """조회 실패("0.00", None)가 아닌 현재가인지 여부"""
+    try:
+        return float(price) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+class ChangeGate:
+    """시트별 마지막 전체 처리 상태 비교"""
+
+    def __init__(self, ledger, full_every=GATE_FULL_EVERY, enabled=GATE_ENABLED):
+        """
+        Args:
+            ledger: OrderLedger (계좌/종목별 미체결 주문, 확인된 잔고)
+            full_every: 연속으로 건너뛸 수 있는 최대 사이클 수
+            enabled: False면 항상 전체 처리
+        """
+        self.ledger = ledger
+        self.full_every = full_every
+        self.enabled = enabled
+        self.last = {}  # {sheet_name: {'state': (현재가, 잔고, 시트 해시, 세션), 'skips': 연속 건너뛴 횟수}}
+
+    def _state(self, ticker, price, sheet_data, balance):
+        return "{:.2f}".format(float(price)), balance, sheet_hash(sheet_data), get_market_session()
+
+    def should_skip(self, sheet_name, acc_cnt, ticker, price, sheet_data):
+        """
+        전체 처리를 건너뛰어도 되는지 판단
+
+        Args:
+            sheet_name: 시트 이름
+            acc_cnt: 계좌 순번
+            ticker: 종목 코드
+            price: 방금 읽은 현재가
+            sheet_data: 이번 사이클에 읽은 시트 데이터
+
+        Returns:
+            bool: 건너뛰어도 되면 True
+        """
+        if not self.enabled or not valid_quote(price):
+            return False
+        entry = self.last.get(sheet_name)
+        if entry is None:
+            return False
+        if self.ledger.working_orders(acc_cnt, ticker):
+            return False
+        if entry['skips'] >= self.full_every:
+            log(f"🔁 {sheet_name}: {entry['skips']}회 연속 변화 없음 → 정기 전체 처리", "🔎")
+            del self.last[sheet_name]
+            return False
+
+        balance = self.ledger.balance(acc_cnt, ticker)
+        if balance is None or self._state(ticker, price, sheet_data, balance) != entry['state']:
+            return False
+        entry['skips'] += 1
+        return True
+
+    def record(self, sheet_name, acc_cnt, ticker, price, hts_stock_q, sheet_data):
+        """
+        전체 처리 완료 상태 기록 (원장이 현재 잔고를 확인한 경우에만)
+
+        Args:
+            hts_stock_q: 이번 처리에서 읽은 HTS 잔고
+        """
+        balance = self.ledger.balance(acc_cnt, ticker)
+        if not valid_quote(price) or balance is None or balance != hts_stock_q:
+            self.last.pop(sheet_name, None)
+            return
+        self.last[sheet_name] = {'state': self._state(ticker, price, sheet_data, balance), 'skips': 0}
+
+    def forget(self, sheet_name=None):
+        """기록 삭제 (다음 사이클은 전체 처리)"""
+        if sheet_name is None:
+            self.last.clear()
+        else:
+            self.last.pop(sheet_name, None)
@@ -0,0 +1,276 @@
+"""
+다중 HTS 작업 PC 분산 실행 (코디네이터 / 워커)
+HTS 1개 세션은 한 번에 하나의 화면 조작만 가능하므로
+그리드 매매 시트를 여러 PC(워커)에 나누어 실행
+
+- 코디네이터: task.json 의 그리드 매매 작업을 워커에 임대(lease)로 배정
+  · 같은 계좌+종목의 시트는 같은 워커에 배정 (원장/중복 주문 방지가 워커 단위이므로)
+  · 하트비트가 LEASE_SEC * 1.5 동안 없으면 워커를 제외하고 시트를 다른 워커에 재배정
+- 워커: 하트비트로 임대를 갱신하고 배정받은 시트만 기존 handle_grid_trading 으로 실행
+  · 시트마다 실행 직전에 임대를 다시 확인 (사이클 도중 재배치/만료된 시트는 건너뜀)
+  · 하트비트에 실행 중인 시트를 함께 보고 → 코디네이터는 그 시트를 다음 하트비트까지 다른 워커에 넘기지 않음
+  · 코디네이터와 연결이 끊기면 마지막 갱신 후 LEASE_SEC 까지만 기존 시트 실행 (이중 실행 방지)
+
+통신: 표준 라이브러리 XML-RPC (추가 설치 없음)
+"""
+
+import os
+import time
+import socket
+import threading
+from utils import log
+from task_registry import TaskRegistry, GridTask, GRID_TYPE
+from lazy_import import lazy_module
+
+# 분산 실행 모드(CLUSTER_ROLE)에서만 로드
+xmlrpc_server = lazy_module("xmlrpc.server")
+xmlrpc_client = lazy_module("xmlrpc.client")
+
+try:
+    from config import CLUSTER_ROLE, CLUSTER_HOST, CLUSTER_PORT, CLUSTER_WORKER_ID, LEASE_SEC, HEARTBEAT_SEC
+except ImportError:
+    CLUSTER_ROLE = "standalone"      # "standalone" / "coordinator" / "worker"
+    CLUSTER_HOST = "127.0.0.1"       # 코디네이터 주소
+    CLUSTER_PORT = 8765              # 코디네이터 포트
+    CLUSTER_WORKER_ID = None         # None이면 "호스트명-PID"
+    LEASE_SEC = 60                   # 임대 유효 시간 (초)
+    HEARTBEAT_SEC = 15               # 워커 하트비트 주기 (초)
+
+DEAD_FACTOR = 1.5  # 워커 제외까지 LEASE_SEC 배수 (워커 쪽 임대 만료보다 늦게)
+
+
+def default_worker_id():
+    return CLUSTER_WORKER_ID or f"{socket.gethostname()}-{os.getpid()}"
+
+
+class Coordinator:
+    """그리드 매매 작업 배정기 (임대 + 하트비트)"""
+
+    def __init__(self, registry=None, lease_sec=LEASE_SEC):
+        self.registry = registry or TaskRegistry()
+        self.lease_sec = lease_sec
+        self.workers = {}    # {worker_id: 마지막 하트비트 시각}
+        self.leases = {}     # {sheet_name: worker_id}
+        self.affinity = {}   # {sheet_name: "계좌|종목"} (워커가 시트를 읽은 뒤 보고)
+        self.draining = {}   # {sheet_name: 이전 워커} 재배치 중 (이전 워커가 다음 하트비트에서 반납)
+        self.active = {}     # {worker_id: 하트비트 당시 실행 중인 sheet_name} (다음 하트비트까지 임대 유지)
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        """하트비트가 끊긴 워커 제외 및 시트 반납"""
+        for worker_id, last_seen in list(self.workers.items()):
+            if now - last_seen <= self.lease_sec * DEAD_FACTOR:
+                continue
+            del self.workers[worker_id]
+            self.active.pop(worker_id, None)
+            orphaned = [s for s, w in self.leases.items() if w == worker_id]
+            for sheet_name in orphaned:
+                del self.leases[sheet_name]
+                self.draining.pop(sheet_name, None)
+            log(f"💀 워커 {worker_id} 응답 없음 → 시트 {len(orphaned)}개 재배정", "⚠️")
+
+    def _assign(self):
+        """배정되지 않은 시트를 워커에 배정 (같은 계좌+종목은 같은 워커, 그 외에는 가장 적게 가진 워커)"""
+        if not self.workers:
+            return
+        active = {t.sheet_name for t in self.registry.grid_tasks if t.status != "PAUSED"}
+        for sheet_name, worker_id in list(self.leases.items()):
+            if sheet_name not in active and self.active.get(worker_id) != sheet_name:
+                del self.leases[sheet_name]
+                self.draining.pop(sheet_name, None)
+
+        load = {w: 0 for w in self.workers}
+        for worker_id in self.leases.values():
+            load[worker_id] += 1
+
+        for sheet_name in sorted(active - set(self.leases)):
+            key = self.affinity.get(sheet_name)
+            owner = None
+            if key:
+                owner = next((w for s, w in self.leases.items() if self.affinity.get(s) == key), None)
+            if owner is None:
+                owner = min(load, key=lambda w: (load[w], w))
+            self.leases[sheet_name] = owner
+            load[owner] += 1
+            log(f"📌 {sheet_name} → 워커 {owner}", "🗂️")
+
+    def _rebalance(self):
+        """
+        워커 간 시트 수 차이가 2 이상이면 많은 워커의 시트를 재배치 대상으로 표시
+        (이전 워커가 다음 하트비트로 반납한 뒤에 새 워커에 배정 → 이중 실행 없음)
+        """
+        if len(self.workers) < 2:
+            return
+        load = {w: 0 for w in self.workers}
+        for sheet_name, worker_id in self.leases.items():
+            if sheet_name not in self.draining:
+                load[worker_id] += 1
+        while True:
+            busiest = max(load, key=lambda w: (load[w], w))
+            idlest = min(load, key=lambda w: (load[w], w))
+            if load[busiest] - load[idlest] < 2:
+                return
+            # 같은 계좌+종목 시트가 함께 있는 시트는 옮기지 않음
+            keys = [self.affinity.get(s) for s, w in self.leases.items() if w == busiest]
+            movable = [
+                s for s, w in sorted(self.leases.items(), reverse=True)
+                if w == busiest and s not in self.draining
+                and (self.affinity.get(s) is None or keys.count(self.affinity.get(s)) == 1)
+            ]
+            if not movable:
+                return
+            self.draining[movable[0]] = busiest
+            load[busiest] -= 1
+            load[idlest] += 1
+            log(f"⚖️ {movable[0]}: 워커 {busiest} 에서 재배치 대기", "🗂️")
+
+    def heartbeat(self, worker_id, affinity=None, running=None):
+        """
+        워커 하트비트 (XML-RPC)
+
+        Args:
+            worker_id: 워커 ID
+            affinity: {sheet_name: "계좌|종목"} 워커가 읽은 시트 정보
+            running: 워커가 지금 실행 중인 sheet_name (없으면 None)
+
+        Returns:
+            dict: {'lease_sec': 임대 시간, 'tasks': [{'key', 'status', 'details'}, ...]}
+        """
+        now = time.time()
+        with self._lock:
+            if worker_id not in self.workers:
+                log(f"🖥️ 워커 참여: {worker_id}", "✅")
+            self.workers[worker_id] = now
+            if affinity:
+                self.affinity.update(affinity)
+            if running:
+                self.active[worker_id] = running
+            else:
+                self.active.pop(worker_id, None)
+
+            # 이 워커가 반납하기로 한 시트는 이번 응답부터 빠지므로 다른 워커에 배정 가능
+            # (아직 실행 중이면 반납은 다음 하트비트로 미룸)
+            for sheet_name in [s for s, w in self.draining.items() if w == worker_id]:
+                if sheet_name == running:
+                    continue
+                del self.draining[sheet_name]
+                if self.leases.get(sheet_name) == worker_id:
+                    del self.leases[sheet_name]
+
+            self.registry.refresh()
+            self._expire(now)
+            self._assign()
+            self._rebalance()
+
+            by_name = {t.sheet_name: t for t in self.registry.grid_tasks if t.status != "PAUSED"}
+            tasks = [
+                {'key': str(by_name[s].key), 'status': by_name[s].status, 'details': by_name[s].details}
+                for s, w in sorted(self.leases.items()) if w == worker_id and s not in self.draining and s in by_name
+            ]
+        return {'lease_sec': self.lease_sec, 'tasks': tasks}
+
+    def release(self, worker_id):
+        """워커 정상 종료 (XML-RPC) → 시트 즉시 재배정 가능"""
+        with self._lock:
+            self.workers.pop(worker_id, None)
+            self.active.pop(worker_id, None)
+            for sheet_name in [s for s, w in self.leases.items() if w == worker_id]:
+                del self.leases[sheet_name]
+                self.draining.pop(sheet_name, None)
+        log(f"👋 워커 종료: {worker_id}", "🖥️")
+        return True
+
+    def status(self):
+        """배정 현황 (XML-RPC)"""
+        with self._lock:
+            return {'workers': dict(self.workers), 'leases': dict(self.leases)}
+
+    def serve_forever(self, host=CLUSTER_HOST, port=CLUSTER_PORT):
+        """XML-RPC 서버 실행"""
+        server = xmlrpc_server.SimpleXMLRPCServer((host, port), allow_none=True, logRequests=False)
+        server.register_function(self.heartbeat, 'heartbeat')
+        server.register_function(self.release, 'release')
+        server.register_function(self.status, 'status')
+        log(f"🛰️ 코디네이터 시작: {host}:{port} (임대 {self.lease_sec}초)", "🚀")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+class WorkerClient:
+    """워커 쪽 코디네이터 연결 (배정 시트 관리)"""
+
+    def __init__(self, worker_id=None, host=CLUSTER_HOST, port=CLUSTER_PORT, heartbeat_sec=HEARTBEAT_SEC):
+        self.worker_id = worker_id or default_worker_id()
+        self.proxy = xmlrpc_client.ServerProxy(f"http://{host}:{port}", allow_none=True)
+        self.heartbeat_sec = heartbeat_sec
+        self.tasks = []          # 배정받은 GridTask 목록
+        self.lease_until = 0     # 임대 만료 시각
+        self.last_beat = 0
+        self.running = None      # 지금 실행 중인 sheet_name (하트비트로 보고)
+
+    def seconds_until_heartbeat(self):
+        return max(0.0, self.last_beat + self.heartbeat_sec - time.time())
+
+    def beat(self, affinity=None):
+        """
+        하트비트 전송 및 배정 시트 갱신 (주기와 무관하게 즉시)
+
+        Args:
+            affinity: {sheet_name: "계좌|종목"}
+
+        Returns:
+            bool: 배정 시트가 바뀌었는지 여부
+        """
+        now = time.time()
+        self.last_beat = now
+        try:
+            reply = self.proxy.heartbeat(self.worker_id, affinity or {}, self.running)
+        except Exception as e:
+            log(f"⚠️ 코디네이터 하트비트 실패: {e}", "⚠️")
+            return False
+
+        tasks = []
+        for item in reply['tasks']:
+            task = {'type': GRID_TYPE, 'status': item['status'], 'details': item['details']}
+            tasks.append(GridTask(item['key'], task))
+        changed = tasks != self.tasks
+        if [t.sheet_name for t in tasks] != [t.sheet_name for t in self.tasks]:
+            log(f"🗂️ 배정 시트: {', '.join(t.sheet_name for t in tasks) or '없음'}", "🖥️")
+        self.lease_until = now + reply['lease_sec']
+        self.tasks = tasks
+        return changed
+
+    def current_tasks(self):
+        """
+        지금 실행해도 되는 GridTask 목록 (임대가 만료되면 비움)
+        """
+        if time.time() > self.lease_until and self.tasks:
+            log("⛔ 임대 만료 - 배정 시트 실행 중지 (코디네이터 재연결 대기)", "⚠️")
+            self.tasks = []
+        return self.tasks
+
+    def seconds_until_expiry(self):
+        """배정 시트 임대 만료까지 남은 시간 (배정 시트가 없으면 None)"""
+        return max(0.0, self.lease_until - time.time()) if self.tasks else None
+
+    def heartbeat(self, affinity=None):
+        """
+        하트비트 전송 (주기가 되었을 때만) 및 배정 시트 반환
+
+        Args:
+            affinity: {sheet_name: "계좌|종목"}
+
+        Returns:
+            list: 지금 실행해도 되는 GridTask 목록
+        """
+        if time.time() - self.last_beat >= self.heartbeat_sec:
+            self.beat(affinity)
+        return self.current_tasks()
+
+    def release(self):
+        try:
+            self.proxy.release(self.worker_id)
+        except Exception as e:
+            log(f"⚠️ 코디네이터 종료 알림 실패: {e}", "⚠️")
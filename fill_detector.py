@@ -0,0 +1,218 @@
+"""
+체결 감지 모듈
+미체결 주문이 있는 종목만 짧은 주기로 미체결 목록과 잔고를 조회하여
+주문 원장 기준으로 개별 체결을 계산하고, 체결 이벤트마다 시트 카운터(K10/K12/K14/K16)와 알림을 갱신
+"""
+
+import time
+
+from utils import log, safe_int
+from tracer import traced
+from sheet_layout import cell
+from order_ledger import ledger_key
+
+try:
+    from config import FILL_POLL_SEC
+except ImportError:
+    FILL_POLL_SEC = 20  # 미체결 주문이 있는 종목의 체결 확인 주기 (초)
+
+
+class FillDetector:
+    """주문 원장 체결 이벤트 → 시트 카운터/알림 반영"""
+
+    def __init__(self, hts, order_manager, telegram_manager=None, poll_sec=FILL_POLL_SEC, pipeline=None):
+        """
+        Args:
+            hts: HTSController 인스턴스
+            order_manager: OrderManager 인스턴스 (원장, 미체결 조회)
+            telegram_manager: TelegramBot 인스턴스 (체결 알림)
+            poll_sec: 체결 확인 주기 (초)
+            pipeline: SheetPipeline (있으면 시트 쓰기/알림을 비동기로 처리)
+        """
+        self.hts = hts
+        self.order_manager = order_manager
+        self.ledger = order_manager.ledger
+        self.telegram_manager = telegram_manager
+        self.poll_sec = poll_sec
+        self.pipeline = pipeline
+        self.sheets = {}      # {sheet_name: {'ticker', 'acc_cnt', 'ws', 'k10', 'counts'}}
+        self.last_poll = {}   # {sheet_name: 마지막 체결 확인 시각}
+        self.ledger.fill_listeners.append(self.on_fill)
+
+    def register(self, sheet_name, ticker, acc_cnt, ws, sheet_stock_q, counts=None):
+        """
+        시트 정보 등록 (매매 사이클에서 시트를 읽을 때마다 갱신)
+
+        Args:
+            sheet_name: 시트 이름
+            ticker: 종목 코드
+            acc_cnt: 계좌 순번
+            ws: 워크시트 객체
+            sheet_stock_q: 시트 K10 (마지막으로 반영한 HTS 잔고)
+            counts: {"BUY": K14, "SELL": K16} (함께 읽었으면 전달, 없으면 첫 체결 때 읽음)
+        """
+        self.sheets[sheet_name] = {
+            'ticker': ticker,
+            'acc_cnt': acc_cnt,
+            'ws': ws,
+            'k10': safe_int(sheet_stock_q),
+            'counts': dict(counts) if counts else None
+        }
+        self.last_poll[sheet_name] = time.time()  # 매매 사이클에서 미체결을 확인하므로 주기 초기화
+
+    def _sheet_for(self, fill):
+        """체결 이벤트가 속한 시트 찾기 (주문 기록의 시트 → 같은 계좌/종목 시트)"""
+        name = fill.get('sheet')
+        if name in self.sheets:
+            return name
+        key = ledger_key(fill.get('acc_cnt'), fill['ticker'])
+        for name, info in self.sheets.items():
+            if ledger_key(info['acc_cnt'], info['ticker']) == key:
+                return name
+        return None
+
+    def _counts(self, info):
+        """K14(매수 횟수)/K16(매도 횟수) - 등록 때 받지 못했으면 처음 한 번만 시트에서 읽음"""
+        if info['counts'] is None:
+            ws = info['ws']
+            info['counts'] = {
+                "BUY": safe_int(ws.acell(cell('buy_count')).value),
+                "SELL": safe_int(ws.acell(cell('sell_count')).value)
+            }
+        return info['counts']
+
+    def _apply_change(self, sheet_name, change, count_side=None):
+        """
+        잔고 변화 1건을 시트에 반영
+
+        Args:
+            sheet_name: 시트 이름
+            change: 잔고 변화량 (매수 +, 매도 -)
+            count_side: 횟수를 올릴 방향 ("BUY" → K14, "SELL" → K16, None이면 횟수 유지)
+        """
+        info = self.sheets[sheet_name]
+        info['k10'] += change  # 다음 체결 계산용 (시트 쓰기 완료와 무관하게 즉시 반영)
+        k10 = info['k10']
+
+        def write_fill():
+            ws = info['ws']
+            try:
+                ws.update(cell('stock_change'), [[change]])
+                log(f"✅ {cell('stock_change')} 업데이트: {change:+d}주", "✅")
+
+                if count_side:
+                    counts = self._counts(info)
+                    counts[count_side] += 1
+                    a1 = cell('buy_count') if count_side == "BUY" else cell('sell_count')
+                    label = "매수" if count_side == "BUY" else "매도"
+                    ws.update(a1, [[counts[count_side]]])
+                    log(f"💰 {label} 체결! {a1}({label} 횟수): {counts[count_side] - 1} → {counts[count_side]}", "💰")
+
+                ws.update(cell('stock_q'), [[k10]])
+                log(f"✅ {cell('stock_q')} 업데이트: {k10}주", "✅")
+            except Exception as e:
+                log(f"⚠️ 체결 데이터 업데이트 실패: {e}", "⚠️")
+
+        if self.pipeline:
+            self.pipeline.submit(sheet_name, write_fill)
+        else:
+            write_fill()
+
+    def on_fill(self, fill):
+        """원장 체결 이벤트 처리 (OrderLedger.fill_listeners 콜백)"""
+        sheet_name = self._sheet_for(fill)
+        label = "매수" if fill['side'] == "BUY" else "매도"
+        kind = "체결" if fill['complete'] else "부분 체결"
+        log(f"🔔 체결 감지! {fill['ticker']} {label} {fill['price']} x {fill['qty']}주 ({kind}, ID {fill['client_id']})", "💰")
+
+        if sheet_name is None:
+            log(f"⚠️ {fill['ticker']}: 체결을 반영할 시트 없음", "⚠️")
+            return
+
+        change = fill['qty'] if fill['side'] == "BUY" else -fill['qty']
+        self._apply_change(sheet_name, change, fill['side'] if fill['complete'] else None)
+
+        if self.telegram_manager:
+            message = f"🔔 [{sheet_name}] {fill['ticker']} {label} {kind}\n{fill['price']} x {fill['qty']}주"
+            if self.pipeline:
+                self.pipeline.submit(None, self.telegram_manager.send_user_message, message)
+            else:
+                self.telegram_manager.send_user_message(message)
+
+    def settle_balance(self, sheet_name, hts_stock_q):
+        """
+        체결 이벤트로 설명되지 않은 잔고 변화 반영 (수동 매매, 원장 이전 주문 등)
+        원장이 현재 잔고까지 확인한 경우에만 K10과의 차이를 한 번에 반영
+
+        Args:
+            sheet_name: 시트 이름
+            hts_stock_q: 현재 HTS 잔고
+        """
+        info = self.sheets.get(sheet_name)
+        if info is None or hts_stock_q is None:
+            return
+        if self.ledger.balance(info['acc_cnt'], info['ticker']) != hts_stock_q:
+            return
+
+        change = hts_stock_q - info['k10']
+        if change == 0:
+            return
+
+        log(f"🔔 잔고 변화 감지 (주문 원장 외): {info['k10']}주 → {hts_stock_q}주 (변화량: {change:+d}주)", "💰")
+        self._apply_change(sheet_name, change, "BUY" if change > 0 else "SELL")
+
+    def due_sheets(self):
+        """미체결 주문이 있고 확인 주기가 된 시트 목록"""
+        now = time.time()
+        due = []
+        for sheet_name, info in self.sheets.items():
+            if not self.ledger.working_orders(info['acc_cnt'], info['ticker']):
+                continue
+            if now - self.last_poll.get(sheet_name, 0) >= self.poll_sec:
+                due.append(sheet_name)
+        return due
+
+    def seconds_until_due(self):
+        """다음 체결 확인까지 남은 시간 (미체결 주문이 없으면 None)"""
+        now = time.time()
+        waits = [
+            max(0.0, self.last_poll.get(sheet_name, 0) + self.poll_sec - now)
+            for sheet_name, info in self.sheets.items()
+            if self.ledger.working_orders(info['acc_cnt'], info['ticker'])
+        ]
+        return min(waits) if waits else None
+
+    @traced("fill.poll")
+    def poll(self, sheet_name):
+        """
+        시트 1개의 체결 확인 (잔고 + 미체결 조회 → 원장 동기화 → 체결 이벤트)
+
+        Returns:
+            list: 체결 이벤트 목록 (조회 실패 시 None)
+        """
+        info = self.sheets[sheet_name]
+        ticker = info['ticker']
+        self.last_poll[sheet_name] = time.time()
+
+        if not self.hts.select_account(info['acc_cnt']):
+            log(f"❌ {sheet_name}: 체결 확인 중 계좌 선택 실패", "❌")
+            return None
+
+        hts_stock_q = self.hts.get_stock_quantity(ticker)
+        if hts_stock_q is None:
+            log(f"❌ {sheet_name}: 체결 확인 중 잔고 조회 실패", "❌")
+            return None
+
+        unfilled = self.order_manager.check_unfilled_orders(ticker)
+        if unfilled.get('error'):
+            return None
+
+        fills = self.ledger.sync_unfilled(info['acc_cnt'], ticker, unfilled['orders'], hts_stock_q)
+        self.settle_balance(sheet_name, hts_stock_q)
+        return fills
+
+    def poll_due(self):
+        """확인 주기가 된 모든 시트 체결 확인"""
+        for sheet_name in self.due_sheets():
+            log(f"🔎 {sheet_name}: 체결 확인", "🔎")
+            self.poll(sheet_name)
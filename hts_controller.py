@@ -5,12 +5,7 @@ HTS 제어 모듈
 import config
 import time
 import subprocess
-import pyautogui
-import pyperclip
-import psutil  # 추가: kill_hts_processes()에서 사용
-from pywinauto import Application, mouse
 from datetime import datetime
-import pygetwindow as gw
 
 from config import (
     COORDS_TICKER_INPUT, COORDS_ACCOUNT_LIST, 
@@ -22,6 +17,47 @@ from config import (
     WAIT_TIME
 )
 from utils import log, safe_float, safe_int
+from tracer import traced
+from hts_grid import parse_unfilled_orders, parse_watchlist
+from lazy_import import lazy_module
+from price_samples import PriceSampleStore
+from indicators import IndicatorEngine
+
+# GUI 모듈은 첫 HTS 조작 시 로드
+pyautogui = lazy_module("pyautogui")
+pyperclip = lazy_module("pyperclip")
+psutil = lazy_module("psutil")  # kill_hts_processes()에서 사용
+pywinauto = lazy_module("pywinauto")
+mouse = lazy_module("pywinauto.mouse")
+gw = lazy_module("pygetwindow")
+
+try:
+    from config import COORDS_UNFILLED_GRID
+except ImportError:
+    COORDS_UNFILLED_GRID = (460, 442)  # 미체결 그리드 첫 행
+
+try:
+    from config import WATCHLIST_ENABLED, WATCHLIST_MAX_AGE, COORDS_WATCHLIST_TAB, COORDS_WATCHLIST_INPUT, COORDS_WATCHLIST_GRID
+except ImportError:
+    WATCHLIST_ENABLED = False               # 관심종목 화면 일괄 시세 조회 사용 여부 (화면 좌표 설정 후 사용)
+    WATCHLIST_MAX_AGE = 30                  # 일괄 조회 시세 유효 시간 (초)
+    COORDS_WATCHLIST_TAB = (240, 110)       # 관심종목 탭
+    COORDS_WATCHLIST_INPUT = (80, 160)      # 관심종목 종목 추가 입력칸
+    COORDS_WATCHLIST_GRID = (300, 200)      # 관심종목 그리드 첫 행
+
+try:
+    from config import SKIP_REDUNDANT_SWITCH
+except ImportError:
+    # 이미 입력한 종목이면 다시 입력하지 않음 - HTS 의 실제 종목 칸은 확인하지 않으므로 기본 끔
+    # (수동 클릭, 팝업, 화면 초기화 등으로 종목이 바뀌면 다른 종목의 현재가로 주문될 수 있음)
+    SKIP_REDUNDANT_SWITCH = False
+
+try:
+    from config import SKIP_REDUNDANT_ACCOUNT
+except ImportError:
+    # 이미 선택한 계좌면 다시 선택하지 않음 - HTS 의 실제 선택 계좌는 확인하지 않으므로 기본 끔
+    # (수동 클릭, 팝업 등으로 계좌가 바뀌면 다른 계좌로 주문될 수 있음)
+    SKIP_REDUNDANT_ACCOUNT = False
 
 
 class HTSController:
@@ -33,6 +69,28 @@ class HTSController:
         self.screen_2220 = None
         self.status = "NOT_CONNECTED"
         self.hts_process_names = ["NFRunLite.exe", "nk_speed.exe", "v_trade.exe", "KHOpenAPI.exe", "nfstarter.exe"]
+        self.watchlist = set()   # 관심종목 화면에 등록한 종목
+        self.quotes = {}         # {ticker: (price, 체결시간)} 마지막 일괄 조회 결과
+        self.quotes_at = 0       # 마지막 일괄 조회 시각
+        self.current_account = None   # 마지막으로 선택한 계좌 순번
+        self.current_ticker = None    # 마지막으로 입력한 좌측 종목
+        self.switch_listeners = []    # 전환 소요 시간 콜백 fn(kind, seconds) - kind: "account" / "ticker"
+        self.samples = PriceSampleStore()  # 🔥 현재가 조회마다 (시각, 가격, 잔고) 기록
+        self.indicators = IndicatorEngine(history=self.samples)  # 🔥 샘플마다 RSI/EMA/ATR O(1) 갱신
+        self.samples.listeners.append(self.indicators.on_sample)
+
+    def reset_selection(self):
+        """선택 상태 초기화 (HTS 재접속, 화면 초기화 후 반드시 다시 선택)"""
+        self.current_account = None
+        self.current_ticker = None
+
+    def _notify_switch(self, kind, started):
+        elapsed = time.perf_counter() - started
+        for listener in list(self.switch_listeners):
+            try:
+                listener(kind, elapsed)
+            except Exception as e:
+                log(f"전환 시간 콜백 오류: {e}", "⚠️")
 
     def kill_hts_processes(self):
         """기존 HTS 프로세스 완전 종료 (복구 시 사용)"""
@@ -45,6 +103,7 @@ class HTSController:
                 continue
         time.sleep(2)
 
+    @traced("hts.login")
     def login(self, hts_path, cert_order, cert_pw, user_id):
         """
         HTS 로그인 실행
@@ -66,7 +125,7 @@ class HTSController:
             time.sleep(WAIT_TIME["LOGIN"])
 
             # 인증서 창 연결
-            app = Application(backend="win32").connect(title_re="인증서 선택.*", timeout=25)
+            app = pywinauto.Application(backend="win32").connect(title_re="인증서 선택.*", timeout=25)
             dlg = app.window(title_re="인증서 선택.*")
             dlg.set_focus()
 
@@ -95,22 +154,25 @@ class HTSController:
             self.status = "LOGIN_FAILED"
             return False
 
+    @traced("hts.connect_main_window")
     def connect_main_window(self):
         """메인 HTS 창에 연결"""
         try:
-            self.app = Application(backend="win32").connect(
+            self.app = pywinauto.Application(backend="win32").connect(
                 title_re=".*영웅문Global.*",
                 timeout=40,
                 found_index=0
             )
             self.main_dlg = self.app.window(title_re=".*영웅문Global.*", found_index=0)
             self.main_dlg.set_focus()
+            self.reset_selection()
             log("메인 창 연결 성공", "✅")
             return True
         except Exception as e:
             log(f"메인 창 연결 실패: {e}", "❌")
             return False
 
+    @traced("hts.open_and_maximize_2220")
     def open_and_maximize_2220(self):
         """2220 화면 열기 및 최대화"""
         try:
@@ -161,6 +223,7 @@ class HTSController:
         except:
             return False
 
+    @traced("hts.input_ticker")
     def input_ticker(self, ticker):
         """
         종목 입력
@@ -168,6 +231,11 @@ class HTSController:
         Args:
             ticker: 종목 코드
         """
+        if SKIP_REDUNDANT_SWITCH and ticker == self.current_ticker:
+            log(f"티커 유지: {ticker}", "⌨️")
+            return True
+        started = time.perf_counter()
+        self.current_ticker = None
         try:
             log(f"티커 입력: {ticker}", "⌨️")
 
@@ -183,12 +251,15 @@ class HTSController:
             time.sleep(0.8)
 
             log(f"{ticker} 좌측 종목 조회 완료", "✅")
+            self.current_ticker = ticker
+            self._notify_switch("ticker", started)
             return True
 
         except Exception as e:
             log(f"티커 입력 오류: {e}", "❌")
             return False
 
+    @traced("hts.select_account")
     def select_account(self, acc_cnt):
         """
         계좌 선택
@@ -196,6 +267,11 @@ class HTSController:
         Args:
             acc_cnt: 계좌 순번 (1~9)
         """
+        if SKIP_REDUNDANT_ACCOUNT and self.current_account is not None and safe_int(acc_cnt, 8) == self.current_account:
+            log(f"계좌 유지: {acc_cnt}번", "🎯")
+            return True
+        started = time.perf_counter()
+        self.current_account = None
         try:
             log(f"계좌 선택: {acc_cnt}번", "🎯")
 
@@ -223,12 +299,15 @@ class HTSController:
 
             time.sleep(WAIT_TIME["MEDIUM"])
             log("계좌 선택 완료", "✅")
+            self.current_account = cnt_num
+            self._notify_switch("account", started)
             return True
 
         except Exception as e:
             log(f"계좌 선택 오류: {e}", "❌")
             return False
 
+    @traced("hts.get_current_price")
     def get_current_price(self, ticker):
         """
         현재가 조회
@@ -285,12 +364,14 @@ class HTSController:
                 now_price = "0.00"
 
             log(f"현재가 조회: {now_price} (원본: {raw_data})", "💰")
+            self.samples.record(ticker, now_price)
             return now_price
 
         except Exception as e:
             log(f"현재가 조회 오류: {e}", "❌")
             return "0.00"
 
+    @traced("hts.get_stock_quantity")
     def get_stock_quantity(self, ticker):
         """
         보유 수량 조회
@@ -347,12 +428,117 @@ class HTSController:
             time.sleep(WAIT_TIME["MEDIUM"])
 
             log(f"보유 수량: {hts_stock_q}주 (원본: {raw_stock_data})", "📊")
+            self.samples.set_balance(ticker, hts_stock_q)
             return hts_stock_q
 
         except Exception as e:
             log(f"수량 조회 오류: {e}", "❌")
             return 0
 
+    @traced("hts.read_unfilled_grid")
+    def read_unfilled_grid(self):
+        """
+        미체결 그리드 전체를 한 번에 복사하여 주문 레코드로 변환
+        (미체결 탭에서 종목 조회가 끝난 상태에서 호출)
+
+        Returns:
+            list: 주문 레코드 목록 (hts_grid.parse_unfilled_orders 참고), 실패 시 None
+        """
+        try:
+            pyperclip.copy("")
+            mouse.click(coords=COORDS_UNFILLED_GRID)
+            time.sleep(WAIT_TIME["SHORT"])
+            pyautogui.hotkey('ctrl', 'a')
+            pyautogui.hotkey('ctrl', 'c')
+            time.sleep(WAIT_TIME["MEDIUM"])
+
+            raw_grid = pyperclip.paste()
+            orders = parse_unfilled_orders(raw_grid)
+
+            log(f"미체결 그리드 조회: {len(orders)}건", "📋")
+            return orders
+
+        except Exception as e:
+            log(f"미체결 그리드 조회 오류: {e}", "❌")
+            return None
+
+    def load_watchlist(self, tickers):
+        """
+        관심종목 화면에 없는 종목 추가 (이미 등록한 종목은 건너뜀)
+
+        Args:
+            tickers: 종목 코드 목록
+        """
+        missing = sorted({t.upper() for t in tickers if t} - self.watchlist)
+        if not missing:
+            return True
+        try:
+            pyautogui.click(*COORDS_WATCHLIST_TAB)
+            time.sleep(WAIT_TIME["MEDIUM"])
+            for ticker in missing:
+                mouse.click(coords=COORDS_WATCHLIST_INPUT)
+                time.sleep(WAIT_TIME["SHORT"])
+                pyautogui.hotkey('ctrl', 'a')
+                pyautogui.press('backspace')
+                pyautogui.write(ticker, interval=0.05)
+                pyautogui.press('enter')
+                time.sleep(0.5)
+                self.watchlist.add(ticker)
+            log(f"관심종목 등록: {', '.join(missing)}", "⭐")
+            return True
+        except Exception as e:
+            log(f"관심종목 등록 오류: {e}", "❌")
+            return False
+
+    @traced("hts.sweep_quotes")
+    def sweep_quotes(self, tickers=()):
+        """
+        관심종목 그리드 전체를 한 번에 복사하여 종목별 현재가 갱신
+
+        Args:
+            tickers: 조회할 종목 (관심종목에 없으면 먼저 등록)
+
+        Returns:
+            dict: {ticker: (price, 체결시간)} - 실패 시 빈 dict
+        """
+        if not self.load_watchlist(tickers):
+            return {}
+        try:
+            pyperclip.copy("")
+            pyautogui.click(*COORDS_WATCHLIST_TAB)
+            time.sleep(WAIT_TIME["MEDIUM"])
+            mouse.click(coords=COORDS_WATCHLIST_GRID)
+            time.sleep(WAIT_TIME["SHORT"])
+            pyautogui.hotkey('ctrl', 'a')
+            pyautogui.hotkey('ctrl', 'c')
+            time.sleep(WAIT_TIME["MEDIUM"])
+
+            quotes = parse_watchlist(pyperclip.paste())
+            self.quotes = quotes
+            self.quotes_at = time.time()
+            for quoted, (price, _) in quotes.items():
+                self.samples.record(quoted, price, ts=self.quotes_at)
+            missing = [t for t in tickers if t and t.upper() not in quotes]
+            log(f"관심종목 시세 조회: {len(quotes)}종목" + (f" (누락: {', '.join(missing)})" if missing else ""), "💹")
+            return quotes
+
+        except Exception as e:
+            log(f"관심종목 시세 조회 오류: {e}", "❌")
+            return {}
+
+    def cached_quote(self, ticker, max_age=WATCHLIST_MAX_AGE):
+        """
+        마지막 일괄 조회의 현재가 (오래되었거나 없으면 None)
+
+        Returns:
+            str: 현재가 (소수점 2자리, get_current_price 와 같은 형식)
+        """
+        if time.time() - self.quotes_at > max_age:
+            return None
+        quote = self.quotes.get(str(ticker).upper())
+        return "{:.2f}".format(quote[0]) if quote else None
+
+    @traced("hts.clear_screen")
     def clear_screen(self, coord=(994, 628)):
         """
         화면 초기화 (우클릭 메뉴)
@@ -360,6 +546,7 @@ class HTSController:
         Args:
             coords=coord_clear: 우클릭할 좌표
         """
+        self.reset_selection()
         try:
             log("화면 클리어 시작", "🖱️")
 
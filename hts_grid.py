@@ -0,0 +1,174 @@
+"""
+HTS 그리드 파싱 모듈
+HTS 그리드를 클립보드로 복사한 텍스트(탭 구분)를 구조화된 레코드로 변환
+"""
+
+import re
+
+from utils import safe_float, safe_int
+
+try:
+    from config import UNFILLED_GRID_COLUMNS
+except ImportError:
+    # 헤더 행이 복사되지 않을 때 사용할 기본 열 순서 (미체결 탭)
+    UNFILLED_GRID_COLUMNS = {'order_no': 0, 'ticker': 1, 'side': 2, 'qty': 3, 'price': 4, 'remaining': 5}
+
+try:
+    from config import WATCHLIST_GRID_COLUMNS
+except ImportError:
+    # 헤더 행이 복사되지 않을 때 사용할 기본 열 순서 (관심종목 화면)
+    WATCHLIST_GRID_COLUMNS = {'ticker': 0, 'price': 1, 'time': 2}
+
+
+# 헤더 이름 → 필드 (구체적인 이름을 먼저 검사)
+UNFILLED_HEADER_KEYWORDS = [
+    ('remaining', ('미체결수량', '미체결량', '미체결')),
+    ('order_no', ('원주문번호', '주문번호')),
+    ('price', ('주문가격', '주문단가', '주문가')),
+    ('qty', ('주문수량', '주문량')),
+    ('side', ('매매구분', '주문구분', '매도수구분', '구분')),
+    ('ticker', ('종목코드', '종목번호', '종목')),
+]
+
+WATCHLIST_HEADER_KEYWORDS = [
+    ('price', ('현재가', '체결가', '종가')),
+    ('time', ('체결시간', '시간')),
+    ('ticker', ('종목코드', '심볼', '종목')),
+]
+
+
+def split_grid(raw):
+    """클립보드 텍스트를 행/열 리스트로 분리 (빈 행 제외)"""
+    if not raw:
+        return []
+    rows = []
+    for line in str(raw).replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        if not line.strip():
+            continue
+        rows.append([cell.strip() for cell in line.split('\t')])
+    return rows
+
+
+def clean_number(val):
+    """숫자 이외 문자 제거 (쉼표, 통화기호, 부호 표시 등)"""
+    return re.sub(r'[^0-9.]', '', str(val or ''))
+
+
+def parse_side(val):
+    """매매구분 텍스트 → "BUY" / "SELL" / None"""
+    text = str(val or '')
+    if '매수' in text or text.upper().startswith('B'):
+        return "BUY"
+    if '매도' in text or text.upper().startswith('S'):
+        return "SELL"
+    return None
+
+
+def detect_columns(header_row, keywords):
+    """
+    헤더 행에서 필드별 열 번호 찾기
+
+    Returns:
+        dict: {field: col_index} (헤더가 아니면 빈 dict)
+    """
+    columns = {}
+    for idx, cell in enumerate(header_row):
+        name = cell.replace(' ', '')
+        if not name or any(ch.isdigit() for ch in name):
+            continue
+        for field, names in keywords:
+            if field in columns:
+                continue
+            if any(n in name for n in names):
+                columns[field] = idx
+                break
+    return columns
+
+
+def parse_unfilled_orders(raw, columns=None):
+    """
+    미체결 그리드 텍스트 → 주문 레코드 목록
+
+    Args:
+        raw: 클립보드에서 가져온 미체결 그리드 텍스트
+        columns: 필드별 열 번호 (None이면 헤더 자동 감지 후 UNFILLED_GRID_COLUMNS 사용)
+
+    Returns:
+        list: [{'row', 'order_no', 'ticker', 'side', 'price', 'qty', 'remaining'}, ...]
+              row는 그리드 내 데이터 행 순번 (0부터)
+    """
+    rows = split_grid(raw)
+    if not rows:
+        return []
+
+    if columns is None:
+        columns = detect_columns(rows[0], UNFILLED_HEADER_KEYWORDS)
+        if len(columns) >= 3:
+            rows = rows[1:]
+        else:
+            columns = UNFILLED_GRID_COLUMNS
+
+    def cell(row, field):
+        idx = columns.get(field)
+        if idx is None or idx >= len(row):
+            return ''
+        return row[idx]
+
+    orders = []
+    for row_idx, row in enumerate(rows):
+        price = safe_float(clean_number(cell(row, 'price')))
+        qty = safe_int(clean_number(cell(row, 'qty')))
+        remaining_raw = clean_number(cell(row, 'remaining'))
+        remaining = safe_int(remaining_raw) if remaining_raw else qty
+
+        if price <= 0 or remaining <= 0:
+            continue
+
+        orders.append({
+            'row': row_idx,
+            'order_no': cell(row, 'order_no'),
+            'ticker': cell(row, 'ticker'),
+            'side': parse_side(cell(row, 'side')),
+            'price': price,
+            'qty': qty or remaining,
+            'remaining': remaining
+        })
+    return orders
+
+
+def parse_watchlist(raw, columns=None):
+    """
+    관심종목 그리드 텍스트 → 종목별 현재가
+
+    Args:
+        raw: 클립보드에서 가져온 관심종목 그리드 텍스트
+        columns: 필드별 열 번호 (None이면 헤더 자동 감지 후 WATCHLIST_GRID_COLUMNS 사용)
+
+    Returns:
+        dict: {ticker: (price, time)} - time은 그리드의 체결시간 (없으면 '')
+    """
+    rows = split_grid(raw)
+    if not rows:
+        return {}
+
+    if columns is None:
+        columns = detect_columns(rows[0], WATCHLIST_HEADER_KEYWORDS)
+        if 'ticker' in columns and 'price' in columns:
+            rows = rows[1:]
+        else:
+            columns = WATCHLIST_GRID_COLUMNS
+
+    def cell(row, field):
+        idx = columns.get(field)
+        if idx is None or idx >= len(row):
+            return ''
+        return row[idx]
+
+    quotes = {}
+    for row in rows:
+        ticker = cell(row, 'ticker').upper()
+        price = safe_float(clean_number(cell(row, 'price')))
+        if not ticker or price <= 0:
+            continue
+        quotes[ticker] = (price, cell(row, 'time'))
+    return quotes
@@ -3,9 +3,12 @@ HWID 생성 모듈
 사용자의 메인보드 및 CPU 정보를 조합하여 고유 HWID 생성
 """
 
-import wmi
 import hashlib
 
+from lazy_import import lazy_module
+
+wmi = lazy_module("wmi")  # get_hwid() 호출 시 로드
+
 
 def get_hwid():
     """사용자의 메인보드 및 CPU 정보를 조합하여 고유 HWID 생성"""
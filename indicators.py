@@ -0,0 +1,364 @@
+"""
+스트리밍 지표 엔진 (RSI / EMA / ATR / 구간 최저·최고)
+종목별 상태 객체가 새 현재가 1개마다 O(1) 로 갱신 (전체 이력 재계산 없음)
+- RSI: utils.calculate_rsi 와 같은 연산 (첫 평균은 내장 sum(), 이후 Wilder 평활) → 같은 입력에서 비트 단위로 같은 값
+- EMA: 첫 period 개 단순 평균으로 시작
+- ATR: Wilder 평활 (고가/저가가 없으면 직전 가격 대비 변화폭을 True Range 로 사용)
+- 구간 최저/최고: 링버퍼 + 단조 덱 (갱신 O(1) 상각)
+배치 함수(rsi_series 등)는 전체 이력 배열을 한 번에 계산 (numpy 가 있으면 차분/이득/손실/초기 합을 벡터 연산)
+"""
+
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # 없으면 배치 함수도 스트리밍 객체로 계산
+
+try:
+    from config import RSI_PERIOD, EMA_PERIOD, ATR_PERIOD, RANGE_WINDOW
+except ImportError:
+    RSI_PERIOD = 14     # RSI 기간
+    EMA_PERIOD = 20     # EMA 기간
+    ATR_PERIOD = 14     # ATR 기간
+    RANGE_WINDOW = 60   # 구간 최저/최고 샘플 수
+
+RSI_DEFAULT = 50.0  # 데이터가 부족할 때 RSI (calculate_rsi 와 동일)
+
+
+class RSI:
+    """Wilder RSI (utils.calculate_rsi 의 스트리밍 버전)"""
+
+    __slots__ = ('period', 'prev', 'count', 'seed_up', 'seed_down', 'avg_gain', 'avg_loss')
+
+    def __init__(self, period=RSI_PERIOD):
+        self.period = period
+        self.prev = None
+        self.count = 0       # 지금까지 들어온 가격 변화 수
+        # 첫 period 개 상승/하락폭 - 다 모이면 내장 sum() 으로 한 번에 합산
+        # (Python 3.12+ 의 sum() 은 보정 합산이라 += 누적과 결과가 다를 수 있음)
+        self.seed_up = []
+        self.seed_down = []
+        self.avg_gain = None
+        self.avg_loss = None
+
+    def update(self, price):
+        """새 가격 반영 후 RSI 반환"""
+        if self.prev is not None:
+            delta = price - self.prev
+            up = delta if delta > 0 else 0
+            down = -delta if delta < 0 else 0
+            self.count += 1
+            if self.count <= self.period:
+                self.seed_up.append(up)
+                self.seed_down.append(down)
+                if self.count == self.period:
+                    self.avg_gain = sum(self.seed_up) / self.period
+                    self.avg_loss = sum(self.seed_down) / self.period
+                    self.seed_up, self.seed_down = None, None
+            else:
+                self.avg_gain = (self.avg_gain * (self.period - 1) + up) / self.period
+                self.avg_loss = (self.avg_loss * (self.period - 1) + down) / self.period
+        self.prev = price
+        return self.value
+
+    @property
+    def value(self):
+        if self.avg_gain is None:
+            return RSI_DEFAULT
+        return _rsi(self.avg_gain, self.avg_loss)
+
+
+class EMA:
+    """지수 이동 평균 (첫 period 개 단순 평균으로 시작, 그 전에는 None)"""
+
+    __slots__ = ('period', 'alpha', 'count', 'total', 'value')
+
+    def __init__(self, period=EMA_PERIOD):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.count = 0
+        self.total = 0
+        self.value = None
+
+    def update(self, price):
+        self.count += 1
+        if self.count <= self.period:
+            self.total += price
+            if self.count == self.period:
+                self.value = self.total / self.period
+        else:
+            self.value = self.value + self.alpha * (price - self.value)
+        return self.value
+
+
+class ATR:
+    """Wilder ATR (첫 period 개 True Range 평균으로 시작, 그 전에는 None)"""
+
+    __slots__ = ('period', 'prev', 'count', 'total', 'value')
+
+    def __init__(self, period=ATR_PERIOD):
+        self.period = period
+        self.prev = None
+        self.count = 0
+        self.total = 0
+        self.value = None
+
+    def update(self, price, high=None, low=None):
+        """
+        Args:
+            price: 종가 (현재가)
+            high, low: 고가/저가 (없으면 현재가)
+        """
+        high = price if high is None else high
+        low = price if low is None else low
+        if self.prev is not None:
+            tr = _true_range(high, low, self.prev)
+            self.count += 1
+            if self.count <= self.period:
+                self.total += tr
+                if self.count == self.period:
+                    self.value = self.total / self.period
+            else:
+                self.value = (self.value * (self.period - 1) + tr) / self.period
+        self.prev = price
+        return self.value
+
+
+class RollingRange:
+    """최근 window 개 가격의 최저/최고 (링버퍼 + 단조 덱)"""
+
+    __slots__ = ('window', 'seq', 'values', '_min', '_max')
+
+    def __init__(self, window=RANGE_WINDOW):
+        self.window = window
+        self.seq = 0
+        self.values = deque(maxlen=window)  # 링버퍼
+        self._min = deque()  # (seq, 값) 값 오름차순
+        self._max = deque()  # (seq, 값) 값 내림차순
+
+    def update(self, price):
+        self.values.append(price)
+        while self._min and self._min[-1][1] >= price:
+            self._min.pop()
+        while self._max and self._max[-1][1] <= price:
+            self._max.pop()
+        self._min.append((self.seq, price))
+        self._max.append((self.seq, price))
+        oldest = self.seq - self.window + 1
+        while self._min[0][0] < oldest:
+            self._min.popleft()
+        while self._max[0][0] < oldest:
+            self._max.popleft()
+        self.seq += 1
+        return self.low, self.high
+
+    @property
+    def low(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def high(self):
+        return self._max[0][1] if self._max else None
+
+
+class IndicatorSet:
+    """종목 1개의 지표 묶음"""
+
+    def __init__(self, rsi_period=RSI_PERIOD, ema_period=EMA_PERIOD, atr_period=ATR_PERIOD, window=RANGE_WINDOW):
+        self.rsi = RSI(rsi_period)
+        self.ema = EMA(ema_period)
+        self.atr = ATR(atr_period)
+        self.range = RollingRange(window)
+        self.last = None
+        self.samples = 0
+
+    def update(self, price, high=None, low=None):
+        price = float(price)
+        self.rsi.update(price)
+        self.ema.update(price)
+        self.atr.update(price, high, low)
+        self.range.update(price)
+        self.last = price
+        self.samples += 1
+        return self.snapshot()
+
+    def snapshot(self):
+        return {
+            'price': self.last,
+            'rsi': self.rsi.value,
+            'ema': self.ema.value,
+            'atr': self.atr.value,
+            'low': self.range.low,
+            'high': self.range.high,
+            'samples': self.samples
+        }
+
+
+class IndicatorEngine:
+    """종목별 스트리밍 지표 (PriceSampleStore 샘플로 갱신)"""
+
+    def __init__(self, history=None, **periods):
+        """
+        Args:
+            history: PriceSampleStore (처음 보는 종목은 저장된 당일 이력으로 상태를 채움)
+            periods: IndicatorSet 인자 (rsi_period, ema_period, atr_period, window)
+        """
+        self.history = history
+        self.periods = periods
+        self.sets = {}  # {ticker: IndicatorSet}
+
+    def _set_for(self, ticker):
+        key = str(ticker).upper()
+        indicator_set = self.sets.get(key)
+        if indicator_set is None:
+            indicator_set = self.sets[key] = IndicatorSet(**self.periods)
+            if self.history is not None:
+                for price in _as_floats(self.history.recent_prices(key)):
+                    indicator_set.update(price)
+        return indicator_set
+
+    def warm(self, ticker):
+        """저장된 이력으로 상태 준비 (이미 있으면 그대로)"""
+        return self._set_for(ticker).snapshot()
+
+    def update(self, ticker, price, high=None, low=None):
+        """새 현재가 반영 후 지표 반환 (PriceSampleStore.listeners 콜백으로도 사용)"""
+        return self._set_for(ticker).update(price, high, low)
+
+    def on_sample(self, ticker, ts, price, balance):
+        """PriceSampleStore 기록 콜백"""
+        key = str(ticker).upper()
+        if key in self.sets:
+            self.sets[key].update(price)
+        else:
+            self._set_for(key)  # 방금 기록한 샘플까지 이력에서 읽음
+
+    def snapshot(self, ticker):
+        """현재 지표 (아직 없으면 None)"""
+        indicator_set = self.sets.get(str(ticker).upper())
+        return indicator_set.snapshot() if indicator_set else None
+
+
+# ----------------------------------------------------------------------
+# 배치 계산 (전체 이력 배열 → 시점별 지표)
+# ----------------------------------------------------------------------
+
+def rsi_series(prices, period=RSI_PERIOD):
+    """
+    시점별 RSI (i 번째 값 == calculate_rsi(prices[:i + 1], period))
+
+    numpy 가 있으면 차분/상승·하락폭과 RS → RSI 변환을 벡터 연산으로 처리하고,
+    첫 평균(내장 sum()), 앞 값에 의존하는 Wilder 평활, 소수점 반올림(round)만
+    순서대로 계산 → 스트리밍 결과와 비트 단위로 같음
+
+    Returns:
+        list: RSI 목록 (prices 와 같은 길이)
+    """
+    n = len(prices)
+    if np is None or n <= period + 1:
+        rsi = RSI(period)
+        return [rsi.update(p) for p in prices]
+
+    values = np.asarray(prices, dtype=np.float64)
+    deltas = values[1:] - values[:-1]
+    up = np.where(deltas > 0, deltas, 0.0)
+    down = np.where(deltas < 0, -deltas, 0.0)
+
+    # 첫 평균: calculate_rsi 와 같은 내장 sum() (numpy 합산과 반올림 방식이 다름)
+    avg_gain = np.empty(n - period, dtype=np.float64)
+    avg_loss = np.empty(n - period, dtype=np.float64)
+    gain = sum(up[:period].tolist()) / period
+    loss = sum(down[:period].tolist()) / period
+    avg_gain[0], avg_loss[0] = gain, loss
+    for i, (u, d) in enumerate(zip(up[period:].tolist(), down[period:].tolist()), 1):
+        gain = (gain * (period - 1) + u) / period
+        loss = (loss * (period - 1) + d) / period
+        avg_gain[i], avg_loss[i] = gain, loss
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw = 100 - (100 / (1 + avg_gain / avg_loss))
+    tail = [100.0 if al == 0 else round(r, 2) for r, al in zip(raw.tolist(), avg_loss.tolist())]
+    return [RSI_DEFAULT] * period + tail
+
+
+def ema_series(prices, period=EMA_PERIOD):
+    """시점별 EMA (EMA.update 와 같은 값, 첫 period-1 개는 None)"""
+    ema = EMA(period)
+    if np is None or len(prices) <= period:
+        return [ema.update(p) for p in prices]
+    values = np.asarray(prices, dtype=np.float64).tolist()
+    head = [ema.update(p) for p in values[:period]]
+    value, alpha = ema.value, ema.alpha
+    tail = []
+    for p in values[period:]:
+        value = value + alpha * (p - value)
+        tail.append(value)
+    return head + tail
+
+
+def atr_series(prices, period=ATR_PERIOD, highs=None, lows=None):
+    """
+    시점별 ATR (ATR.update 와 같은 값, 첫 period 개는 None)
+    numpy 가 있으면 True Range 를 벡터 연산으로 계산
+    """
+    n = len(prices)
+    if np is None or n <= period + 1:
+        atr = ATR(period)
+        return [atr.update(p, highs[i] if highs is not None else None, lows[i] if lows is not None else None)
+                for i, p in enumerate(prices)]
+
+    close = np.asarray(prices, dtype=np.float64)
+    high = close if highs is None else np.asarray(highs, dtype=np.float64)
+    low = close if lows is None else np.asarray(lows, dtype=np.float64)
+    prev = close[:-1]
+    tr = np.maximum(high[1:] - low[1:], np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev))).tolist()
+
+    total = 0
+    for x in tr[:period]:
+        total += x  # ATR.update 와 같은 순서로 누적
+    value = total / period
+    result = [None] * period + [value]
+    for x in tr[period:]:
+        value = (value * (period - 1) + x) / period
+        result.append(value)
+    return result
+
+
+def rolling_range_series(prices, window=RANGE_WINDOW):
+    """
+    시점별 (최근 window 개 최저, 최고)
+    numpy 가 있으면 슬라이딩 윈도우 뷰로 한 번에 계산
+
+    Returns:
+        tuple: (최저 목록, 최고 목록)
+    """
+    n = len(prices)
+    if np is None or n < window:
+        rolling = RollingRange(window)
+        pairs = [rolling.update(p) for p in prices]
+        return [lo for lo, _ in pairs], [hi for _, hi in pairs]
+
+    values = np.asarray(prices, dtype=np.float64)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    head_low = np.minimum.accumulate(values[:window - 1]).tolist()
+    head_high = np.maximum.accumulate(values[:window - 1]).tolist()
+    return head_low + windows.min(axis=1).tolist(), head_high + windows.max(axis=1).tolist()
+
+
+def _rsi(avg_gain, avg_loss):
+    """평균 상승/하락폭 → RSI (calculate_rsi 와 같은 식)"""
+    if avg_loss == 0:
+        return 100.0
+    rs = avg_gain / avg_loss
+    return round(100 - (100 / (1 + rs)), 2)
+
+
+def _true_range(high, low, prev_close):
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+def _as_floats(values):
+    if values is None:
+        return []
+    return values.tolist() if hasattr(values, 'tolist') else [float(v) for v in values]
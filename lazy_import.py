@@ -0,0 +1,58 @@
+"""
+무거운 모듈 지연 로드
+pyautogui, pywinauto, gspread, telepot, tkinter, wmi 등은 모듈 로드에만 수백 ms 가 걸림
+→ 이름만 먼저 만들어 두고 첫 속성 접근 시 실제 import
+- 라이선스 체크, 설정 검증, 코디네이터 모드 등 GUI 가 필요 없는 경로는 해당 모듈을 로드하지 않음
+- 워치독 재시작 시 첫 로그까지 걸리는 시간 단축
+"""
+
+import sys
+import threading
+
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """첫 속성 접근 시 import 되는 모듈 대리 객체"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    name = self.__dict__['_name']
+                    __import__(name)  # builtins.__import__ 경유 (startup_profile 계측 대상)
+                    module = sys.modules[name]
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_module(name):
+    """
+    지연 로드 모듈
+
+    Args:
+        name: 모듈 이름 ("pywinauto.mouse" 처럼 하위 모듈도 가능)
+
+    Returns:
+        이미 로드된 모듈이면 그 모듈, 아니면 LazyModule
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
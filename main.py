@@ -1,44 +1,68 @@
-import json
+import sys
+
+# 🔥 --profile-startup: 이후 모든 import 시간 측정 (다른 import 보다 먼저)
+from startup_profile import startup_profiler
+startup_profiler.install_if_requested(sys.argv)
+
 import os
 import time
+import asyncio
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import psutil
-import pyperclip
-import pygetwindow as gw
 
-from utils import DisplayManager, log, safe_int, safe_float, get_first_user_name
+from utils import DisplayManager, log, safe_float
+from lazy_import import lazy_module
 
 import config
 from config import GRID_CONFIG_PATH, USER_NAME
 from telegram_bot import telegram_bot
 from google_sheet import GoogleSheetManager
-from hts_controller import HTSController
+from hts_controller import HTSController, WATCHLIST_ENABLED, SKIP_REDUNDANT_ACCOUNT, SKIP_REDUNDANT_SWITCH
 from order_manager import OrderManager
+from fill_detector import FillDetector
+from change_gate import ChangeGate, valid_quote
+from scheduler import TaskScheduler
+from task_planner import TaskPlanner
+from market_calendar import market_calendar
+from task_registry import TaskRegistry
+from sheet_pipeline import SheetPipeline, gui_lock
+from sheet_layout import cell, DAILY_STATS_RANGE, TELEGRAM_FIELDS
+from cluster import CLUSTER_ROLE, Coordinator, WorkerClient
 from auth_manager import AuthManager
 from hwid_generator import get_hwid
 from telegram_bot import TelegramBot
+from tracer import tracer, traced
+from startup_graph import StartupGraph
+from runtime_state import RuntimeCheckpoint, CHECKPOINT_SEC
+
+# 🔥 GUI 모듈은 첫 HTS 점검 시 로드 (라이선스 체크/설정 검증은 GUI 모듈 없이 진행)
+psutil = lazy_module("psutil")
+pyperclip = lazy_module("pyperclip")
+gw = lazy_module("pygetwindow")
+
+# 시작 시 라이선스 확인과 동시에 미리 로드할 GUI 모듈
+GUI_PRELOAD_MODULES = ("pyautogui", "pyperclip", "pygetwindow", "psutil", "win32api", "win32con")
+
+try:
+    from config import TASK_RELOAD_SEC, HEALTH_CHECK_SEC
+except ImportError:
+    TASK_RELOAD_SEC = 30  # 대기 중 task.json 다시 읽는 최대 간격 (초)
+    HEALTH_CHECK_SEC = 10  # HTS 프로세스 점검 주기 (초)
 
 
 def setup_telegram_config(sm, sheet_name):
     """지정된 시트의 E25(CHAT_ID), E27(TOKEN) 값을 config에 반영"""
     try:
-        ws = sm.get_worksheet(sheet_name)
-        if not ws:
-            log(f"⚠️ '{sheet_name}' 시트를 찾을 수 없습니다.", "❌")
-            return False
-
-        res = ws.get("E25:E27")
+        fields, _ = sm.read_fields(sheet_name, TELEGRAM_FIELDS)
 
-        if len(res) >= 3:
-            config.CHAT_ID = str(res[0][0]).strip()
-            config.TELEGRAM_TOKEN = str(res[2][0]).strip()
-
-            if config.CHAT_ID and config.TELEGRAM_TOKEN:
-                log(f"✅ 텔레그램 설정 로드 완료 (시트: {sheet_name})", "🔔")
-                return True
+        if fields['chat_id'] and fields['telegram_token']:
+            config.CHAT_ID = fields['chat_id']
+            config.TELEGRAM_TOKEN = fields['telegram_token']
+            log(f"✅ 텔레그램 설정 로드 완료 (시트: {sheet_name})", "🔔")
+            return True
 
-        log(f"⚠️ '{sheet_name}' 시트의 E25 또는 E27 셀이 비어있습니다.", "⚠️")
+        log(f"⚠️ '{sheet_name}' 시트의 {cell('chat_id')} 또는 {cell('telegram_token')} 셀이 비어있습니다.", "⚠️")
         return False
     except Exception as e:
         log(f"❌ 텔레그램 설정 로드 중 오류: {e}", "⚠️")
@@ -48,18 +72,36 @@ def setup_telegram_config(sm, sheet_name):
 class SaltMaker:
     """자동매매 메인 클래스"""
 
-    def __init__(self):
+    def __init__(self, sheet_manager=None, tasks=None):
+        """
+        Args:
+            sheet_manager: 이미 연결된 GoogleSheetManager (없으면 새로 연결)
+            tasks: 이미 읽은 TaskRegistry (없으면 새로 생성)
+        """
         self.display = DisplayManager()
-        self.sheet_manager = GoogleSheetManager()
+        self.sheet_manager = sheet_manager or GoogleSheetManager()
         self.hts = HTSController()
         self.telegram_manager = TelegramBot()
         self.order_manager = OrderManager(self.hts, self.telegram_manager)
+        self.pipeline = SheetPipeline(self.sheet_manager)  # 🔥 시트 I/O 작업 스레드
+        self.fill_detector = FillDetector(self.hts, self.order_manager, self.telegram_manager, pipeline=self.pipeline)
+        self.gate = ChangeGate(self.order_manager.ledger)  # 🔥 변화 없는 시트 건너뛰기
         self.executed_logins = set()
         self.hts_status = ""
         self.hts_process_names = ["NFRunLite.exe", "nk_speed.exe", "v_trade.exe", "KHOpenAPI.exe", "nfstarter.exe"]
         
-        # 🔥 각 그리드 매매 카드의 마지막 실행 시간 추적
-        self.last_execution_times = {}  # {sheet_name: timestamp}
+        # 🔥 그리드 매매 카드별 다음 실행 시각 (최소 힙)
+        self.scheduler = TaskScheduler()
+        # 🔥 계좌/종목 전환이 적은 순서로 재배열
+        self.planner = TaskPlanner(self.fill_detector.sheets, skip_account=SKIP_REDUNDANT_ACCOUNT,
+                                   skip_ticker=SKIP_REDUNDANT_SWITCH)
+        self.hts.switch_listeners.append(self.planner.observe_switch)
+        self.tasks = tasks or TaskRegistry()  # 🔥 task.json (변경 시에만 다시 읽음)
+        self.cluster = WorkerClient() if CLUSTER_ROLE == "worker" else None  # 🔥 분산 실행 워커 모드
+        self._last_wait_target = None
+        self.gui_executor = None  # 🔥 HTS 조작 전용 스레드 (run_async 에서 생성)
+        self.checkpoint = RuntimeCheckpoint()  # 🔥 재시작 시 재로그인 없이 이어서 실행하기 위한 상태 저장
+        self._wake = None         # 🔥 메인 루프 대기 해제 이벤트
 
     def is_hts_on_top(self):
         """현재 화면 맨 위에 HTS가 떠 있는지 확인"""
@@ -105,19 +147,58 @@ class SaltMaker:
                 telegram_bot.send_error_notification("🚨 HTS 종료 감지. Salt Maker 재접속 시도.")
                 self.hts_status = ""
                 self.executed_logins.clear()
+                self.order_manager.ledger.invalidate()
+                self.save_checkpoint()
                 return False
         return True
 
-    def check_kiwoom_blackout_time(self):
-        """키움증권 주문 불가 시간(오후 5시~6시) 체크"""
-        import datetime
+    def runtime_state(self):
+        """체크포인트로 저장할 실행 상태"""
+        return {
+            'hts_status': self.hts_status,
+            'executed_logins': sorted(self.executed_logins),
+            'last_runs': self.scheduler.snapshot(),
+        }
+
+    def save_checkpoint(self, state=None):
+        """실행 상태 저장 (HTS 로그인 상태면 현재 HTS 프로세스 포함)"""
+        state = state or self.runtime_state()
+        names = self.hts_process_names if state['hts_status'] == "EXECUTED" else None
+        return self.checkpoint.save(state, names)
+
+    def warm_start(self):
+        """
+        체크포인트 복원
+        - 시트별 마지막 실행 시각 → 작업 간격 유지
+        - 체크포인트의 HTS 프로세스가 그대로 실행 중이면 로그인 없이 메인 창에 다시 연결
+
+        Returns:
+            bool: 웜 스타트 성공 여부 (실패하면 기존처럼 HTS 종료 후 로그인)
+        """
+        state = self.checkpoint.load()
+        if state is None:
+            return False
+        self.scheduler.restore(state.get('last_runs') or {})
 
-        now = datetime.datetime.now()
+        ok, reason = self.checkpoint.can_warm_start(state, self.hts_process_names)
+        if not ok:
+            log(f"웜 스타트 불가: {reason} → 로그인 절차 진행", "ℹ️")
+            return False
 
-        # 한국 시간 기준 오후 5시(17시)일 때 True 반환
-        if now.hour == 17:
-            return True
-        return False
+        log(f"♻️ 웜 스타트: {reason} - 실행 중인 HTS 에 다시 연결합니다.", "🔄")
+        if not self.hts.connect_main_window():
+            log("웜 스타트 실패: 메인 창 연결 불가 → 로그인 절차 진행", "⚠️")
+            return False
+        self.hts.open_and_maximize_2220()
+        self.hts.status = "LOGGED_IN"
+        self.hts_status = "EXECUTED"
+        self.executed_logins.update(state.get('executed_logins') or [])
+        log("웜 스타트 완료 (HTS 재로그인 생략)", "✅")
+        return True
+
+    def check_kiwoom_blackout_time(self):
+        """키움증권 주문 불가 시간(오후 5시~6시) 체크"""
+        return market_calendar.is_blackout()
 
     def check_and_reset_daily_stats(self, ws):
         """아침 9시~10시 사이 첫 로그인 시 통계 초기화 (K21 날짜 체크)"""
@@ -126,14 +207,14 @@ class SaltMaker:
 
         if 9 <= now.hour < 10:
             try:
-                last_reset_date = ws.acell('K21').value
+                last_reset_date = ws.acell(cell('reset_date')).value
 
                 if last_reset_date != today_str:
                     reset_data = [[0], [0], [0], [0]]
-                    ws.update(range_name='K14:K17', values=reset_data)
-                    ws.update(range_name='K21', values=[[today_str]])
+                    ws.update(range_name=DAILY_STATS_RANGE, values=reset_data)
+                    ws.update(range_name=cell('reset_date'), values=[[today_str]])
 
-                    log(f"☀️ {today_str} 일일 통계 초기화 완료 (K21 기록)", "🔄")
+                    log(f"☀️ {today_str} 일일 통계 초기화 완료 ({cell('reset_date')} 기록)", "🔄")
 
                     self.telegram_manager.send_message(
                         f"☀️ 좋은 아침입니다!\n장 시작을 위해 통계를 초기화했습니다.\n(오늘 날짜: {today_str})"
@@ -141,114 +222,107 @@ class SaltMaker:
             except Exception as e:
                 log(f"❌ 아침 초기화 중 오류 발생: {e}", "⚠️")
 
-    def load_tasks(self):
-        """작업 파일 로드"""
-        if not os.path.exists(GRID_CONFIG_PATH):
-            return []
-        try:
-            with open(GRID_CONFIG_PATH, 'r', encoding='utf-8') as f:
-                tasks = json.load(f)
-            return list(tasks.values()) if isinstance(tasks, dict) else list(tasks)
-        except Exception as e:
-            log(f"작업 파일 로드 오류: {e}", "❌")
-            return []
-
+    def prefetch_sheet(self, sheet_name):
+        """시트 데이터 미리 읽기 (작업 스레드에서 일일 통계 초기화까지 처리)"""
+        return self.pipeline.prefetch(sheet_name, lambda data: self.check_and_reset_daily_stats(data['worksheet']))
+
+    def write_cell(self, sheet_name, ws, a1, value, message=None, symbol="🔍"):
+        """
+        셀 1개 비동기 쓰기 (같은 시트의 쓰기는 순서 유지)
+
+        Args:
+            message: 실제로 쓴 경우에만 남길 로그 (미러가 같은 값이라 생략하면 로그 없음)
+            symbol: 로그 심볼 (텔레그램 전송 여부가 심볼로 결정되므로 호출별로 지정)
+        """
+        def update_cell():
+            sent = ws.update(a1, [[value]]) is not None  # MirroredWorksheet 는 쓰기 생략 시 None
+            if message and sent:
+                log(message, symbol)
+        update_cell.__name__ = f"write_{a1}"
+        return self.pipeline.write(sheet_name, update_cell)
+
+    @traced("main.handle_auto_login")
     def handle_auto_login(self, task):
-        """자동 로그인 처리 - 구분자 ' / ' 통일"""
+        """자동 로그인 처리 (task: LoginTask)"""
         try:
-            status = task.get('status')
-            details = task.get('details', "")
-            items = [i.strip() for i in details.split(' / ')]  # 🔥 구분자 통일
-
-            if len(items) >= 5:
-                user_id, cert_order, start_time, hts_path, cert_pw = items[:5]
-                if user_id in self.executed_logins or self.hts_status == "EXECUTED":
-                    return
-
-                now_time = datetime.now().strftime('%H:%M:%S')
-                should_run = (status == "RUNNING") or (status == "READY" and now_time >= start_time) or (status == "EXECUTED")
-
-                if should_run and os.path.exists(hts_path):
-                    # 기존 HTS 정리
-                    for proc in psutil.process_iter(['name']):
-                        try:
-                            if proc.info['name'] in self.hts_process_names:
-                                proc.kill()
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            continue
-                    time.sleep(2)
-
-                    log(f"HTS 로그인 시도 중... (사용자: {user_id})", "🔑")
-                    if self.hts.login(hts_path, cert_order, cert_pw, user_id):
-                        self.hts_status = "EXECUTED"
-                        self.executed_logins.add(user_id)
-                        time.sleep(35)
-                        self.hts.connect_main_window()
-                        self.hts.clear_screen()
-                        self.hts.open_and_maximize_2220()
-                        telegram_bot.send_login_notification(user_id, success=True)
-                        log("HTS 로그인 및 화면 설정 완료", "✅")
+            status = task.status
+            user_id, cert_order, hts_path, cert_pw = task.user_id, task.cert_order, task.hts_path, task.cert_pw
+
+            if user_id in self.executed_logins or self.hts_status == "EXECUTED":
+                return
+
+            now = datetime.now()
+            now_min = now.hour * 60 + now.minute
+            should_run = (status == "RUNNING") or (status == "READY" and now_min >= task.start_min) or (status == "EXECUTED")
+
+            if should_run and os.path.exists(hts_path):
+                # 기존 HTS 정리
+                for proc in psutil.process_iter(['name']):
+                    try:
+                        if proc.info['name'] in self.hts_process_names:
+                            proc.kill()
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
+                time.sleep(2)
+
+                log(f"HTS 로그인 시도 중... (사용자: {user_id})", "🔑")
+                if self.hts.login(hts_path, cert_order, cert_pw, user_id):
+                    self.hts_status = "EXECUTED"
+                    self.executed_logins.add(user_id)
+                    time.sleep(35)
+                    self.hts.connect_main_window()
+                    self.hts.clear_screen()
+                    self.hts.open_and_maximize_2220()
+                    self.save_checkpoint()
+                    telegram_bot.send_login_notification(user_id, success=True)
+                    log("HTS 로그인 및 화면 설정 완료", "✅")
         except Exception as e:
             log(f"로그인 처리 오류: {e}", "❌")
             traceback.print_exc()
 
-    def handle_grid_trading(self, task):
-        """매매 사이클 처리 - 구분자 ' / ' 통일"""
-        sheet_name = None
+    @traced("main.handle_grid_trading")
+    def handle_grid_trading(self, task, prefetched=None):
+        """
+        매매 사이클 처리 - 실행 시각/작업 시간대 판단은 TaskScheduler 담당
+        시트 쓰기와 알림은 SheetPipeline 으로 보내고 HTS 조작만 이 스레드에서 처리
+
+        Args:
+            task: GridTask
+            prefetched: SheetPipeline.prefetch 로 미리 읽기 시작한 시트 데이터 Future
+        """
+        sheet_name = task.sheet_name
         try:
             # 🔥 PAUSED 상태 체크 (최우선)
-            status = task.get('status', 'READY')
-            
-            if status == "PAUSED":
-                # 비활성화 상태면 완전히 건너뜀
-                details = task.get('details', "")
-                items = [i.strip() for i in details.split(' / ')]
-                sheet_name = items[0] if items else "Unknown"
+            if task.status == "PAUSED":
                 log(f"⏸️ {sheet_name}: 비활성화 상태 - 건너뜀", "💤")
                 return
-            
-            details = task.get('details', "")
-            items = [i.strip() for i in details.split(' / ')]  # 🔥 구분자 통일
-            if len(items) < 4:
-                return
-
-            sheet_name, start_t, end_t, interval = items[:4]
-            interval_sec = safe_int(interval, 60)  # 간격 (초)
-            now_t = datetime.now().strftime('%H:%M:%S')
-            current_time = time.time()
 
-            # 🔥 개별 간격 체크 (RUNNING 상태가 아닐 때만)
-            if status != "RUNNING":
-                last_exec_time = self.last_execution_times.get(sheet_name, 0)
-                elapsed = current_time - last_exec_time
-                
-                if last_exec_time > 0 and elapsed < interval_sec:
-                    remaining = interval_sec - int(elapsed)
-                    log(f"⏱️ {sheet_name}: 간격 대기 중 ({remaining}초 남음)", "💤")
-                    return
-
-            # 🔥 RUNNING 상태면 시간 무시하고 즉시 실행
-            # 🔥 READY 상태면 시간 체크
-            is_work = (start_t <= now_t <= end_t) if start_t <= end_t else (now_t >= start_t or now_t <= end_t)
-            
-            if not is_work and status != "RUNNING":
-                log(f"⏰ {sheet_name}: 작업 시간이 아닙니다. 건너뜁니다. (현재: {now_t})", "💤")
-                return
-            
-            if status == "RUNNING":
+            if task.status == "RUNNING":
                 log(f"🔥 {sheet_name}: RUNNING 상태 - 즉시 실행!", "🚀")
-            
-            # 🔥 실행 시간 기록 (실행 직전)
-            self.last_execution_times[sheet_name] = current_time
 
-            sheet_data_obj = self.sheet_manager.load_trading_data(sheet_name)
+            if prefetched is None:
+                prefetched = self.prefetch_sheet(sheet_name)
+            sheet_data_obj = self.pipeline.result(prefetched)
             if not sheet_data_obj:
                 log(f"❌ {sheet_name}: 시트 데이터 로드 실패", "❌")
                 return
 
             ticker = sheet_data_obj['ticker']
             ws = sheet_data_obj['worksheet']
-            self.check_and_reset_daily_stats(ws)
+            sheet_data = sheet_data_obj['sheet_data']
+            fields = sheet_data_obj['fields']
+            self.fill_detector.register(
+                sheet_name, ticker, sheet_data_obj['acc_cnt'], ws, sheet_data_obj['sheet_stock_q'],
+                counts={"BUY": fields['buy_count'], "SELL": fields['sell_count']}
+            )
+
+            # 🔥 현재가만 먼저 읽고 마지막 전체 처리 이후 바뀐 것이 없으면 건너뜀
+            # (관심종목 일괄 조회 시세가 있으면 사용, 없으면 종목별 조회)
+            swept = self.hts.cached_quote(ticker)
+            quote = swept or self.hts.get_current_price(ticker)
+            if self.gate.should_skip(sheet_name, sheet_data_obj['acc_cnt'], ticker, quote, sheet_data):
+                log(f"⏭️ {sheet_name}: 현재가({quote})/잔고/시트/주문 변화 없음 - 건너뜀", "💤")
+                return
 
             log(f"📡 시트({sheet_name}) 처리 시작: {ticker}", "📡")
 
@@ -262,53 +336,21 @@ class SaltMaker:
                 return
             time.sleep(1.0)
 
-            now_price = self.hts.get_current_price(ticker)
+            # 일괄 조회 시세는 게이트 판단용 → 주문 판단은 종목별 조회로 확인
+            now_price = quote if valid_quote(quote) and not swept else self.hts.get_current_price(ticker)
             hts_stock_q = self.hts.get_stock_quantity(ticker)
             
             if now_price is None or hts_stock_q is None:
                 log(f"❌ {sheet_name}: 현재가 또는 잔고 조회 실패", "❌")
                 return
 
-            # 🔥 K8(현재가) 실시간 업데이트
-            try:
-                ws.update('K8', [[now_price]])
-                log(f"✅ K8(현재가) 업데이트: {now_price}", "🔍")
-            except Exception as e:
-                log(f"⚠️ K8 업데이트 실패: {e}", "⚠️")
+            # 🔥 K8(현재가) 실시간 업데이트 (비동기)
+            self.write_cell(sheet_name, ws, cell('price'), now_price, f"✅ {cell('price')}(현재가) 업데이트: {now_price}", "🔍")
 
-            log(f"📊 현재가: {now_price} / HTS 잔고: {hts_stock_q}", "🔍")
+            stats = self.hts.indicators.snapshot(ticker)
+            rsi_text = f" / RSI({stats['samples']}): {stats['rsi']}" if stats else ""
+            log(f"📊 현재가: {now_price} / HTS 잔고: {hts_stock_q}{rsi_text}", "🔍")
 
-            # 🔥 체결 감지 및 K12/K14/K16 자동 업데이트
-            prev_hts_stock_q = sheet_data_obj.get('sheet_stock_q', hts_stock_q)  # 이전 HTS 잔고 (시트 K10)
-            stock_change = hts_stock_q - prev_hts_stock_q  # 잔고 변화량
-            
-            if stock_change != 0:
-                log(f"🔔 체결 감지! 잔고 변화: {prev_hts_stock_q}주 → {hts_stock_q}주 (변화량: {stock_change:+d}주)", "💰")
-                
-                try:
-                    # K12에 차이 기록
-                    ws.update('K12', [[stock_change]])
-                    log(f"✅ K12 업데이트: {stock_change:+d}주", "✅")
-                    
-                    # 매수 체결 (잔고 증가)
-                    if stock_change > 0:
-                        current_buy_count = int(ws.acell('K14').value or 0)
-                        ws.update('K14', [[current_buy_count + 1]])
-                        log(f"💰 매수 체결! K14(매수 횟수): {current_buy_count} → {current_buy_count + 1}", "💰")
-                    
-                    # 매도 체결 (잔고 감소)
-                    elif stock_change < 0:
-                        current_sell_count = int(ws.acell('K16').value or 0)
-                        ws.update('K16', [[current_sell_count + 1]])
-                        log(f"💰 매도 체결! K16(매도 횟수): {current_sell_count} → {current_sell_count + 1}", "💰")
-                    
-                    # K10(HTS 잔고) 업데이트
-                    ws.update('K10', [[hts_stock_q]])
-                    log(f"✅ K10 업데이트: {hts_stock_q}주", "✅")
-                    
-                except Exception as e:
-                    log(f"⚠️ 체결 데이터 업데이트 실패: {e}", "⚠️")
-            
             # 🔥 차이 해소 확인 (범위 매칭으로 티어 찾은 후)
             tier_data = self.sheet_manager.find_tier_by_quantity(sheet_data_obj['sheet_data'], hts_stock_q)
             
@@ -317,17 +359,14 @@ class SaltMaker:
                 
                 # 차이가 해소되었으면 K12를 0으로 초기화
                 if stock_diff == 0:
-                    try:
-                        current_k12 = ws.acell('K12').value
-                        if current_k12 and current_k12 != '0' and current_k12 != 0:
-                            ws.update('K12', [[0]])
-                            log(f"🎯 차이 해소! K12 초기화: {current_k12} → 0", "✅")
-                    except Exception as e:
-                        log(f"⚠️ K12 초기화 실패: {e}", "⚠️")
+                    current_k12 = fields['stock_change']
+                    if current_k12:
+                        self.write_cell(sheet_name, ws, cell('stock_change'), 0,
+                                        f"🎯 차이 해소! {cell('stock_change')} 초기화: {current_k12} → 0", "🎯")
 
-            last_tier = ws.acell('E12').value
-            sheet_buy_stop = ws.acell('E18').value.upper() == 'TRUE'
-            sheet_sell_stop = ws.acell('E20').value.upper() == 'TRUE'
+            last_tier = fields['last_tier']
+            sheet_buy_stop = fields['buy_stop']
+            sheet_sell_stop = fields['sell_stop']
 
             # 기본값 설정
             curr_tier_name = "매칭실패"
@@ -347,32 +386,22 @@ class SaltMaker:
                 buy_chk = False
                 sell_chk = False
 
-                try:
-                    sell_count = int(ws.acell('K14').value or 0)
-                    buy_count = int(ws.acell('K16').value or 0)
-                except:
-                    sell_count = 0
-                    buy_count = 0
+                buy_count = fields['buy_count']
+                sell_count = fields['sell_count']
 
                 # 🔥 잔고 차이 기반 자동 차단 로직
                 if stock_diff != 0:
                     # 잔고가 초과 (예: HTS 37주, 시트 30주 → +7주 초과)
                     if stock_diff > 0 and stock_diff > original_buy_q:
-                        try:
-                            ws.update_acell('E18', True)
-                            log(f"🔒 {sheet_name}: 잔고 초과({stock_diff:+d}주) > 매수량({original_buy_q}주) → E18 자동 활성화", "🔒")
-                        except Exception as e:
-                            log(f"⚠️ E18 업데이트 실패: {e}", "⚠️")
-                    
+                        self.write_cell(sheet_name, ws, cell('buy_stop'), True,
+                                        f"🔒 {sheet_name}: 잔고 초과({stock_diff:+d}주) > 매수량({original_buy_q}주) → {cell('buy_stop')} 자동 활성화", "🔒")
+
                     # 잔고가 부족 (예: HTS 20주, 시트 30주 → -10주 부족)
                     elif stock_diff < 0 and abs(stock_diff) > original_sell_q:
-                        try:
-                            ws.update_acell('E20', True)
-                            log(f"🔒 {sheet_name}: 잔고 부족({stock_diff:+d}주) > 매도량({original_sell_q}주) → E20 자동 활성화", "🔒")
-                        except Exception as e:
-                            log(f"⚠️ E20 업데이트 실패: {e}", "⚠️")
+                        self.write_cell(sheet_name, ws, cell('sell_stop'), True,
+                                        f"🔒 {sheet_name}: 잔고 부족({stock_diff:+d}주) > 매도량({original_sell_q}주) → {cell('sell_stop')} 자동 활성화", "🔒")
 
-                self.sheet_manager.update_tier(ws, curr_tier_name)
+                self.pipeline.write(sheet_name, self.sheet_manager.update_tier, ws, curr_tier_name)
 
                 log(f"🚀 주문 관리자로 데이터 전달: {ticker}", "📢")
                 log(f"👉 [전달값] 매수: {buy_p} ({buy_q}주) / 매도: {sell_p} ({sell_q}주)", "📢")
@@ -382,6 +411,7 @@ class SaltMaker:
                 trade_result = self.order_manager.execute_trade_logic(
                     sheet_data=sheet_data_obj['sheet_data'],
                     ticker=ticker,
+                    acc_cnt=sheet_data_obj['acc_cnt'],
                     hts_stock_q=hts_stock_q,
                     sheet_stock_q=sheet_data_obj['sheet_stock_q'],
                     buy_p=float(buy_p),
@@ -398,31 +428,37 @@ class SaltMaker:
                     curr_price=float(now_price),
                     buy_count=buy_count,
                     sell_count=sell_count,
-                    avg_price=sheet_data_obj['avg_price']
+                    avg_price=sheet_data_obj['avg_price'],
+                    sheet_name=sheet_name
                 )
 
                 if trade_result is None:
                     trade_result = {'buy_status': 'STAY', 'sell_status': 'STAY'}
 
+                # 🔥 체결 이벤트로 설명되지 않은 잔고 변화 반영
+                self.fill_detector.settle_balance(sheet_name, hts_stock_q)
+
                 buy_status = trade_result.get('buy_status', 'STAY')
                 sell_status = trade_result.get('sell_status', 'STAY')
 
                 # 예수금 부족 자동 차단
                 if buy_status == "LACK_OF_MONEY_POPUP":
-                    try:
-                        ws.update_acell('E18', True)
-                        log(f"🔒 {sheet_name}: 예수금 부족 -> E18 자동 활성화 완료", "🔒")
-                    except Exception as e:
-                        log(f"시트 업데이트 실패 (E18): {e}", "❌")
+                    self.write_cell(sheet_name, ws, cell('buy_stop'), True,
+                                    f"🔒 {sheet_name}: 예수금 부족 -> {cell('buy_stop')} 자동 활성화 완료", "🔒")
 
                 log(f"✅ {sheet_name} 처리 완료 (티어: {curr_tier_name})", "➡️")
 
             else:
                 buy_status = "⚠️티어미매칭"
                 log(f"⚠️ {sheet_name}: HTS 잔고({hts_stock_q})와 일치하는 티어 없음", "⚠️")
+                self.fill_detector.settle_balance(sheet_name, hts_stock_q)
 
-            # 텔레그램 알림 발송
-            telegram_bot.send_order_notification(
+            self.gate.record(sheet_name, sheet_data_obj['acc_cnt'], ticker, now_price, hts_stock_q, sheet_data)
+
+            # 텔레그램 알림 발송 (비동기)
+            self.pipeline.submit(
+                None,
+                telegram_bot.send_order_notification,
                 sheet_name,
                 ticker,
                 curr_tier_name,
@@ -443,138 +479,341 @@ class SaltMaker:
             log(f"매매 오류 ({sheet_name or 'Unknown'}): {e}", "❌")
             traceback.print_exc()
 
-    def run(self, user_name="영진"):
-        """메인 실행 루프"""
-        try:
-            self.display.change_resolution()
-            log(f"{user_name}님의 Salt Maker 시작", "🚀")
-
-            while True:
-                # 1. 키움 블랙아웃 시간 체크 (17:00 ~ 18:00)
-                if self.check_kiwoom_blackout_time():
-                    msg = "⏳ [Salt Maker 안내]\n현재는 키움증권 주문 제한 시간(17:00~18:00)입니다.\n시스템 보호를 위해 18시까지 대기 후 작업을 재개합니다."
-                    log(msg, "💤")
+    async def gui(self, fn, *args):
+        """HTS 화면 조작을 GUI 전용 스레드에서 실행하고 결과 대기 (이벤트 루프는 막지 않음)"""
+        def locked():
+            with gui_lock:
+                return fn(*args)
+        locked.__name__ = getattr(fn, '__name__', 'gui')
+        return await asyncio.get_running_loop().run_in_executor(self.gui_executor, locked)
 
-                    tg = getattr(self, 'telegram_manager', None) or getattr(self, 'telegram_bot', None)
-                    if tg:
-                        tg.send_message(msg)
+    async def sleep(self, seconds):
+        """취소 가능한 대기 (wake() 호출 시 바로 깨어남)"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, seconds))
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    def wake(self):
+        """대기 중인 메인 루프 깨우기 (HTS 종료 감지, 배정 시트 변경 등)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    def notify(self, message):
+        """텔레그램 알림 (작업 스레드에서 전송, 결과 대기 없음)"""
+        return self.pipeline.submit(None, self.telegram_manager.send_message, message)
+
+    async def health_monitor(self):
+        """HTS 프로세스 주기 점검 - 매매 사이클/대기와 별개로 실행"""
+        while True:
+            await asyncio.sleep(HEALTH_CHECK_SEC)
+            if self.hts_status != "EXECUTED":
+                continue
+            if not await asyncio.to_thread(self.check_health):
+                log("HTS 복구 필요. 재접속을 시도합니다...", "⚠️")
+                self.wake()
+
+    async def checkpoint_loop(self):
+        """실행 상태 주기 저장 (변화가 없으면 쓰지 않음)"""
+        while True:
+            await asyncio.sleep(CHECKPOINT_SEC)
+            await asyncio.to_thread(self.save_checkpoint, self.runtime_state())
+
+    async def heartbeat_loop(self):
+        """워커 모드: 코디네이터 하트비트 - 매매 사이클과 별개로 실행"""
+        while True:
+            affinity = {name: f"{info['acc_cnt']}|{info['ticker']}" for name, info in list(self.fill_detector.sheets.items())}
+            if await asyncio.to_thread(self.cluster.beat, affinity):
+                self.wake()
+            await asyncio.sleep(self.cluster.heartbeat_sec)
+
+    async def wait_blackout(self):
+        """키움 주문 제한 시간(17:00 ~ 18:00) 종료까지 대기"""
+        msg = "⏳ [Salt Maker 안내]\n현재는 키움증권 주문 제한 시간(17:00~18:00)입니다.\n시스템 보호를 위해 18시까지 대기 후 작업을 재개합니다."
+        log(msg, "💤")
+        self.notify(msg)
+
+        # 제한 종료 시각까지 대기 (중간에 깨어나도 남은 시간만큼 다시 대기)
+        resume_at = market_calendar.blackout_end()
+        while datetime.now() < resume_at:
+            await self.sleep((resume_at - datetime.now()).total_seconds())
+
+        resume_msg = "🚀 주문 제한 시간이 종료되었습니다. Salt Maker 다시 가동합니다!"
+        log(resume_msg, "✨")
+        self.notify(resume_msg)
+
+    async def run_cycle(self, due):
+        """실행 시각이 된 그리드 매매 작업 처리 (HTS 조작은 GUI 스레드, 시트 읽기는 미리 시작)"""
+        log(f"========== 새 사이클 시작 (실행 {len(due)}개 / 전체 {len(self.scheduler.entries)}개 작업) ==========", "🔄")
+        tracer.begin_cycle()
+
+        # 🔥 계좌/종목 전환 비용이 적은 순서로 재배열 (마감 시각 안에서)
+        current = None
+        if self.hts.current_account is not None and self.hts.current_ticker:
+            current = (str(self.hts.current_account), self.hts.current_ticker)
+        due, estimated, baseline = self.planner.plan(due, current)
+        if len(due) > 1:
+            log(f"🧭 실행 순서: {self.planner.describe(due)} (예상 {estimated:.0f}초 / 예약 순서 {baseline:.0f}초)", "🗺️")
+        cycle_started = time.time()
+
+        grid_tasks_count = 0
+        cycle_interrupted = False
+
+        # 첫 시트는 바로 읽기 시작, 이후 시트는 앞 시트의 HTS 조작 중에 미리 읽기
+        prefetched = {0: self.prefetch_sheet(due[0]['task'].sheet_name)}
+
+        # 🔥 관심종목 화면 1회 복사로 실행할 시트들의 현재가 일괄 조회 (종목을 아는 시트만)
+        if WATCHLIST_ENABLED:
+            tickers = [self.fill_detector.sheets[e['task'].sheet_name]['ticker']
+                       for e in due if e['task'].sheet_name in self.fill_detector.sheets]
+            if tickers:
+                await self.gui(self.hts.sweep_quotes, tickers)
+
+        for idx, entry in enumerate(due, 1):
+            if idx < len(due):
+                prefetched[idx] = self.prefetch_sheet(due[idx]['task'].sheet_name)
+
+            # 사이클 도중 HTS 종료가 감지되면 남은 시트는 재접속 후 실행
+            if self.hts_status != "EXECUTED":
+                for pending in due[idx - 1:]:
+                    self.scheduler.retry(pending)
+                break
+
+            # HTS 화면 체크
+            if not await self.gui(self.is_hts_on_top):
+                log("🚨 HTS 화면 이탈 감지! 1분 대기 후 재시도...", "⚠️")
+                self.notify("⚠️ HTS 창이 가려졌습니다. 매매를 잠시 멈춥니다.")
+                for pending in due[idx - 1:]:
+                    self.scheduler.retry(pending, delay=60)
+                cycle_interrupted = True
+                break
+
+            # 🔥 워커 모드: 사이클 도중 다른 워커로 재배치되었거나 임대가 만료된 시트는 건너뜀 (이중 실행 방지)
+            sheet_name = entry['task'].sheet_name
+            if self.cluster and sheet_name not in {t.sheet_name for t in self.cluster.current_tasks()}:
+                log(f"--- 작업 {idx}/{len(due)}: {sheet_name} 임대 없음 - 건너뜀 ---", "🗂️")
+                prefetched.pop(idx - 1, None)
+                self.scheduler.retry(entry)  # 다시 배정되면 바로 실행, 아니면 다음 sync 에서 제거
+                continue
+
+            grid_tasks_count += 1
+            log(f"--- 작업 {idx}/{len(due)}: 그리드 매매 #{grid_tasks_count} 시작 ---", "📌")
+            started_at = time.time()
+            self.planner.begin_sheet()
+            if self.cluster:
+                self.cluster.running = sheet_name  # 하트비트로 보고 → 실행 중에는 다른 워커에 넘어가지 않음
+            try:
+                await self.gui(self.handle_grid_trading, entry['task'], prefetched.pop(idx - 1))
+            finally:
+                if self.cluster:
+                    self.cluster.running = None
+            self.planner.observe_sheet(time.time() - started_at)
+            self.scheduler.complete(entry, started_at)
+            log(f"--- 작업 {idx}/{len(due)}: 완료 ---", "✅")
+
+        cycle_elapsed_ms = tracer.end_cycle()
+
+        if cycle_interrupted:
+            log("사이클 중단됨. 다음 사이클로 이동합니다.", "⚠️")
+            await self.sleep(60)
+            return
 
-                    # 18시 정각까지 대기
-                    while datetime.datetime.now().hour == 17:
-                        time.sleep(60)
+        log(f"========== 사이클 완료 ({grid_tasks_count}개 종목 처리) ==========", "✅")
+        if cycle_elapsed_ms is not None and grid_tasks_count > 0:
+            log(f"⏱️ 사이클 소요 시간: {cycle_elapsed_ms / 1000:.2f}초", "📈")
+        if grid_tasks_count > 1:
+            log(f"🧭 사이클 시간: 예상 {estimated:.0f}초 / 실제 {time.time() - cycle_started:.0f}초", "📈")
+
+    async def step(self):
+        """메인 루프 1회"""
+        # 1. 키움 블랙아웃 시간 체크 (17:00 ~ 18:00)
+        if self.check_kiwoom_blackout_time():
+            await self.wait_blackout()
+            return
 
-                    resume_msg = "🚀 주문 제한 시간이 종료되었습니다. Salt Maker 다시 가동합니다!"
-                    log(resume_msg, "✨")
-                    if tg:
-                        tg.send_message(resume_msg)
+        # 작업 파일 로드 (변경되었을 때만 다시 읽음)
+        self.tasks.refresh()
+        if not self.tasks.has_tasks:
+            log("작업 파일이 없습니다. 10초 후 재시도...", "⏳")
+            await self.sleep(10)
+            return
 
-                    continue
+        # 자동 로그인 (HTS 실행 전까지 5초마다 확인)
+        if self.hts_status != "EXECUTED":
+            for task in self.tasks.login_tasks:
+                await self.gui(self.handle_auto_login, task)
+            if self.hts_status != "EXECUTED":
+                await self.sleep(5)
+                return
 
+        # 실행 시각이 된 그리드 매매 작업만 처리 (워커 모드면 코디네이터가 배정한 시트만)
+        if self.cluster:
+            self.scheduler.sync(self.cluster.current_tasks())
+        else:
+            self.scheduler.sync(self.tasks.grid_tasks)
+        due = self.scheduler.pop_due()
+        if due:
+            await self.run_cycle(due)
+            await asyncio.to_thread(self.save_checkpoint, self.runtime_state())
+            if self.hts_status != "EXECUTED":
+                return
 
-                # HTS 상태 체크
-                if not self.check_health():
-                    log("HTS 복구 필요. 10초 후 재시도...", "⚠️")
-                    time.sleep(10)
-                    continue
+        # 🔥 미체결 주문이 있는 종목만 짧은 주기로 체결 확인
+        if self.fill_detector.due_sheets() and await self.gui(self.is_hts_on_top):
+            await self.gui(self.fill_detector.poll_due)
+
+        # 🔥 가장 빠른 실행 시각까지 대기 (task.json 변경 반영을 위해 최대 TASK_RELOAD_SEC)
+        wait_sec, next_name = self.scheduler.seconds_until_next()
+        fill_wait = self.fill_detector.seconds_until_due()
+        lease_wait = self.cluster.seconds_until_expiry() if self.cluster else None
+        session_wait = market_calendar.seconds_until_transition()  # 세션/주문 제한 경계에서 정확히 깨어남
+        waits = [w for w in (wait_sec, fill_wait, lease_wait, session_wait, TASK_RELOAD_SEC) if w is not None]
+        sleep_sec = min(waits)
+        target = (next_name, round(self.scheduler.entries[next_name]['due'])) if next_name else None
+        if target != self._last_wait_target:
+            self._last_wait_target = target
+            if next_name:
+                due_at = datetime.fromtimestamp(target[1]).strftime('%H:%M:%S')
+                log(f"💤 다음 작업: {next_name} ({due_at}, {wait_sec:.0f}초 후)", "⏰")
+        if sleep_sec > 0:
+            await self.sleep(sleep_sec)
+
+    async def run_async(self, user_name):
+        """
+        메인 실행 루프 (asyncio)
+        - HTS 조작: GUI 전용 스레드 1개에서 순서대로 실행
+        - 시트/텔레그램: SheetPipeline 작업 스레드
+        - HTS 상태 점검, 코디네이터 하트비트: 백그라운드 태스크 (대기/HTS 조작 중에도 실행)
+        """
+        self.gui_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gui")
+        self._wake = asyncio.Event()
+        background = [asyncio.create_task(self.health_monitor(), name="health"),
+                      asyncio.create_task(self.checkpoint_loop(), name="checkpoint")]
+        if self.cluster:
+            background.append(asyncio.create_task(self.heartbeat_loop(), name="heartbeat"))
 
-                # 작업 파일 로드
-                tasks = self.load_tasks()
-                if not tasks:
-                    log("작업 파일이 없습니다. 10초 후 재시도...", "⏳")
-                    time.sleep(10)
-                    continue
+        try:
+            self.display.change_resolution()
+            log(f"{user_name}님의 Salt Maker 시작", "🚀")
 
-                # 첫 번째 카드의 interval 추출
-                first_interval = 60
-                try:
-                    first_task = tasks[0]
-                    items = [i.strip() for i in first_task.get('details', "").split(' / ')]  # 🔥 구분자 통일
-                    if len(items) >= 4:
-                        first_interval = int(items[3])
-                except:
-                    first_interval = 60
-
-                log(f"========== 새 사이클 시작 (총 {len(tasks)}개 작업) ==========", "🔄")
-
-                grid_tasks_count = 0
-                cycle_interrupted = False
-
-                for idx, task in enumerate(tasks, 1):
-                    task_type = task.get('type')
-
-                    if task_type == "자동 로그인":
-                        if self.hts_status != "EXECUTED":
-                            self.handle_auto_login(task)
-
-                    elif task_type == "그리드 매매" and self.hts_status == "EXECUTED":
-                        # HTS 화면 체크
-                        if not self.is_hts_on_top():
-                            log("🚨 HTS 화면 이탈 감지! 1분 대기 후 재시도...", "⚠️")
-                            telegram_bot.send_message("⚠️ HTS 창이 가려졌습니다. 매매를 잠시 멈춥니다.")
-                            time.sleep(60)
-                            cycle_interrupted = True
-                            break
-
-                        grid_tasks_count += 1
-                        log(f"--- 작업 {idx}/{len(tasks)}: 그리드 매매 #{grid_tasks_count} 시작 ---", "📌")
-                        self.handle_grid_trading(task)
-                        log(f"--- 작업 {idx}/{len(tasks)}: 완료 ---", "✅")
-
-                if cycle_interrupted:
-                    log("사이클 중단됨. 다음 사이클로 이동합니다.", "⚠️")
-                    continue
+            # 🔥 직전 실행의 HTS 가 살아 있으면 재로그인 없이 이어서 실행
+            await self.gui(self.warm_start)
 
-                log(f"========== 사이클 완료 ({grid_tasks_count}개 종목 처리) ==========", "✅")
-                
-                # 🔥 개별 간격 방식: 빠른 체크 루프 (5초마다)
-                log(f"⏰ 5초 후 다음 체크 사이클...", "⏰")
-                time.sleep(5)
+            while True:
+                await self.step()
 
-        except KeyboardInterrupt:
+        except asyncio.CancelledError:
             log("사용자에 의해 프로그램이 종료되었습니다.", "🛑")
+            raise
         except Exception as e:
             log(f"🚨 가동 중 오류 발생: {e}", "❌")
             traceback.print_exc()
         finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            self.save_checkpoint()  # 재시작 시 웜 스타트용
+            # 진행 중인 HTS 조작은 끝까지 마친 뒤 종료 (대기 중인 조작은 취소)
+            self.gui_executor.shutdown(wait=True, cancel_futures=True)
             self.display.restore_resolution()
             log("프로그램 종료. 화면 해상도 복구 완료.", "👋")
+            self.pipeline.shutdown()
+            self.hts.samples.flush()
+            if self.cluster:
+                self.cluster.release()
+            self.export_trace()
+
+    def run(self, user_name="영진"):
+        """메인 실행 (Ctrl+C 시 백그라운드 작업 정리 후 종료)"""
+        try:
+            asyncio.run(self.run_async(user_name))
+        except KeyboardInterrupt:
+            pass
+
+    def export_trace(self):
+        """구간 계측 결과 저장 (TRACE_ENABLED 일 때만)"""
+        if not tracer.enabled:
+            return
+        try:
+            path = os.path.join("logs", f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            tracer.export_chrome_trace(path)
+            log(f"구간 계측 결과 저장: {path}\n{tracer.format_summary()}", "📈")
+        except Exception as e:
+            log(f"구간 계측 저장 실패: {e}", "⚠️")
+
+
+def load_registry():
+    """task.json 로드 및 검증"""
+    registry = TaskRegistry(GRID_CONFIG_PATH)
+    registry.refresh()
+    return registry
+
+
+def load_telegram_config(sm, registry):
+    """첫 번째 그리드 매매 시트의 텔레그램 설정 반영"""
+    first_sheet_name = registry.first_sheet_name()
+    if first_sheet_name:
+        return setup_telegram_config(sm, first_sheet_name)
+    log("⚠️ '그리드 매매' 작업을 찾을 수 없어 기본 설정을 유지합니다.", "⚠️")
+    return False
+
+
+def preload_gui_modules():
+    """
+    시트/라이선스 확인을 기다리는 동안 GUI 모듈 미리 로드
+    (pywinauto 는 import 한 스레드에서 COM 을 초기화하므로 HTS 조작 스레드에서 로드)
+    """
+    for name in GUI_PRELOAD_MODULES:
+        try:
+            __import__(name)
+        except ImportError as e:
+            log(f"⚠️ {name} 미리 로드 실패: {e}", "⚠️")
+
+
+def build_startup_graph():
+    """
+    시작 단계 의존성 그래프
+    시트 연결 ─┬─ 텔레그램 설정 (+ task.json)
+               ├─ 라이선스 체크 (+ HWID)
+               └─ SaltMaker 생성 (+ task.json, 코디네이터 모드 제외)
+    task.json 검증, HWID 조회, GUI 모듈 로드는 시트 연결과 동시에 진행
+    """
+    graph = StartupGraph()
+    graph.add("sheet", "구글 시트 연결", GoogleSheetManager)
+    graph.add("tasks", "task.json 검증", load_registry)
+    graph.add("hwid", "HWID 조회", get_hwid)
+    graph.add("gui", "GUI 모듈 로드", preload_gui_modules)
+    graph.add("telegram", "텔레그램 설정", load_telegram_config, deps=("sheet", "tasks"))
+    graph.add("license", "라이선스 체크", lambda sm, hwid: AuthManager(sm).check_license(hwid), deps=("sheet", "hwid"))
+    if CLUSTER_ROLE != "coordinator":
+        # 라이선스 결과와 무관한 로컬 초기화 (인증 실패 시 사용하지 않고 종료)
+        graph.add("bot", "SaltMaker 생성", lambda sm, registry, _: SaltMaker(sm, registry),
+                  deps=("sheet", "tasks", "gui"))
+    return graph
 
 
 def main():
     try:
+        startup_profiler.mark("모듈 import")
         log("1. 프로그램 초기화 중...", "🔍")
-        sm = GoogleSheetManager()
 
-        # task.json 로드 및 검증
+        # task.json 존재 여부는 다른 단계보다 먼저 확인
         if not os.path.exists(GRID_CONFIG_PATH):
             log(f"❌ 설정 파일({GRID_CONFIG_PATH})을 찾을 수 없습니다.", "🚨")
             input("엔터를 누르면 종료합니다...")
             return
 
-        first_sheet_name = None
-        with open(GRID_CONFIG_PATH, 'r', encoding='utf-8') as f:
-            tasks = json.load(f)
-            task_list = list(tasks.values()) if isinstance(tasks, dict) else tasks
-            for t in task_list:
-                if t.get('type') == "그리드 매매":
-                    details = t.get('details', "")
-                    if details:
-                        first_sheet_name = [i.strip() for i in details.split(' / ')][0]  # 🔥 구분자 통일
-                        break
-
-        # 텔레그램 설정 로드
-        if first_sheet_name:
-            setup_telegram_config(sm, first_sheet_name)
-        else:
-            log("⚠️ '그리드 매매' 작업을 찾을 수 없어 기본 설정을 유지합니다.", "⚠️")
-
-        # 라이선스 체크
-        current_hwid = get_hwid()
-        auth = AuthManager(sm)
-        is_valid, msg = auth.check_license(current_hwid)
+        # 🔥 시트 연결, task.json, HWID, 라이선스, 텔레그램 설정을 의존성 순서대로 동시에 실행
+        with startup_profiler.phase("병렬 초기화"):
+            results = build_startup_graph().run()
+        registry = results["tasks"]
+        current_hwid = results["hwid"]
+        is_valid, msg = results["license"]
 
         if not is_valid:
             log(f"❌ 인증 실패: {msg}", "🚨")
+            startup_profiler.report()
             pyperclip.copy(current_hwid)
             input("종료하려면 엔터를 누르세요...")
             return
@@ -582,8 +821,15 @@ def main():
         # SaltMaker 실행
         log(f"✅ {msg}", "🚀")
 
-        dynamic_user_name = get_first_user_name()
-        bot = SaltMaker()
+        # 코디네이터 모드: HTS 없이 작업 배정만 담당
+        if CLUSTER_ROLE == "coordinator":
+            startup_profiler.report()
+            Coordinator(registry).serve_forever()
+            return
+
+        dynamic_user_name = registry.first_user_name()
+        bot = results["bot"]
+        startup_profiler.report()
         log(f"🤖 {dynamic_user_name}님의 Salt Maker 객체 생성 완료. 실행을 시작합니다.", "✨")
 
         bot.run(dynamic_user_name)
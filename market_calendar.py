@@ -0,0 +1,220 @@
+"""
+미국 시장 거래 달력
+세션 경계(프리/정규/애프터), 키움 주문 제한 시간, 미국 휴장일/조기 종료, 서머타임을
+날짜별로 미리 계산해 두고 "현재 세션"과 "다음 전환 시각"을 바로 조회
+- 세션 표는 미국 동부 시간(ET) 기준 → PC 로컬 시간으로 변환 (서머타임 여부는 날짜별 계산)
+- 휴장일/조기 종료는 NYSE 규칙으로 계산 + config 의 추가 날짜
+- 주문 제한 시간은 로컬 시간 기준 (BLACKOUT_HOURS)
+"""
+
+import bisect
+from datetime import datetime, date, timedelta, timezone
+
+try:
+    from config import BLACKOUT_HOURS
+except ImportError:
+    BLACKOUT_HOURS = (17, 18)   # 키움 주문 제한 시간 [시작, 종료) - 로컬 시간
+
+try:
+    from config import MARKET_HOLIDAYS, MARKET_EARLY_CLOSES
+except ImportError:
+    MARKET_HOLIDAYS = []        # 규칙 외 추가 휴장일 ["YYYY-MM-DD", ...] (미국 날짜)
+    MARKET_EARLY_CLOSES = []    # 규칙 외 추가 조기 종료일 ["YYYY-MM-DD", ...]
+
+# 세션 표 (ET, [시작, 종료))
+SESSION_TABLE = (("PRE", "04:00", "09:30"), ("REGULAR", "09:30", "16:00"), ("AFTER", "16:00", "20:00"))
+EARLY_CLOSE_TABLE = (("PRE", "04:00", "09:30"), ("REGULAR", "09:30", "13:00"), ("AFTER", "13:00", "17:00"))
+
+CALENDAR_DAYS = 8  # 한 번에 미리 계산하는 기간 (일)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """month 의 n번째 weekday (n=-1 이면 마지막)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    """부활절 (그레고리력, Anonymous Gregorian algorithm)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+
+def _observed(d):
+    """토요일 → 금요일, 일요일 → 월요일"""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+def us_holidays(year):
+    """NYSE 휴장일 집합"""
+    days = {
+        _nth_weekday(year, 1, 0, 3),          # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),          # Presidents' Day
+        _easter(year) - timedelta(days=2),    # Good Friday
+        _nth_weekday(year, 5, 0, -1),         # Memorial Day
+        _observed(date(year, 7, 4)),          # Independence Day
+        _nth_weekday(year, 9, 0, 1),          # Labor Day
+        _nth_weekday(year, 11, 3, 4),         # Thanksgiving
+        _observed(date(year, 12, 25)),        # Christmas
+    }
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:               # 토요일이면 전년도 12/31 대체 휴장 없음
+        days.add(_observed(new_year))
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))  # Juneteenth
+    days.update(date.fromisoformat(d) for d in MARKET_HOLIDAYS if d.startswith(str(year)))
+    return days
+
+
+def us_early_closes(year, holidays):
+    """NYSE 조기 종료일 (13:00 ET) 집합"""
+    candidates = {
+        date(year, 7, 3),                                       # 독립기념일 전날
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),       # 추수감사절 다음날
+        date(year, 12, 24),                                     # 크리스마스 이브
+    }
+    days = {d for d in candidates if d.weekday() < 5 and d not in holidays}
+    days.update(date.fromisoformat(d) for d in MARKET_EARLY_CLOSES if d.startswith(str(year)))
+    return days
+
+
+def is_us_dst(d):
+    """미국 서머타임 적용 날짜 여부 (3월 둘째 일요일 ~ 11월 첫째 일요일 전날)"""
+    return _nth_weekday(d.year, 3, 6, 2) <= d < _nth_weekday(d.year, 11, 6, 1)
+
+
+def _et_to_local(d, hhmm):
+    """미국 날짜 d 의 ET 시각 "HH:MM" → PC 로컬 naive datetime"""
+    hour, minute = map(int, hhmm.split(':'))
+    et = timezone(timedelta(hours=-4 if is_us_dst(d) else -5))
+    return datetime(d.year, d.month, d.day, hour, minute, tzinfo=et).astimezone().replace(tzinfo=None)
+
+
+class MarketCalendar:
+    """날짜별 세션 경계를 미리 계산한 거래 달력"""
+
+    def __init__(self, days=CALENDAR_DAYS):
+        self.days = days
+        self._years = {}      # {year: (휴장일, 조기 종료일)}
+        self._bounds = []     # 상태 구간 시작 시각 (정렬)
+        self._states = []     # [(session, blackout)] - _bounds[i] ~ _bounds[i+1]
+        self._cur = None      # 마지막 조회 구간 (start, end, state)
+
+    def _year(self, year):
+        if year not in self._years:
+            holidays = us_holidays(year)
+            self._years[year] = (holidays, us_early_closes(year, holidays))
+        return self._years[year]
+
+    def is_holiday(self, d):
+        """미국 휴장일(주말 포함) 여부"""
+        return d.weekday() >= 5 or d in self._year(d.year)[0]
+
+    def is_early_close(self, d):
+        return d in self._year(d.year)[1]
+
+    def _build(self, now):
+        """now 전날부터 self.days 일간의 상태 구간 계산"""
+        start = datetime.combine(now.date() - timedelta(days=1), datetime.min.time())
+        end = start + timedelta(days=self.days)
+
+        sessions = []   # [(시작, 종료, 세션)]
+        d = start.date() - timedelta(days=1)
+        while d <= end.date():
+            if not self.is_holiday(d):
+                table = EARLY_CLOSE_TABLE if self.is_early_close(d) else SESSION_TABLE
+                sessions.extend((_et_to_local(d, s), _et_to_local(d, e), name) for name, s, e in table)
+            d += timedelta(days=1)
+
+        blackouts = []  # [(시작, 종료)]
+        start_h, end_h = BLACKOUT_HOURS
+        d = start.date()
+        while d <= end.date():
+            day = datetime.combine(d, datetime.min.time())
+            blackouts.append((day + timedelta(hours=start_h), day + timedelta(hours=end_h)))
+            d += timedelta(days=1)
+
+        points = {start, end}
+        for s, e, _ in sessions:
+            points.update((s, e))
+        for s, e in blackouts:
+            points.update((s, e))
+        points = sorted(p for p in points if start <= p <= end)
+
+        bounds, states = [], []
+        for p in points[:-1]:
+            session = next((name for s, e, name in sessions if s <= p < e), "CLOSED")
+            blackout = any(s <= p < e for s, e in blackouts)
+            if states and states[-1] == (session, blackout):
+                continue  # 같은 상태가 이어지는 경계는 합침
+            bounds.append(p)
+            states.append((session, blackout))
+        bounds.append(end)
+        self._bounds, self._states = bounds, states
+        self._cur = None
+
+    def _lookup(self, now):
+        """now 가 속한 구간 (start, end, (session, blackout))"""
+        cur = self._cur
+        if cur is not None and cur[0] <= now < cur[1]:
+            return cur
+        if not self._bounds or not (self._bounds[0] <= now < self._bounds[-1] - timedelta(days=1)):
+            self._build(now)
+        i = bisect.bisect_right(self._bounds, now) - 1
+        self._cur = (self._bounds[i], self._bounds[i + 1], self._states[i])
+        return self._cur
+
+    def session(self, now=None):
+        """현재 미국 시장 세션 ("PRE" / "REGULAR" / "AFTER" / "CLOSED")"""
+        return self._lookup(now or datetime.now())[2][0]
+
+    def is_blackout(self, now=None):
+        """키움 주문 제한 시간 여부"""
+        return self._lookup(now or datetime.now())[2][1]
+
+    def blackout_end(self, now=None):
+        """
+        주문 제한 시간 종료 시각
+
+        Returns:
+            datetime: 제한 시간이 아니면 now 그대로
+        """
+        now = now or datetime.now()
+        start, end, (_, blackout) = self._lookup(now)
+        while blackout:
+            start, end, (_, blackout) = self._lookup(end)
+        return max(start, now)
+
+    def next_transition(self, now=None):
+        """
+        다음 상태 전환
+
+        Returns:
+            tuple: (전환 시각, 세션, 주문 제한 여부)
+        """
+        end = self._lookup(now or datetime.now())[1]
+        session, blackout = self._lookup(end)[2]
+        return end, session, blackout
+
+    def seconds_until_transition(self, now=None):
+        now = now or datetime.now()
+        return max(0.0, (self._lookup(now)[1] - now).total_seconds())
+
+
+market_calendar = MarketCalendar()
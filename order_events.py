@@ -0,0 +1,153 @@
+"""
+주문 라이프사이클 이벤트 저장 모듈
+주문 결정 → 주문창 입력 → 주문 전송 → 접수 확인 → 체결/취소 단계를
+단조 시계(monotonic) 타임스탬프와 함께 일자별 컬럼 파일로 저장
+
+저장 형식 (data/order_events/YYYY-MM-DD/):
+- 숫자 컬럼: <컬럼>.f64 (float64 배열, 행마다 8바이트 추가)
+- 문자 컬럼: <컬럼>.txt (행마다 한 줄)
+- 중간에 중단된 행은 읽을 때 가장 짧은 컬럼 길이에 맞춰 버림
+"""
+
+import os
+import time
+import math
+import threading
+from array import array
+from datetime import datetime
+
+try:
+    from config import ORDER_EVENTS_DIR
+except ImportError:
+    ORDER_EVENTS_DIR = "data/order_events"
+
+
+# 이벤트 종류 (발생 순서)
+DECIDED = "decided"              # final_trade_check 승인
+TICKET_FILLED = "ticket_filled"  # 주문창에 수량/가격 입력 완료
+SUBMITTED = "submitted"          # 주문 버튼 클릭
+CONFIRMED = "confirmed"          # 미체결 목록에서 접수 확인
+FILLED = "filled"                # 체결
+CANCELLED = "cancelled"          # 취소
+REJECTED = "rejected"            # 접수 실패
+
+EVENT_ORDER = [DECIDED, TICKET_FILLED, SUBMITTED, CONFIRMED, FILLED, CANCELLED, REJECTED]
+
+NUMERIC_COLUMNS = ('mono_ts', 'wall_ts', 'price', 'ref_price', 'fill_price', 'qty')
+TEXT_COLUMNS = ('event', 'client_id', 'ticker', 'side', 'session')
+
+
+class OrderEventStore:
+    """주문 이벤트 컬럼 저장소 (추가 전용)"""
+
+    def __init__(self, base_dir=ORDER_EVENTS_DIR):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+
+    def _day_dir(self, wall_ts):
+        day = datetime.fromtimestamp(wall_ts).strftime('%Y-%m-%d')
+        path = os.path.join(self.base_dir, day)
+        if not os.path.exists(path):
+            os.makedirs(path)
+        return path
+
+    def emit(self, event, client_id, ticker, side, session="", price=0.0, ref_price=0.0,
+             fill_price=float('nan'), qty=0):
+        """
+        이벤트 1건 기록
+
+        Args:
+            event: 이벤트 종류 (DECIDED, SUBMITTED 등)
+            client_id: 주문 client ID
+            ticker: 종목 코드
+            side: "BUY" / "SELL"
+            session: 시장 세션 (get_market_session)
+            price: 주문 가격
+            ref_price: 결정 시점 현재가 (슬리피지 기준)
+            fill_price: 체결 가격 (체결 이벤트만, 나머지는 NaN)
+            qty: 주문 수량
+        """
+        wall_ts = time.time()
+        numeric = {
+            'mono_ts': time.monotonic(),
+            'wall_ts': wall_ts,
+            'price': _to_float(price),
+            'ref_price': _to_float(ref_price),
+            'fill_price': _to_float(fill_price),
+            'qty': _to_float(qty)
+        }
+        text = {
+            'event': event,
+            'client_id': client_id or "",
+            'ticker': ticker or "",
+            'side': side or "",
+            'session': session or ""
+        }
+        try:
+            with self._lock:
+                day_dir = self._day_dir(wall_ts)
+                for col in NUMERIC_COLUMNS:
+                    with open(os.path.join(day_dir, col + ".f64"), 'ab') as f:
+                        f.write(array('d', [numeric[col]]).tobytes())
+                for col in TEXT_COLUMNS:
+                    with open(os.path.join(day_dir, col + ".txt"), 'a', encoding='utf-8') as f:
+                        f.write(str(text[col]).replace("\n", " ") + "\n")
+        except Exception as e:
+            print(f"⚠️ 주문 이벤트 기록 실패: {e}")
+
+    def days(self):
+        """저장된 일자 목록 (오름차순)"""
+        if not os.path.exists(self.base_dir):
+            return []
+        return sorted(d for d in os.listdir(self.base_dir) if os.path.isdir(os.path.join(self.base_dir, d)))
+
+    def load(self, days=None):
+        """
+        컬럼 데이터 로드
+
+        Args:
+            days: 읽을 일자 목록 (None이면 전체)
+
+        Returns:
+            dict: {컬럼명: array('d') 또는 list(str)}
+        """
+        columns = {col: array('d') for col in NUMERIC_COLUMNS}
+        columns.update({col: [] for col in TEXT_COLUMNS})
+
+        for day in (days if days is not None else self.days()):
+            day_dir = os.path.join(self.base_dir, day)
+            part = {}
+            for col in NUMERIC_COLUMNS:
+                arr = array('d')
+                path = os.path.join(day_dir, col + ".f64")
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        raw = f.read()
+                    arr.frombytes(raw[:len(raw) - len(raw) % 8])
+                part[col] = arr
+            for col in TEXT_COLUMNS:
+                path = os.path.join(day_dir, col + ".txt")
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        part[col] = f.read().split("\n")[:-1]
+                else:
+                    part[col] = []
+
+            rows = min(len(v) for v in part.values())
+            for col in NUMERIC_COLUMNS:
+                columns[col].extend(part[col][:rows])
+            for col in TEXT_COLUMNS:
+                columns[col].extend(part[col][:rows])
+
+        return columns
+
+
+def _to_float(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def is_nan(val):
+    return isinstance(val, float) and math.isnan(val)
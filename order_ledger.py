@@ -0,0 +1,444 @@
+"""
+주문 원장(ledger) 모듈
+우리가 낸 주문(가격, 수량, 시각, 예상 상태)을 로컬에 기록하여
+미체결 조회 화면 이동이 꼭 필요한 경우에만 HTS를 조회하도록 판단
+- 주문마다 결정적 client ID 부여 (시트, 티어, 방향, 가격, 시간 구간)
+- 추가 전용(JSONL) 파일에 기록 → 재시작 후에도 중복 주문 방지
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+
+from utils import log
+
+try:
+    from config import LEDGER_RECHECK_SEC, LEDGER_PATH, ORDER_ID_WINDOW_SEC, LEDGER_RETENTION_SEC
+except ImportError:
+    LEDGER_RECHECK_SEC = 600                  # 원장만 믿고 HTS 조회를 생략할 수 있는 최대 시간 (초)
+    LEDGER_PATH = "data/order_ledger.jsonl"   # 추가 전용 원장 파일
+    ORDER_ID_WINDOW_SEC = 300                 # client ID 시간 구간 (초)
+    LEDGER_RETENTION_SEC = 86400              # 시작 시 정리할 때 남겨 둘 기간 (초)
+
+
+# 주문 상태
+PENDING = "PENDING"        # 주문 버튼 클릭 직전 기록 (접수 여부 미확인)
+WORKING = "WORKING"        # 접수되어 미체결로 남아 있을 수 있음
+FILLED = "FILLED"          # 체결 완료
+CANCELLED = "CANCELLED"    # 취소 완료
+CLOSED = "CLOSED"          # HTS 미체결 목록에서 사라짐 (체결/취소 구분 불가)
+REJECTED = "REJECTED"      # 접수 실패 (예수금 부족 등)
+
+OPEN_STATES = (PENDING, WORKING)
+
+
+def same_price(a, b):
+    """주문 가격 동일 여부 (센트 단위 비교)"""
+    try:
+        return abs(float(a) - float(b)) < 0.01
+    except (TypeError, ValueError):
+        return False
+
+
+def matches(order, side, price):
+    """원장 주문과 (side, price) 일치 여부 (side가 None이면 가격만 비교)"""
+    if side is not None and order.get('side') is not None and order['side'] != side:
+        return False
+    return same_price(order['price'], price)
+
+
+def signed_qty(order, qty):
+    """잔고 기준 부호 있는 수량 (매수 +, 매도 -)"""
+    return int(qty) if order.get('side') == "BUY" else -int(qty)
+
+
+def ledger_key(acc_cnt, ticker):
+    """원장 키 (계좌 순번, 종목) - 같은 종목이라도 계좌가 다르면 주문/잔고를 따로 관리"""
+    return str(acc_cnt), ticker
+
+
+def make_client_id(sheet_name, tier, side, price, now=None, window_sec=ORDER_ID_WINDOW_SEC):
+    """
+    결정적 client ID 생성
+
+    같은 시트/티어/방향/가격의 주문은 같은 시간 구간 안에서 항상 같은 ID를 가짐
+
+    Returns:
+        str: 16자리 16진수 ID
+    """
+    window = int((now if now is not None else time.time()) // window_sec)
+    key = f"{sheet_name}|{tier}|{side}|{float(price):.2f}|{window}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class OrderLedger:
+    """로컬 주문 원장 (계좌/종목별 주문 기록 + 마지막 확인 잔고)"""
+
+    def __init__(self, recheck_sec=LEDGER_RECHECK_SEC, path=LEDGER_PATH):
+        self.recheck_sec = recheck_sec
+        self.path = path
+        self.orders = {}          # {(acc_cnt, ticker): [order dict, ...]}
+        self.by_id = {}           # {client_id: order dict}
+        self.balances = {}        # {(acc_cnt, ticker): 마지막으로 확인한 HTS 잔고}
+        self.last_verified = {}   # {(acc_cnt, ticker): 마지막 HTS 미체결 조회 시각}
+        self.listeners = []       # 상태 변경 콜백 [fn(order, prev_state, state)]
+        self.fill_listeners = []  # 체결 콜백 [fn(fill)]
+        self._lock = threading.RLock()
+        if self.path:
+            self._load()
+
+    # ------------------------------------------------------------------
+    # 파일 기록 / 복원
+    # ------------------------------------------------------------------
+
+    def _append(self, event):
+        """원장 파일에 이벤트 1줄 추가 (fsync 포함)"""
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            log(f"원장 파일 기록 실패: {e}", "⚠️")
+
+    def _load(self):
+        """원장 파일 재생 후 오래된 종료 주문을 정리하여 다시 저장"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # 기록 중 중단된 마지막 줄
+                    self._apply(event)
+        except Exception as e:
+            log(f"원장 파일 로드 실패: {e}", "⚠️")
+            return
+
+        self._compact()
+        open_count = sum(1 for o in self.by_id.values() if o['state'] in OPEN_STATES)
+        log(f"📒 원장 복원: {len(self.by_id)}건 (미체결 가능 {open_count}건)", "📒")
+
+    @staticmethod
+    def _key(order):
+        """주문 기록의 원장 키"""
+        return ledger_key(order.get('acc_cnt'), order['ticker'])
+
+    def _apply(self, event):
+        """이벤트 1건을 메모리 원장에 반영"""
+        op = event.get('op')
+        if op == 'order':
+            order = {k: v for k, v in event.items() if k != 'op'}
+            previous = self.by_id.get(order['client_id'])
+            if previous is not None:
+                # 같은 ID 재전송 기록 → 이전 기록 대체 (record_order 와 동일)
+                self.orders.get(self._key(previous), []).remove(previous)
+            self.orders.setdefault(self._key(order), []).append(order)
+            self.by_id[order['client_id']] = order
+        elif op == 'update':
+            order = self.by_id.get(event.get('client_id'))
+            if order is not None:
+                order.update({k: v for k, v in event.items() if k not in ('op', 'client_id')})
+
+    def _compact(self):
+        """보관 기간이 지난 종료 주문 제거 후 원자적으로 다시 쓰기 (tmp + rename)"""
+        cutoff = time.time() - LEDGER_RETENTION_SEC
+        for key in list(self.orders):
+            kept = [o for o in self.orders[key] if o['state'] in OPEN_STATES or o.get('time', 0) >= cutoff]
+            if kept:
+                self.orders[key] = kept
+            else:
+                del self.orders[key]
+        self.by_id = {o['client_id']: o for orders in self.orders.values() for o in orders}
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for order in self.by_id.values():
+                    f.write(json.dumps(dict(order, op='order'), ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            log(f"원장 파일 정리 실패: {e}", "⚠️")
+
+    # ------------------------------------------------------------------
+    # 주문 기록
+    # ------------------------------------------------------------------
+
+    def record_order(self, acc_cnt, ticker, side, price, qty, state=WORKING, client_id=None, **extra):
+        """
+        주문 기록
+
+        Args:
+            acc_cnt: 계좌 순번
+            ticker: 종목 코드
+            side: "BUY" 또는 "SELL"
+            price: 주문 가격
+            qty: 주문 수량
+            state: 예상 상태 (기본 WORKING)
+            client_id: 결정적 client ID (None이면 임의 생성)
+            extra: 추가 기록 항목 (sheet, tier, balance 등)
+
+        Returns:
+            dict: 기록된 주문
+        """
+        order = {
+            'client_id': client_id or f"L-{uuid.uuid4().hex[:12]}",
+            'acc_cnt': str(acc_cnt),
+            'ticker': ticker,
+            'side': side,
+            'price': float(price),
+            'qty': int(qty),
+            'time': time.time(),
+            'state': state
+        }
+        order.update(extra)
+        with self._lock:
+            previous = self.by_id.get(order['client_id'])
+            if previous is not None:
+                # 같은 ID 재전송 (이전 시도가 종료된 경우) → 이전 기록 대체
+                self.orders.get(self._key(previous), []).remove(previous)
+            self.orders.setdefault(self._key(order), []).append(order)
+            self.by_id[order['client_id']] = order
+            self._append(dict(order, op='order'))
+        log(f"📒 원장 기록: {ticker}(계좌 {acc_cnt}) {side} {order['price']} x {order['qty']}주 ({state}, ID {order['client_id']})", "📒")
+        return order
+
+    def mark_state(self, order, state, **extra):
+        """주문 상태 변경"""
+        with self._lock:
+            prev_state = order['state']
+            order['state'] = state
+            order['updated'] = time.time()
+            order.update(extra)
+            self._append(dict(extra, op='update', client_id=order['client_id'], state=state, updated=order['updated']))
+        if prev_state != state:
+            for callback in self.listeners:
+                try:
+                    callback(order, prev_state, state)
+                except Exception as e:
+                    log(f"원장 상태 콜백 오류: {e}", "⚠️")
+        return order
+
+    def find(self, client_id):
+        """client ID로 주문 조회"""
+        with self._lock:
+            return self.by_id.get(client_id)
+
+    def find_working(self, acc_cnt, ticker, side, price):
+        """가격(및 방향)이 일치하는 미체결 주문 조회"""
+        with self._lock:
+            return next((o for o in self.working_orders(acc_cnt, ticker) if matches(o, side, price)), None)
+
+    def working_orders(self, acc_cnt, ticker, side=None):
+        """미체결 가능성이 있는 주문 목록"""
+        with self._lock:
+            return [
+                o for o in self.orders.get(ledger_key(acc_cnt, ticker), [])
+                if o['state'] in OPEN_STATES and (side is None or o['side'] == side)
+            ]
+
+    def close_working(self, acc_cnt, ticker, state=CLOSED, side=None):
+        """계좌/종목의 미체결 주문을 일괄 종료 처리"""
+        with self._lock:
+            closed = self.working_orders(acc_cnt, ticker, side)
+            for order in closed:
+                self.mark_state(order, state)
+        return closed
+
+    def close_matching(self, acc_cnt, ticker, side, price, state, **extra):
+        """가격(및 방향)이 일치하는 미체결 주문 1건 종료 처리"""
+        with self._lock:
+            order = self.find_working(acc_cnt, ticker, side, price)
+            if order is not None:
+                return self.mark_state(order, state, **extra)
+        return None
+
+    def duplicate_reason(self, client_id, hts_orders=None):
+        """
+        주문 버튼 클릭 전 중복 여부 확인
+
+        Args:
+            client_id: 보낼 주문의 client ID
+            hts_orders: 이번 사이클에 조회한 HTS 미체결 목록 (None이면 원장만 확인)
+
+        Returns:
+            str: 중복 사유 (중복이 아니면 None)
+        """
+        with self._lock:
+            entry = self.by_id.get(client_id)
+            if entry is None:
+                return None
+            if entry['state'] == FILLED:
+                return "같은 구간에 이미 체결됨"
+            if entry['state'] in OPEN_STATES:
+                if hts_orders is None:
+                    return "원장상 접수 확인 대기 중"
+                if any(matches(h, entry['side'], entry['price']) for h in hts_orders):
+                    return "이미 미체결로 접수됨"
+        return None
+
+    # ------------------------------------------------------------------
+    # HTS 조회 결과 반영
+    # ------------------------------------------------------------------
+
+    def needs_unfilled_check(self, acc_cnt, ticker, hts_stock_q):
+        """
+        HTS 미체결 조회가 필요한지 판단
+
+        Returns:
+            tuple: (bool: 조회 필요 여부, str: 사유)
+        """
+        key = ledger_key(acc_cnt, ticker)
+        with self._lock:
+            if key not in self.last_verified:
+                return True, "원장 정보 없음"
+            if self.working_orders(acc_cnt, ticker):
+                return True, "미체결 가능 주문 존재"
+            if self.balances.get(key) != hts_stock_q:
+                return True, f"잔고 변화({self.balances.get(key)}→{hts_stock_q})"
+            if time.time() - self.last_verified[key] > self.recheck_sec:
+                return True, f"주기 확인({self.recheck_sec}초 경과)"
+        return False, "원장상 미체결 없음"
+
+    def _closed_state(self, order, hts_stock_q):
+        """미체결 목록에서 사라진 주문의 종료 상태 추정 (주문 당시 잔고 대비 변화로 체결 판단)"""
+        balance = order.get('balance')
+        if balance is None or hts_stock_q is None:
+            return CLOSED
+        if hts_stock_q == balance + signed_qty(order, order['qty']):
+            return FILLED
+        return CLOSED
+
+    def _make_fill(self, order, qty, complete):
+        """체결 이벤트 생성"""
+        return {
+            'client_id': order['client_id'],
+            'acc_cnt': order.get('acc_cnt'),
+            'ticker': order['ticker'],
+            'sheet': order.get('sheet'),
+            'side': order['side'],
+            'price': order['price'],
+            'qty': int(qty),
+            'complete': complete,
+            'time': time.time()
+        }
+
+    def sync_unfilled(self, acc_cnt, ticker, hts_orders, hts_stock_q):
+        """
+        HTS 미체결 목록을 원장에 반영하고 개별 체결을 계산
+        - 목록에 있는 PENDING 주문 → WORKING
+        - 미체결 잔량 감소 → 부분 체결
+        - 목록에서 사라진 주문 → 잔고 변화로 설명되면 FILLED, 아니면 CLOSED
+        - 원장에 없는 HTS 주문 (수동 주문, 원장 파일 이전 주문) → WORKING 으로 편입
+
+        Args:
+            acc_cnt: 계좌 순번 (미체결 목록/잔고를 조회한 계좌)
+            ticker: 종목 코드
+            hts_orders: HTS 미체결 주문 레코드 목록
+            hts_stock_q: 현재 HTS 잔고
+
+        Returns:
+            list: 체결 이벤트 목록 (fill_listeners 에도 전달)
+        """
+        key = ledger_key(acc_cnt, ticker)
+        fills = []
+        with self._lock:
+            prev_balance = self.balances.get(key)
+            unmatched = list(hts_orders)
+            vanished = []
+            for order in self.working_orders(acc_cnt, ticker):
+                hit = next((h for h in unmatched if matches(order, h.get('side'), h['price'])), None)
+                if hit is None:
+                    vanished.append(order)
+                    continue
+                unmatched.remove(hit)
+
+                prev_remaining = order.get('remaining', order['qty'])
+                remaining = hit.get('remaining', prev_remaining)
+                if prev_remaining - remaining > 0 and order['state'] == WORKING:
+                    fills.append(self._make_fill(order, prev_remaining - remaining, complete=False))
+
+                if (order['state'] != WORKING or order.get('order_no') != hit.get('order_no', '')
+                        or prev_remaining != remaining):
+                    self.mark_state(order, WORKING, order_no=hit.get('order_no', ''), remaining=remaining)
+
+            # 부분 체결로 설명되고 남은 잔고 변화를 사라진 주문에 배분
+            residual = None
+            if prev_balance is not None and hts_stock_q is not None:
+                residual = hts_stock_q - prev_balance - sum(signed_qty(f, f['qty']) for f in fills)
+
+            closed = 0
+            for order in vanished:
+                qty = order.get('remaining', order['qty'])
+                change = signed_qty(order, qty)
+                if residual is None:
+                    state = self._closed_state(order, hts_stock_q)
+                elif change != 0 and (change > 0) == (residual > 0) and abs(change) <= abs(residual):
+                    state = FILLED
+                    residual -= change
+                else:
+                    state = CLOSED
+
+                self.mark_state(order, state, remaining=0)
+                if state == FILLED:
+                    fills.append(self._make_fill(order, qty, complete=True))
+                else:
+                    closed += 1
+
+            for hit in unmatched:
+                self.record_order(
+                    acc_cnt, ticker, hit.get('side'), hit['price'], hit.get('qty') or hit.get('remaining', 0),
+                    WORKING, client_id=f"HTS-{hit.get('order_no') or uuid.uuid4().hex[:12]}",
+                    remaining=hit.get('remaining', 0), order_no=hit.get('order_no', ''), source='HTS'
+                )
+
+            if fills or closed or unmatched:
+                log(f"📒 원장 동기화: {ticker}(계좌 {acc_cnt}) 체결 {len(fills)}건 / 종료 {closed}건 / HTS 주문 편입 {len(unmatched)}건", "📒")
+            self.balances[key] = hts_stock_q
+            self.last_verified[key] = time.time()
+
+        for fill in fills:
+            for callback in self.fill_listeners:
+                try:
+                    callback(fill)
+                except Exception as e:
+                    log(f"체결 콜백 오류: {e}", "⚠️")
+        return fills
+
+    def balance(self, acc_cnt, ticker):
+        """마지막으로 확인한 HTS 잔고 (확인 기록이 없으면 None)"""
+        with self._lock:
+            return self.balances.get(ledger_key(acc_cnt, ticker))
+
+    def note_balance(self, acc_cnt, ticker, hts_stock_q):
+        """주문 후 예상 잔고 기록 (다음 사이클의 잔고 변화 판단 기준)"""
+        with self._lock:
+            self.balances[ledger_key(acc_cnt, ticker)] = hts_stock_q
+
+    def invalidate(self, acc_cnt=None, ticker=None):
+        """
+        HTS 확인 기록 초기화 (HTS 재접속 등으로 로컬 판단을 신뢰할 수 없을 때)
+        주문 기록은 유지 → 다음 사이클에 반드시 HTS 미체결 조회
+        """
+        with self._lock:
+            if ticker is None:
+                self.balances.clear()
+                self.last_verified.clear()
+            else:
+                self.balances.pop(ledger_key(acc_cnt, ticker), None)
+                self.last_verified.pop(ledger_key(acc_cnt, ticker), None)
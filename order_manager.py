@@ -4,11 +4,7 @@
 """
 
 import time
-from datetime import datetime
 import re
-import pyautogui
-import pyperclip
-from pywinauto import mouse
 
 import config
 from config import (
@@ -18,12 +14,88 @@ from config import (
     COORDS_SELL_QUANTITY, COORDS_SELL_PRICE, COORDS_SELL_BUTTON, COORDS_SELL_CONFIRM,
     COORDS_UNFILLED_TAB, COORDS_UNFILLED_COUNTRY, COORDS_UNFILLED_USA,
     COORDS_UNFILLED_TICKER, COORDS_UNFILLED_SELECT, COORDS_UNFILLED_INPUT,
-    COORDS_UNFILLED_SEARCH, COORDS_UNFILLED_COUNT,
+    COORDS_UNFILLED_SEARCH,
     WAIT_TIME
 )
-from utils import log
+from utils import log, get_market_session
+from sheet_layout import cell
+from order_ledger import (
+    OrderLedger, PENDING, WORKING, CANCELLED, CLOSED, REJECTED,
+    same_price, matches, make_client_id
+)
+import order_ledger
+import order_events
+from order_events import OrderEventStore
+from tracer import traced
+from lazy_import import lazy_module
+
+# GUI 모듈은 첫 주문 시 로드
+pyautogui = lazy_module("pyautogui")
+pyperclip = lazy_module("pyperclip")
+mouse = lazy_module("pywinauto.mouse")
+
+try:
+    from config import COORDS_UNFILLED_ROW_FIRST, UNFILLED_ROW_HEIGHT
+except ImportError:
+    COORDS_UNFILLED_ROW_FIRST = (460, 442)  # 미체결 그리드 첫 행
+    UNFILLED_ROW_HEIGHT = 18                # 미체결 그리드 행 높이 (px)
+
+try:
+    from config import (
+        AMEND_ENABLED, AMEND_QTY_ALLOWED, COORDS_AMEND_BUTTON,
+        COORDS_AMEND_QUANTITY, COORDS_AMEND_PRICE, COORDS_AMEND_CONFIRM
+    )
+except ImportError:
+    AMEND_ENABLED = True                # 가격 변경 시 정정 주문 사용 (False면 취소 후 재주문)
+    AMEND_QTY_ALLOWED = False           # 정정 시 수량 변경 가능 여부 (불가하면 잔량이 같을 때만 정정)
+    COORDS_AMEND_BUTTON = (520, 500)    # 미체결 행 더블클릭 후 정정 버튼
+    COORDS_AMEND_QUANTITY = (560, 440)  # 정정 수량 입력란
+    COORDS_AMEND_PRICE = (560, 465)     # 정정 가격 입력란
+    COORDS_AMEND_CONFIRM = (640, 400)   # 정정 확인 팝업
+
+try:
+    from config import PRICE_GAP_LIMIT
+except ImportError:
+    PRICE_GAP_LIMIT = 10  # 주문가와 현재가 차이 허용 한도 (%) - 넘으면 비정상 가격으로 보고 주문 거부
+
+
+# 주문 탭별 좌표 (매수/매도 공통 처리용)
+TICKET_COORDS = {
+    "BUY": {
+        'tab': COORDS_BUY_TAB, 'type': COORDS_BUY_TYPE, 'order_type': COORDS_BUY_ORDER_TYPE,
+        'limit': COORDS_BUY_LIMIT, 'quantity': COORDS_BUY_QUANTITY, 'price': COORDS_BUY_PRICE,
+        'button': COORDS_BUY_BUTTON, 'confirm': COORDS_BUY_CONFIRM
+    },
+    "SELL": {
+        'tab': COORDS_SELL_TAB, 'type': COORDS_SELL_TYPE, 'order_type': COORDS_SELL_ORDER_TYPE,
+        'limit': COORDS_SELL_LIMIT, 'quantity': COORDS_SELL_QUANTITY, 'price': COORDS_SELL_PRICE,
+        'button': COORDS_SELL_BUTTON, 'confirm': COORDS_SELL_CONFIRM
+    }
+}
+
+
+def price_side_ok(trade_type, curr_price, avg_price):
+    """
+    평단가 조건 (매수: 현재가 < 평단가 / 매도: 현재가 > 평단가)
+    스칼라와 numpy 배열 모두 지원 (backtest 에서 구간 전체를 한 번에 판정)
+    """
+    if trade_type == "BUY":
+        return curr_price < avg_price
+    return curr_price > avg_price
+
 
+def price_gap_ok(trade_type, order_p, curr_price):
+    """
+    가격 차이 조건 (주문가가 현재가보다 불리한 방향으로 PRICE_GAP_LIMIT% 넘게 벗어나면 거부)
+    스칼라와 numpy 배열 모두 지원
+    """
+    within = abs(order_p - curr_price) / curr_price * 100 <= PRICE_GAP_LIMIT
+    if trade_type == "BUY":
+        return within | (order_p <= curr_price)
+    return within | (order_p >= curr_price)
 
+
+@traced("gui.click_point")
 def click_point(coords, wait=None):
     """좌표 클릭 헬퍼 함수"""
     wait = wait or WAIT_TIME["MEDIUM"]
@@ -36,7 +108,6 @@ class OrderManager:
 
     def _clean_val(self, val, is_price=True):
         """주문 가격/수량 정제용 함수"""
-        import re
         try:
             clean_s = re.sub(r'[^0-9.]', '', str(val))
             if not clean_s:
@@ -52,28 +123,148 @@ class OrderManager:
     def __init__(self, hts_controller, telegram_manager=None):
         self.hts = hts_controller
         self.telegram_manager = telegram_manager
+        self.ledger = OrderLedger()  # 🔥 로컬 주문 원장
+        self.active_ticket = None    # 마지막으로 열어 둔 주문 탭 ("BUY" / "SELL")
+        self.events = OrderEventStore()  # 🔥 주문 라이프사이클 이벤트 저장소
+        self.ledger.listeners.append(self._on_order_state)
+
+    def _emit(self, event, ticker, item, fill_price=float('nan')):
+        """주문 라이프사이클 이벤트 기록 (item: intent 또는 원장 주문)"""
+        self.events.emit(
+            event, item.get('client_id'), ticker, item.get('side'),
+            session=item.get('session', ''), price=item.get('price', 0.0),
+            ref_price=item.get('ref_price', float('nan')), fill_price=fill_price,
+            qty=item.get('qty', 0)
+        )
+
+    # 원장 상태 변경 → 라이프사이클 이벤트
+    _STATE_EVENTS = {
+        order_ledger.FILLED: order_events.FILLED,
+        order_ledger.CANCELLED: order_events.CANCELLED,
+        order_ledger.REJECTED: order_events.REJECTED,
+    }
 
-    def cancel_unfilled_order(self, ticker, unfilled_price):
-        """미체결 주문 취소"""
+    def _on_order_state(self, order, prev_state, state):
+        """원장 상태 변경 콜백"""
+        if order.get('source') == 'HTS':
+            return  # 우리가 결정하지 않은 주문은 지연 분석 대상 아님
+        if prev_state == PENDING and state == WORKING:
+            self._emit(order_events.CONFIRMED, order['ticker'], order)
+        elif state == order_ledger.FILLED:
+            # 체결가 조회 화면이 없으므로 지정가를 체결가로 간주
+            self._emit(order_events.FILLED, order['ticker'], order, fill_price=order['price'])
+        elif state in self._STATE_EVENTS:
+            self._emit(self._STATE_EVENTS[state], order['ticker'], order)
+
+    @traced("order.cancel_unfilled_order")
+    def cancel_unfilled_order(self, acc_cnt, ticker, unfilled_price, row=0, side=None):
+        """
+        미체결 주문 취소
+
+        Args:
+            acc_cnt: 계좌 순번 (원장 갱신용)
+            ticker: 종목 코드
+            unfilled_price: 취소할 주문 가격
+            row: 미체결 그리드 내 행 순번 (0부터)
+            side: "BUY" / "SELL" (원장 갱신용, None이면 가격으로만 매칭)
+        """
         try:
-            log(f"🗑️ 미체결 주문 취소 시작: {ticker} @ {unfilled_price}", "🔄")
-            click_point(COORDS_UNFILLED_TAB)
-            time.sleep(WAIT_TIME["MEDIUM"])
-            unfilled_row_coord = (460, 442)
-            mouse.double_click(coords=unfilled_row_coord)
-            time.sleep(WAIT_TIME["MEDIUM"])
+            log(f"🗑️ 미체결 주문 취소 시작: {ticker} @ {unfilled_price} (행 {row})", "🔄")
+            self._click_unfilled_row(row)
             cancel_button_coord = (600, 500)
             mouse.click(coords=cancel_button_coord)
             time.sleep(WAIT_TIME["MEDIUM"])
             confirm_coord = (640, 400)
             mouse.click(coords=confirm_coord)
             time.sleep(WAIT_TIME["LONG"])
+            self.ledger.close_matching(acc_cnt, ticker, side, unfilled_price, CANCELLED)
             log(f"✅ 미체결 주문 취소 완료: {ticker}", "✅")
             return True
         except Exception as e:
             log(f"❌ 미체결 취소 실패: {e}", "❌")
             return False
 
+    def _click_unfilled_row(self, row):
+        """미체결 탭에서 행 더블클릭 (정정/취소 창 열기)"""
+        click_point(COORDS_UNFILLED_TAB)
+        time.sleep(WAIT_TIME["MEDIUM"])
+        unfilled_row_coord = (COORDS_UNFILLED_ROW_FIRST[0],
+                              COORDS_UNFILLED_ROW_FIRST[1] + int(row) * UNFILLED_ROW_HEIGHT)
+        mouse.double_click(coords=unfilled_row_coord)
+        time.sleep(WAIT_TIME["MEDIUM"])
+
+    def can_amend(self, order, intent):
+        """
+        정정 주문 가능 여부
+
+        Args:
+            order: 미체결 주문 레코드
+            intent: 새로 낼 주문 (side, price, qty)
+
+        Returns:
+            tuple: (bool: 정정 가능 여부, str: 불가 사유)
+        """
+        if not AMEND_ENABLED:
+            return False, "정정 사용 안 함"
+        if order.get('side') != intent['side']:
+            return False, "매매 방향 불일치"
+        if not AMEND_QTY_ALLOWED and int(order.get('remaining', 0)) != int(intent['qty']):
+            return False, f"수량 변경 불가 (잔량 {order.get('remaining')}주 → {intent['qty']}주)"
+        return True, ""
+
+    @traced("order.amend_unfilled_order")
+    def amend_unfilled_order(self, acc_cnt, ticker, order, intent, hts_stock_q=None):
+        """
+        미체결 주문 정정 (가격/수량 변경을 한 번의 화면 조작으로 처리)
+
+        Args:
+            acc_cnt: 계좌 순번 (원장 기록용)
+            ticker: 종목 코드
+            order: 정정할 미체결 주문 레코드 (row, side, price, remaining)
+            intent: 새 주문 {'side', 'price', 'qty', 'client_id', ...}
+            hts_stock_q: 현재 HTS 잔고 (원장 기록용)
+
+        Returns:
+            bool: 정정 주문 전송 여부
+        """
+        side = intent['side']
+        try:
+            log(f"✏️ 미체결 주문 정정 시작: {ticker} {order['price']} → {intent['price']} "
+                f"x {intent['qty']}주 (행 {order['row']})", "🔄")
+            self._click_unfilled_row(order['row'])
+            click_point(COORDS_AMEND_BUTTON)
+
+            click_point(COORDS_AMEND_QUANTITY)
+            self.hts.main_dlg.type_keys('^a{BACKSPACE}')
+            self.hts.main_dlg.type_keys(self._clean_val(intent['qty'], is_price=False), with_spaces=True)
+            click_point(COORDS_AMEND_PRICE)
+            self.hts.main_dlg.type_keys('^a{BACKSPACE}')
+            self.hts.main_dlg.type_keys(self._clean_val(intent['price'], is_price=True), with_spaces=True)
+            self._emit(order_events.TICKET_FILLED, ticker, intent)
+
+            old = self.ledger.find_working(acc_cnt, ticker, side, order['price'])
+            intent['order'] = self.ledger.record_order(
+                acc_cnt, ticker, side, intent['price'], intent['qty'], PENDING, client_id=intent.get('client_id'),
+                balance=hts_stock_q, sheet=intent.get('sheet'), tier=intent.get('tier'),
+                ref_price=intent.get('ref_price'), session=intent.get('session'),
+                amended_from=old['client_id'] if old else order.get('order_no', '')
+            )
+            click_point(COORDS_AMEND_CONFIRM)
+            time.sleep(WAIT_TIME["LONG"])
+            self._emit(order_events.SUBMITTED, ticker, intent)
+
+            # 정정 후 원주문은 더 이상 체결되지 않음 → 새 주문으로 대체
+            self.ledger.close_matching(acc_cnt, ticker, side, order['price'], CANCELLED,
+                                       replaced_by=intent['order']['client_id'])
+            self.active_ticket = None
+            log(f"✅ 미체결 주문 정정 완료: {ticker} {intent['price']}", "✅")
+            return True
+        except Exception as e:
+            log(f"❌ 미체결 정정 실패: {e}", "❌")
+            self.active_ticket = None
+            return False
+
+    @traced("order.check_unfilled_orders")
     def check_unfilled_orders(self, ticker):
         """미체결 주문 확인"""
         try:
@@ -88,30 +279,103 @@ class OrderManager:
             self.hts.main_dlg.type_keys(ticker + "{ENTER}", with_spaces=True)
             click_point(COORDS_UNFILLED_SEARCH)
             time.sleep(1.0)
-            mouse.double_click(coords=COORDS_UNFILLED_COUNT)
-            pyautogui.hotkey('ctrl', 'c')
-            time.sleep(WAIT_TIME["MEDIUM"])
-            unfilled_count_raw = pyperclip.paste().strip()
-            is_unfilled_exists = False
-            unfilled_num = 0
-            if unfilled_count_raw.isdigit():
-                unfilled_num = int(unfilled_count_raw)
-                if unfilled_num > 0:
-                    is_unfilled_exists = True
+            orders = self.hts.read_unfilled_grid()
+            if orders is None:
+                return {'exists': False, 'count': 0, 'orders': [], 'error': True}
+            unfilled_num = sum(o['remaining'] for o in orders)
             result = {
-                'exists': is_unfilled_exists,
+                'exists': bool(orders),
                 'count': unfilled_num,
-                'data': unfilled_count_raw
+                'orders': orders,
+                'error': False
             }
-            if is_unfilled_exists:
-                log(f"미체결 존재: {unfilled_num}주", "⏳")
+            if orders:
+                for o in orders:
+                    log(f"미체결 존재: {o['side'] or '?'} {o['price']} x {o['remaining']}주 (주문번호: {o['order_no']})", "⏳")
             else:
                 log("미체결 없음", "✅")
             return result
         except Exception as e:
             log(f"미체결 확인 오류: {e}", "❌")
-            return {'exists': False, 'count': 0, 'data': ''}
+            return {'exists': False, 'count': 0, 'orders': [], 'error': True}
+
+    def reconcile_unfilled(self, working, buy_p, sell_p):
+        """
+        미체결 목록과 이번 사이클의 목표 매수/매도가 비교
+
+        Args:
+            working: 미체결 주문 레코드 목록
+            buy_p: 목표 매수가
+            sell_p: 목표 매도가
+
+        Returns:
+            tuple: (유지할 매수 주문, 유지할 매도 주문, 취소할 주문 목록)
+        """
+        keep = {"BUY": None, "SELL": None}
+        targets = {"BUY": float(buy_p), "SELL": float(sell_p)}
+        stale = []
+
+        for order in working:
+            matched = False
+            for side in ("BUY", "SELL"):
+                if order.get('side') not in (None, side) or keep[side] is not None:
+                    continue
+                if targets[side] > 0 and same_price(order['price'], targets[side]):
+                    keep[side] = order
+                    matched = True
+                    break
+            if not matched:
+                stale.append(order)
 
+        return keep["BUY"], keep["SELL"], stale
+
+    def resolve_stale_orders(self, acc_cnt, ticker, stale, intents, hts_stock_q=None, hts_orders=None):
+        """
+        목표가와 다른 미체결 주문 처리
+        - 같은 방향의 새 주문이 승인되었고 정정 가능하면 정정 (주문 공백 없이 1회 조작)
+        - 그 외에는 취소 → 새 주문은 같은 사이클에 submit_orders 로 제출
+        - 아래 행부터 처리해야 위쪽 행 순번이 유지됨
+
+        Args:
+            acc_cnt: 계좌 순번
+            ticker: 종목 코드
+            stale: 목표가와 다른 미체결 주문 레코드 목록
+            intents: 이번 사이클에 승인된 주문 목록 (정정된 주문은 'amended', 'result' 추가)
+            hts_stock_q: 현재 HTS 잔고
+            hts_orders: 이번 사이클에 조회한 HTS 미체결 목록 (중복 확인용)
+
+        Returns:
+            list: 새로 제출할 주문 목록 (취소 실패 시 None)
+        """
+        plans = []
+        paired = set()
+        for order in stale:
+            intent = None
+            for i, candidate in enumerate(intents):
+                if i in paired or candidate['side'] != order.get('side'):
+                    continue
+                ok, reason = self.can_amend(order, candidate)
+                if ok and candidate.get('client_id') and self.ledger.duplicate_reason(candidate['client_id'], hts_orders):
+                    ok, reason = False, "중복 주문"
+                if ok:
+                    intent = candidate
+                    paired.add(i)
+                else:
+                    log(f"↩️ 정정 불가 ({reason}) → 취소 후 재주문", "⚠️")
+                break
+            plans.append((order, intent))
+
+        for order, intent in sorted(plans, key=lambda p: p[0]['row'], reverse=True):
+            if intent is not None and self.amend_unfilled_order(acc_cnt, ticker, order, intent, hts_stock_q):
+                intent['amended'] = True
+                intent['result'] = True
+                continue
+            if not self.cancel_unfilled_order(acc_cnt, ticker, order['price'], order['row'], order['side']):
+                return None
+
+        return [intent for intent in intents if not intent.get('amended')]
+
+    @traced("order.final_trade_check")
     def final_trade_check(self, trade_type, ticker, curr_price, avg_price,
                           buy_p, buy_q, sell_p, sell_q, 
                           sheet_buy_stop, sheet_sell_stop,
@@ -167,20 +431,20 @@ class OrderManager:
             
             # 조건 3: 평단가 체크
             log(f"\n  [조건 3] 평단가 비교", "")
-            if curr_price >= avg_price:
+            if not price_side_ok("BUY", curr_price, avg_price):
                 log(f"  └─ ❌ 거부: 현재가(${curr_price}) >= 평단가(${avg_price})", "🛑")
                 return False, f"⏸️ 현재가({curr_price})>=평단가"
             log(f"  └─ ✅ 통과: ${curr_price} < ${avg_price}", "")
             
             # 조건 4: 가격 차이 체크 (10% 이내)
-            log(f"\n  [조건 4] 가격 차이 검증 (기준: 10%)", "")
+            log(f"\n  [조건 4] 가격 차이 검증 (기준: {PRICE_GAP_LIMIT}%)", "")
             price_diff = abs(float(buy_p) - float(curr_price)) / float(curr_price) * 100
             log(f"  ├─ 매수가: ${buy_p}", "")
             log(f"  ├─ 현재가: ${curr_price}", "")
             log(f"  └─ 차이: {price_diff:.2f}%", "")
             
-            if price_diff > 10 and float(buy_p) > float(curr_price):
-                log(f"  └─ ❌ 거부: 가격 차이({price_diff:.2f}%) > 10% (비정상)", "🛑")
+            if not price_gap_ok("BUY", float(buy_p), float(curr_price)):
+                log(f"  └─ ❌ 거부: 가격 차이({price_diff:.2f}%) > {PRICE_GAP_LIMIT}% (비정상)", "🛑")
                 return False, f"🛑 가격차이과다({price_diff:.1f}%)"
             log(f"  └─ ✅ 통과: 정상 범위", "")
             
@@ -216,20 +480,20 @@ class OrderManager:
             
             # 조건 2: 평단가 체크
             log(f"\n  [조건 2] 평단가 비교", "")
-            if curr_price <= avg_price:
+            if not price_side_ok("SELL", curr_price, avg_price):
                 log(f"  └─ ❌ 거부: 현재가(${curr_price}) <= 평단가(${avg_price})", "🛑")
                 return False, f"⏸️ 현재가({curr_price})<=평단가"
             log(f"  └─ ✅ 통과: ${curr_price} > ${avg_price}", "")
             
             # 조건 3: 가격 차이 체크 (10% 이내)
-            log(f"\n  [조건 3] 가격 차이 검증 (기준: 10%)", "")
+            log(f"\n  [조건 3] 가격 차이 검증 (기준: {PRICE_GAP_LIMIT}%)", "")
             price_diff = abs(float(sell_p) - float(curr_price)) / float(curr_price) * 100
             log(f"  ├─ 매도가: ${sell_p}", "")
             log(f"  ├─ 현재가: ${curr_price}", "")
             log(f"  └─ 차이: {price_diff:.2f}%", "")
             
-            if price_diff > 10 and float(sell_p) < float(curr_price):
-                log(f"  └─ ❌ 거부: 가격 차이({price_diff:.2f}%) > 10% (비정상)", "🛑")
+            if not price_gap_ok("SELL", float(sell_p), float(curr_price)):
+                log(f"  └─ ❌ 거부: 가격 차이({price_diff:.2f}%) > {PRICE_GAP_LIMIT}% (비정상)", "🛑")
                 return False, f"🛑 가격차이과다({price_diff:.1f}%)"
             log(f"  └─ ✅ 통과: 정상 범위", "")
             
@@ -251,85 +515,167 @@ class OrderManager:
         log(f"❌ 알 수 없는 거래 유형: {trade_type}", "⚠️")
         return False, "❌ 알수없는거래유형"
 
-    def place_buy_order(self, ticker, buy_price, buy_quantity, market_session="REGULAR"):
-        """매수 주문 실행"""
-        try:
-            log(f"🛒 매수 주문 실행: {ticker} {buy_price}달러 {buy_quantity}주", "🔥")
-            click_point(COORDS_BUY_TAB)
-            click_point(COORDS_BUY_TYPE)
-            click_point(COORDS_BUY_ORDER_TYPE)
-            now = datetime.now()
-            market_open = now.replace(hour=9, minute=0, second=0, microsecond=0)
-            market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
-            if market_open <= now <= market_close:
-                log("장중 지정가 선택", "▶")
-                click_point(COORDS_BUY_LIMIT)
-            else:
-                log("시간외 지정가 선택", "⚠️")
-                click_point(COORDS_BUY_LIMIT)
-            q_val = self._clean_val(buy_quantity, is_price=False)
-            click_point(COORDS_BUY_QUANTITY)
-            self.hts.main_dlg.type_keys('^a{BACKSPACE}')
-            self.hts.main_dlg.type_keys(str(buy_quantity), with_spaces=True)
-            p_val = self._clean_val(buy_price, is_price=True)
-            click_point(COORDS_BUY_PRICE)
-            self.hts.main_dlg.type_keys('^a{BACKSPACE}')
-            self.hts.main_dlg.type_keys(str(buy_price), with_spaces=True)
-            click_point(COORDS_BUY_BUTTON)
-            time.sleep(0.5)
+    def _open_ticket(self, side):
+        """주문 탭 진입 및 주문유형/지정가 선택 (같은 방향 주문끼리는 1회만 수행)"""
+        coords = TICKET_COORDS[side]
+        click_point(coords['tab'])
+        click_point(coords['type'])
+        click_point(coords['order_type'])
+        if get_market_session() == "REGULAR":
+            log("장중 지정가 선택", "▶")
+        else:
+            log("시간외 지정가 선택", "⚠️")
+        click_point(coords['limit'])
+        self.active_ticket = side
+
+    def _fill_ticket(self, side, price, quantity):
+        """열린 주문 탭에 수량/가격 입력"""
+        coords = TICKET_COORDS[side]
+        click_point(coords['quantity'])
+        self.hts.main_dlg.type_keys('^a{BACKSPACE}')
+        self.hts.main_dlg.type_keys(self._clean_val(quantity, is_price=False), with_spaces=True)
+        click_point(coords['price'])
+        self.hts.main_dlg.type_keys('^a{BACKSPACE}')
+        self.hts.main_dlg.type_keys(self._clean_val(price, is_price=True), with_spaces=True)
+
+    def _press_order_button(self, side):
+        """주문 버튼 클릭 및 확인 팝업 처리"""
+        coords = TICKET_COORDS[side]
+        click_point(coords['button'])
+        time.sleep(0.5)
+        if side == "BUY":
             time.sleep(0.8)
             click_point((640, 405))
             log(f"예수금 부족 확인 좌표(640, 405) 클릭 시도", "🖱️")
             time.sleep(0.5)
-            unfilled_check = self.check_unfilled_orders(ticker)
-            if not unfilled_check.get('exists', False):
+
+    @traced("order.submit_orders")
+    def submit_orders(self, acc_cnt, ticker, intents, hts_stock_q=None, verify=True, hts_orders=None):
+        """
+        여러 주문을 한 번의 화면 방문으로 일괄 제출
+
+        - 현재 열려 있는 주문 탭과 같은 방향부터 처리하여 탭 전환 최소화
+        - 같은 방향 주문은 탭/주문유형/지정가 클릭을 1회만 수행
+        - 주문 버튼 클릭 전 client ID로 중복 여부 확인 후 PENDING 선기록
+        - 모든 주문 제출 후 미체결 목록 1회 조회로 일괄 확인
+
+        Args:
+            acc_cnt: 계좌 순번 (원장 기록/동기화용)
+            ticker: 종목 코드
+            intents: [{'side': "BUY"/"SELL", 'price': 가격, 'qty': 수량,
+                       'client_id': (선택), 'sheet': (선택), 'tier': (선택)}, ...]
+            hts_stock_q: 현재 HTS 잔고 (주문 당시 잔고로 기록, 확인 결과 원장 동기화)
+            verify: False면 미체결 확인 생략
+            hts_orders: 이번 사이클에 조회한 HTS 미체결 목록 (중복 확인용)
+
+        Returns:
+            list: 입력 순서 그대로, 각 intent에 'result' 추가
+                  (True: 접수 / "LACK_OF_MONEY": 예수금 부족 / "DUPLICATE": 중복 차단 / False: 실패)
+        """
+        if not intents:
+            return []
+
+        first_side = self.active_ticket if any(i['side'] == self.active_ticket for i in intents) else intents[0]['side']
+        ordered = sorted(intents, key=lambda i: i['side'] != first_side)
+
+        submitted = []
+        current_side = None
+        for intent in ordered:
+            side = intent['side']
+            label = "매수" if side == "BUY" else "매도"
+
+            client_id = intent.get('client_id')
+            duplicate = self.ledger.duplicate_reason(client_id, hts_orders) if client_id else None
+            if duplicate:
+                log(f"🛡️ {label} 중복 주문 차단: {ticker} {intent['price']} (ID {client_id}, {duplicate})", "🛑")
+                intent['result'] = "DUPLICATE"
+                continue
+
+            try:
+                log(f"🛒 {label} 주문 실행: {ticker} {intent['price']}달러 {intent['qty']}주", "🔥")
+                if side != current_side:
+                    self._open_ticket(side)
+                    current_side = side
+                self._fill_ticket(side, intent['price'], intent['qty'])
+                self._emit(order_events.TICKET_FILLED, ticker, intent)
+                intent['order'] = self.ledger.record_order(
+                    acc_cnt, ticker, side, intent['price'], intent['qty'], PENDING, client_id=client_id,
+                    balance=hts_stock_q, sheet=intent.get('sheet'), tier=intent.get('tier'),
+                    ref_price=intent.get('ref_price'), session=intent.get('session')
+                )
+                self._press_order_button(side)
+                self._emit(order_events.SUBMITTED, ticker, intent)
+                submitted.append(intent)
+            except Exception as e:
+                # PENDING 기록은 남겨 둠 → 다음 사이클 미체결 조회로 접수 여부 확인
+                log(f"❌ {label} 주문 실행 중 오류: {e}", "❌")
+                intent['result'] = False
+                current_side = None  # 화면 상태 불확실 → 다음 주문은 탭부터 다시
+                self.active_ticket = None
+
+        if not submitted:
+            return intents
+
+        if not verify:
+            for intent in submitted:
+                self.ledger.mark_state(intent['order'], WORKING)
+                intent['result'] = True
+            return intents
+
+        # 일괄 확인 (미체결 목록 1회 조회)
+        check = self.check_unfilled_orders(ticker)
+        resting = list(check.get('orders', []))
+        for intent in submitted:
+            order = intent['order']
+            hit = next((o for o in resting if matches(o, intent['side'], intent['price'])), None)
+            if check.get('error'):
+                # 조회 실패 → PENDING 유지, 다음 사이클에 재확인
+                intent['result'] = True
+            elif hit is not None:
+                resting.remove(hit)
+                self.ledger.mark_state(order, WORKING, order_no=hit.get('order_no', ''))
+                intent['result'] = True
+            elif intent['side'] == "BUY":
+                self.ledger.mark_state(order, REJECTED)
                 log(f"⚠️ {ticker}: 미체결 데이터 없음 - 예수금 부족 판단", "❌")
-                return "LACK_OF_MONEY"
+                intent['result'] = "LACK_OF_MONEY"
+            else:
+                # 매도는 즉시 체결되었을 수 있음
+                self.ledger.mark_state(order, CLOSED)
+                intent['result'] = True
+
+        if not check.get('error') and hts_stock_q is not None:
+            self.ledger.sync_unfilled(acc_cnt, ticker, check['orders'], hts_stock_q)
+
+        return intents
+
+    @traced("order.place_buy_order")
+    def place_buy_order(self, acc_cnt, ticker, buy_price, buy_quantity, market_session="REGULAR"):
+        """매수 주문 실행"""
+        res = self.submit_orders(acc_cnt, ticker, [{'side': "BUY", 'price': buy_price, 'qty': buy_quantity}])[0]['result']
+        if res is True:
             log(f"✅ 매수 주문 완료: {ticker} {buy_price}달러", "✅")
-            return True
-        except Exception as e:
-            log(f"❌ 매수 주문 실행 중 오류: {e}", "❌")
-            return False
+        return res
 
-    def place_sell_order(self, ticker, sell_price, sell_quantity, market_session="REGULAR"):
+    @traced("order.place_sell_order")
+    def place_sell_order(self, acc_cnt, ticker, sell_price, sell_quantity, market_session="REGULAR"):
         """매도 주문 실행"""
-        try:
-            log(f"✨ 매도 주문 실행: {ticker} {sell_price}달러 {sell_quantity}주", "🔥")
-            click_point(COORDS_SELL_TAB)
-            click_point(COORDS_SELL_TYPE)
-            click_point(COORDS_SELL_ORDER_TYPE)
-            now = datetime.now()
-            market_open = now.replace(hour=23, minute=0, second=0, microsecond=0)
-            market_close = now.replace(hour=4, minute=30, second=0, microsecond=0)
-            if market_open <= now <= market_close:
-                log("장중 지정가 선택", "▶")
-                click_point(COORDS_SELL_LIMIT)
-            else:
-                log("시간외 지정가 선택", "⚠️")
-                click_point(COORDS_SELL_LIMIT)
-            q_val = self._clean_val(sell_quantity, is_price=False)
-            click_point(COORDS_SELL_QUANTITY)
-            self.hts.main_dlg.type_keys('^a{BACKSPACE}')
-            self.hts.main_dlg.type_keys(str(sell_quantity), with_spaces=True)
-            p_val = self._clean_val(sell_price, is_price=True)
-            click_point(COORDS_SELL_PRICE)
-            self.hts.main_dlg.type_keys('^a{BACKSPACE}')
-            self.hts.main_dlg.type_keys(str(sell_price), with_spaces=True)
-            click_point(COORDS_SELL_BUTTON)
-            time.sleep(0.5)
+        res = self.submit_orders(
+            acc_cnt, ticker, [{'side': "SELL", 'price': sell_price, 'qty': sell_quantity}], verify=False
+        )[0]['result']
+        if res is True:
             log(f"✅ 매도 주문 완료: {ticker} {sell_price}달러 / {sell_quantity}주", "✅")
-            return True
-        except Exception as e:
-            log(f"❌ 매도 주문 오류: {e}", "❌")
-            return False
+        return res
 
-    def execute_trade_logic(self, sheet_data, ticker, hts_stock_q, sheet_stock_q,
+    @traced("order.execute_trade_logic")
+    def execute_trade_logic(self, sheet_data, ticker, acc_cnt, hts_stock_q, sheet_stock_q,
                             buy_p, buy_q, sell_p, sell_q, buy_chk, sell_chk,
                             ws, last_tier, curr_tier, sheet_buy_stop, sheet_sell_stop,
-                            curr_price, buy_count, sell_count, avg_price):
+                            curr_price, buy_count, sell_count, avg_price, sheet_name=None):
         """
         매매 로직 실행 (최종 통합 체크 적용)
         """
+        sheet_name = sheet_name or getattr(ws, 'title', ticker)
         result = {
             'buy_status': 'STAY',
             'sell_status': 'STAY',
@@ -338,54 +684,51 @@ class OrderManager:
         }
 
         try:
-            # 1. 미체결 확인
-            import pyperclip
-            pyperclip.copy("")
-            time.sleep(0.3)
-            unfilled = self.check_unfilled_orders(ticker)
-            unfilled_data = str(unfilled['data']).replace(",", "").strip()
-
-            # 미체결이 있으면 가격 비교
-            if unfilled['exists']:
-                try:
-                    unfilled_price = float(unfilled_data)
-                    is_same_buy = abs(unfilled_price - float(buy_p)) < 0.01
-                    is_same_sell = abs(unfilled_price - float(sell_p)) < 0.01
-                    
-                    if is_same_buy or is_same_sell:
-                        log(f"⏳ 미체결 대기 중: {unfilled_price} (현재 매수: {buy_p}, 매도: {sell_p})", "⏳")
-                        if is_same_buy:
-                            result['buy_status'] = f"⏳ 매수대기({unfilled_data})"
-                        elif is_same_sell:
-                            result['sell_status'] = f"⏳ 매도대기({unfilled_data})"
-                        return result
-                    else:
-                        log(f"🔄 미체결 가격 불일치 감지!", "⚠️")
-                        log(f"   미체결 가격: {unfilled_price}", "⚠️")
-                        log(f"   현재 매수가: {buy_p} / 매도가: {sell_p}", "⚠️")
-                        log(f"   → 미체결 주문 취소 후 재주문 진행", "🔄")
-                        
-                        if self.cancel_unfilled_order(ticker, unfilled_price):
-                            log(f"✅ 미체결 취소 완료. 재주문 진행", "✅")
-                        else:
-                            log(f"❌ 미체결 취소 실패. 이번 사이클 Skip", "❌")
-                            result['buy_status'] = "미체결취소실패"
-                            result['sell_status'] = "미체결취소실패"
-                            return result
-                        
-                except Exception as e:
-                    log(f"⚠️ 미체결 가격 비교 중 오류: {e}", "⚠️")
+            # 1. 미체결 확인 (로컬 원장상 필요할 때만 HTS 조회)
+            need_check, check_reason = self.ledger.needs_unfilled_check(acc_cnt, ticker, hts_stock_q)
+            if need_check:
+                log(f"📒 HTS 미체결 조회 진행: {check_reason}", "🔍")
+                unfilled = self.check_unfilled_orders(ticker)
+                if unfilled.get('error'):
+                    log(f"❌ 미체결 조회 실패. 이번 사이클 Skip", "❌")
+                    result['buy_status'] = "미체결조회실패"
+                    result['sell_status'] = "미체결조회실패"
                     return result
+                self.ledger.sync_unfilled(acc_cnt, ticker, unfilled['orders'], hts_stock_q)
+                working = unfilled['orders']
+                hts_orders = working
+            else:
+                log(f"📒 {check_reason} - HTS 미체결 조회 생략", "⚡")
+                working = []
+                hts_orders = None
+
+            # 2. 미체결 목록과 목표 주문 비교 → 다른 것은 매매 판단 후 정정 또는 취소
+            keep_buy, keep_sell, stale = self.reconcile_unfilled(working, buy_p, sell_p)
+            for order in stale:
+                log(f"🔄 미체결 가격 불일치: {order['side'] or '?'} {order['price']} "
+                    f"(현재 매수: {buy_p} / 매도: {sell_p})", "⚠️")
 
-            # 2. 미체결 없음 - 매매 판단 시작
-            log("✅ 미체결 없음 - 매매 판단 시작", "🚀")
+            if keep_buy:
+                log(f"⏳ 매수 미체결 대기 중: {keep_buy['price']} x {keep_buy['remaining']}주", "⏳")
+                result['buy_status'] = f"⏳ 매수대기({keep_buy['price']})"
+            if keep_sell:
+                log(f"⏳ 매도 미체결 대기 중: {keep_sell['price']} x {keep_sell['remaining']}주", "⏳")
+                result['sell_status'] = f"⏳ 매도대기({keep_sell['price']})"
+
+            # 3. 매매 판단 시작 (대기 중인 방향은 제외)
+            log("✅ 미체결 정리 완료 - 매매 판단 시작", "🚀")
             log(f"🎯 평단가: ${avg_price:.2f} / 현재가: ${curr_price}", "🔍")
             
-            # 🔥 매수 최종 체크 및 실행
+            intents = []
+            session = get_market_session()
+
+            # 🔥 매수 최종 체크
             trade_can_buy = False
             buy_check_reason = ""
             
-            if not buy_chk:
+            if keep_buy:
+                pass
+            elif not buy_chk:
                 # 최종 통합 체크
                 trade_can_buy, buy_check_reason = self.final_trade_check(
                     "BUY", ticker, curr_price, avg_price,
@@ -395,23 +738,14 @@ class OrderManager:
                 )
                 
                 if trade_can_buy:
-                    # 모든 조건 통과 → 주문 실행
+                    # 모든 조건 통과 → 주문 대기열에 추가
                     log(f"🎯 매수 주문 실행 결정: {buy_check_reason}", "🔥")
-                    order_res = self.place_buy_order(ticker, buy_p, buy_q)
-                    
-                    if order_res == "LACK_OF_MONEY":
-                        result['buy_status'] = "LACK_OF_MONEY_POPUP"
-                        # 예수금 부족 시 E18 자동 활성화
-                        try:
-                            ws.update_acell('E18', True)
-                            log(f"🔒 {ticker}: 예수금 부족 → E18 자동 활성화", "🔒")
-                        except Exception as e:
-                            log(f"⚠️ E18 업데이트 실패: {e}", "⚠️")
-                    elif order_res:
-                        result['buy_status'] = f"✅ 매수완료({buy_p})"
-                        result['buy_executed'] = True
-                    else:
-                        result['buy_status'] = "❌ 매수실패"
+                    intents.append({
+                        'side': "BUY", 'price': buy_p, 'qty': buy_q, 'sheet': sheet_name, 'tier': curr_tier,
+                        'client_id': make_client_id(sheet_name, curr_tier, "BUY", buy_p),
+                        'ref_price': curr_price, 'session': session
+                    })
+                    self._emit(order_events.DECIDED, ticker, intents[-1])
                 else:
                     # 조건 미충족 → 주문 불가
                     log(f"🛑 매수 불가: {buy_check_reason}", "🛑")
@@ -420,18 +754,20 @@ class OrderManager:
                     # 가격 차이 과다 시 E18 자동 활성화
                     if "가격차이과다" in buy_check_reason:
                         try:
-                            ws.update_acell('E18', True)
-                            log(f"🔒 {ticker}: 가격 차이 과다 → E18 자동 활성화", "🔒")
+                            ws.update_acell(cell('buy_stop'), True)
+                            log(f"🔒 {ticker}: 가격 차이 과다 → {cell('buy_stop')} 자동 활성화", "🔒")
                         except Exception as e:
-                            log(f"⚠️ E18 업데이트 실패: {e}", "⚠️")
+                            log(f"⚠️ {cell('buy_stop')} 업데이트 실패: {e}", "⚠️")
             else:
                 result['buy_status'] = "🔴 매수금지(시트)"
 
-            # 🔥 매도 최종 체크 및 실행
+            # 🔥 매도 최종 체크
             trade_can_sell = False
             sell_check_reason = ""
             
-            if not sell_chk:
+            if keep_sell:
+                pass
+            elif not sell_chk:
                 # 최종 통합 체크
                 trade_can_sell, sell_check_reason = self.final_trade_check(
                     "SELL", ticker, curr_price, avg_price,
@@ -441,15 +777,14 @@ class OrderManager:
                 )
                 
                 if trade_can_sell:
-                    # 모든 조건 통과 → 주문 실행
+                    # 모든 조건 통과 → 주문 대기열에 추가
                     log(f"🎯 매도 주문 실행 결정: {sell_check_reason}", "🔥")
-                    order_res = self.place_sell_order(ticker, sell_p, sell_q)
-                    
-                    if order_res:
-                        result['sell_status'] = f"✅ 매도완료({sell_p})"
-                        result['sell_executed'] = True
-                    else:
-                        result['sell_status'] = "❌ 매도실패"
+                    intents.append({
+                        'side': "SELL", 'price': sell_p, 'qty': sell_q, 'sheet': sheet_name, 'tier': curr_tier,
+                        'client_id': make_client_id(sheet_name, curr_tier, "SELL", sell_p),
+                        'ref_price': curr_price, 'session': session
+                    })
+                    self._emit(order_events.DECIDED, ticker, intents[-1])
                 else:
                     # 조건 미충족 → 주문 불가
                     log(f"🛑 매도 불가: {sell_check_reason}", "🛑")
@@ -458,13 +793,57 @@ class OrderManager:
                     # 가격 차이 과다 시 E20 자동 활성화
                     if "가격차이과다" in sell_check_reason:
                         try:
-                            ws.update_acell('E20', True)
-                            log(f"🔒 {ticker}: 가격 차이 과다 → E20 자동 활성화", "🔒")
+                            ws.update_acell(cell('sell_stop'), True)
+                            log(f"🔒 {ticker}: 가격 차이 과다 → {cell('sell_stop')} 자동 활성화", "🔒")
                         except Exception as e:
-                            log(f"⚠️ E20 업데이트 실패: {e}", "⚠️")
+                            log(f"⚠️ {cell('sell_stop')} 업데이트 실패: {e}", "⚠️")
             else:
                 result['sell_status'] = "🔵 매도금지(시트)"
 
+            # 4. 가격이 바뀐 미체결 주문 정정 (정정 불가 시 취소 후 같은 사이클에 재주문)
+            to_submit = self.resolve_stale_orders(acc_cnt, ticker, stale, intents, hts_stock_q, hts_orders)
+            if to_submit is None:
+                log(f"❌ 미체결 취소 실패. 이번 사이클 Skip", "❌")
+                result['buy_status'] = "미체결취소실패"
+                result['sell_status'] = "미체결취소실패"
+                return result
+
+            # 5. 승인된 주문 일괄 제출 (주문 화면 1회 방문 + 미체결 1회 확인)
+            self.submit_orders(acc_cnt, ticker, to_submit, hts_stock_q, hts_orders=hts_orders)
+            for intent in intents:
+                order_res = intent.get('result', False)
+
+                if intent.get('amended'):
+                    label = "매수" if intent['side'] == "BUY" else "매도"
+                    result['buy_status' if intent['side'] == "BUY" else 'sell_status'] = f"✏️ {label}정정({intent['price']})"
+                    result['buy_executed' if intent['side'] == "BUY" else 'sell_executed'] = True
+                elif intent['side'] == "BUY":
+                    if order_res == "LACK_OF_MONEY":
+                        result['buy_status'] = "LACK_OF_MONEY_POPUP"
+                        # 예수금 부족 시 E18 자동 활성화
+                        try:
+                            ws.update_acell(cell('buy_stop'), True)
+                            log(f"🔒 {ticker}: 예수금 부족 → {cell('buy_stop')} 자동 활성화", "🔒")
+                        except Exception as e:
+                            log(f"⚠️ {cell('buy_stop')} 업데이트 실패: {e}", "⚠️")
+                    elif order_res == "DUPLICATE":
+                        result['buy_status'] = f"🛡️ 매수중복차단({buy_p})"
+                    elif order_res:
+                        log(f"✅ 매수 주문 완료: {ticker} {buy_p}달러", "✅")
+                        result['buy_status'] = f"✅ 매수완료({buy_p})"
+                        result['buy_executed'] = True
+                    else:
+                        result['buy_status'] = "❌ 매수실패"
+                else:
+                    if order_res == "DUPLICATE":
+                        result['sell_status'] = f"🛡️ 매도중복차단({sell_p})"
+                    elif order_res:
+                        log(f"✅ 매도 주문 완료: {ticker} {sell_p}달러 / {sell_q}주", "✅")
+                        result['sell_status'] = f"✅ 매도완료({sell_p})"
+                        result['sell_executed'] = True
+                    else:
+                        result['sell_status'] = "❌ 매도실패"
+
             return result
 
         except Exception as e:
@@ -0,0 +1,144 @@
+"""
+주문 지연/슬리피지 리포트
+order_events 저장소를 읽어 단계별 지연 시간 백분위와
+종목/세션/시간대별 슬리피지를 출력
+
+사용법:
+    python order_report.py              # 전체 기간
+    python order_report.py --days 5     # 최근 5일
+"""
+
+import argparse
+from datetime import datetime
+
+from order_events import (
+    OrderEventStore, ORDER_EVENTS_DIR, is_nan,
+    DECIDED, TICKET_FILLED, SUBMITTED, CONFIRMED, FILLED, CANCELLED
+)
+
+# (이름, 시작 이벤트, 종료 이벤트)
+LATENCY_STAGES = [
+    ("결정→입력", DECIDED, TICKET_FILLED),
+    ("입력→전송", TICKET_FILLED, SUBMITTED),
+    ("전송→접수확인", SUBMITTED, CONFIRMED),
+    ("결정→접수확인", DECIDED, CONFIRMED),
+    ("결정→체결", DECIDED, FILLED),
+    ("결정→취소", DECIDED, CANCELLED),
+]
+
+
+def percentile(sorted_values, q):
+    """정렬된 값의 백분위 (선형 보간)"""
+    if not sorted_values:
+        return float('nan')
+    pos = (len(sorted_values) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def group_by_order(columns):
+    """client_id별 {이벤트: 첫 발생 행} 구성"""
+    orders = {}
+    for i, client_id in enumerate(columns['client_id']):
+        if not client_id:
+            continue
+        events = orders.setdefault(client_id, {})
+        events.setdefault(columns['event'][i], i)
+    return orders
+
+
+def latency_stats(columns, orders):
+    """단계별 지연 시간 (초) 목록"""
+    mono = columns['mono_ts']
+    stats = {}
+    for name, start, end in LATENCY_STAGES:
+        values = []
+        for events in orders.values():
+            if start in events and end in events:
+                dt = mono[events[end]] - mono[events[start]]
+                if dt >= 0:  # 재시작으로 단조 시계가 바뀐 경우 제외
+                    values.append(dt)
+        stats[name] = sorted(values)
+    return stats
+
+
+def slippage_rows(columns):
+    """
+    체결 이벤트별 슬리피지 (불리한 방향이 양수)
+
+    Returns:
+        list: [(ticker, session, hour, 슬리피지($), 슬리피지(bp))]
+    """
+    rows = []
+    for i, event in enumerate(columns['event']):
+        if event != FILLED:
+            continue
+        ref = columns['ref_price'][i]
+        fill = columns['fill_price'][i]
+        if is_nan(fill):
+            fill = columns['price'][i]
+        if is_nan(ref) or ref <= 0 or is_nan(fill):
+            continue
+        diff = fill - ref if columns['side'][i] == "BUY" else ref - fill
+        hour = datetime.fromtimestamp(columns['wall_ts'][i]).hour
+        rows.append((columns['ticker'][i], columns['session'][i], hour, diff, diff / ref * 10000))
+    return rows
+
+
+def print_latency(stats):
+    print(f"\n⏱️ 단계별 지연 시간 (초)")
+    print(f"{'단계':<14}{'건수':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'최대':>10}")
+    for name, values in stats.items():
+        if not values:
+            continue
+        print(f"{name:<14}{len(values):>6}{percentile(values, 0.5):>10.2f}{percentile(values, 0.9):>10.2f}"
+              f"{percentile(values, 0.99):>10.2f}{values[-1]:>10.2f}")
+
+
+def print_slippage(rows, key_index, title):
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[key_index], []).append(row)
+
+    print(f"\n💸 슬리피지 - {title} (불리한 방향 +)")
+    print(f"{title:<12}{'건수':>6}{'평균($)':>10}{'평균(bp)':>10}{'p90(bp)':>10}")
+    for key in sorted(groups, key=str):
+        items = groups[key]
+        bps = sorted(r[4] for r in items)
+        avg_usd = sum(r[3] for r in items) / len(items)
+        avg_bp = sum(bps) / len(bps)
+        print(f"{str(key):<12}{len(items):>6}{avg_usd:>10.3f}{avg_bp:>10.1f}{percentile(bps, 0.9):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주문 지연/슬리피지 리포트")
+    parser.add_argument('--dir', default=ORDER_EVENTS_DIR, help="이벤트 저장 폴더")
+    parser.add_argument('--days', type=int, default=0, help="최근 N일만 (0이면 전체)")
+    args = parser.parse_args()
+
+    store = OrderEventStore(args.dir)
+    days = store.days()
+    if args.days > 0:
+        days = days[-args.days:]
+    if not days:
+        print("❌ 저장된 주문 이벤트가 없습니다.")
+        return
+
+    columns = store.load(days)
+    orders = group_by_order(columns)
+    print(f"📊 기간: {days[0]} ~ {days[-1]} / 이벤트 {len(columns['event'])}건 / 주문 {len(orders)}건")
+
+    print_latency(latency_stats(columns, orders))
+
+    rows = slippage_rows(columns)
+    if not rows:
+        print("\n💸 체결 이벤트가 없어 슬리피지를 계산할 수 없습니다.")
+        return
+    print_slippage(rows, 0, "종목")
+    print_slippage(rows, 1, "세션")
+    print_slippage(rows, 2, "시간대")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+현재가 샘플 저장소 (로컬 시계열)
+HTS 에서 현재가를 읽을 때마다 (시각, 가격, 잔고) 를 종목/일자별 컬럼 파일에 추가
+시트 K8 은 매 사이클 덮어쓰므로, 지표 계산/분석은 이 저장소의 이력을 사용 (네트워크 불필요)
+
+저장 형식 (data/price_samples/YYYY-MM-DD/<종목>/):
+- ts.f64: 시각 (float64, 종목/일자 안에서 오름차순)
+- price.f64: 현재가 (float64)
+- balance.i64: 잔고 (int64, 모르면 -1)
+- data/price_samples/YYYY-MM-DD/index.json: {종목: {'rows', 'first', 'last'}} (일자별 요약)
+조회는 파일을 메모리 맵으로 열어 복사 없이 반환 (numpy 가 있으면 ndarray 뷰, 없으면 memoryview)
+"""
+
+import os
+import json
+import mmap
+import time
+import bisect
+import threading
+from array import array
+from datetime import datetime, date, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # 없으면 memoryview 로 반환
+
+from utils import log
+
+try:
+    from config import PRICE_SAMPLES_ENABLED, PRICE_SAMPLES_DIR
+except ImportError:
+    PRICE_SAMPLES_ENABLED = True              # 현재가 샘플 기록 여부
+    PRICE_SAMPLES_DIR = "data/price_samples"  # 저장 위치
+
+# 컬럼: (파일 이름, array/memoryview 타입 코드)
+COLUMNS = {'ts': ('ts.f64', 'd'), 'price': ('price.f64', 'd'), 'balance': ('balance.i64', 'q')}
+ITEM_SIZE = 8
+BALANCE_UNKNOWN = -1
+INDEX_FLUSH_SEC = 60  # 일자별 index.json 저장 간격 (초)
+
+
+def _day_of(ts):
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
+
+
+def _ticker_key(ticker):
+    """종목 코드 → 저장 키 (대문자, 파일 이름으로 쓸 수 있는 문자만)"""
+    return "".join(c for c in str(ticker).upper() if c.isalnum() or c in "._-") or "_"
+
+
+def _search(ts, value):
+    """오름차순 시각 컬럼에서 value 이상인 첫 위치"""
+    if np is not None:
+        return int(np.searchsorted(ts, value, side='left'))
+    return bisect.bisect_left(ts, value)
+
+
+class SampleRange:
+    """
+    한 종목/일자의 구간 조회 결과 (메모리 맵 뷰, 복사 없음)
+    ts / price / balance: numpy ndarray 뷰 또는 memoryview (같은 길이)
+    """
+
+    __slots__ = ('day', 'ts', 'price', 'balance')
+
+    def __init__(self, day, ts, price, balance):
+        self.day = day
+        self.ts = ts
+        self.price = price
+        self.balance = balance
+
+    def __len__(self):
+        return len(self.ts)
+
+
+class PriceSampleStore:
+    """종목/일자별 추가 전용 컬럼 저장소"""
+
+    def __init__(self, base_dir=PRICE_SAMPLES_DIR, enabled=PRICE_SAMPLES_ENABLED):
+        self.base_dir = base_dir
+        self.enabled = enabled
+        self.balances = {}   # {ticker: 마지막으로 읽은 잔고} (현재가 샘플에 함께 기록)
+        self._index = {}     # {day: {ticker: {'rows', 'first', 'last'}}}
+        self._dirty = set()  # index.json 을 다시 써야 하는 일자
+        self._flushed_at = time.time()
+        self._lock = threading.Lock()
+        self.listeners = []  # 기록 콜백 [fn(ticker, ts, price, balance)] (지표 엔진 등)
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+
+    def set_balance(self, ticker, balance):
+        """잔고 조회 결과 반영 (다음 현재가 샘플부터 함께 기록)"""
+        try:
+            self.balances[_ticker_key(ticker)] = int(balance)
+        except (TypeError, ValueError):
+            pass
+
+    def record(self, ticker, price, ts=None, balance=None):
+        """
+        현재가 샘플 1건 추가 (조회 실패 가격은 기록하지 않음)
+
+        Args:
+            ticker: 종목 코드
+            price: 현재가 (get_current_price 의 문자열도 가능)
+            ts: 시각 (None이면 현재)
+            balance: 잔고 (None이면 마지막으로 읽은 잔고)
+        """
+        if not self.enabled or not ticker:
+            return False
+        try:
+            price = float(price)
+        except (TypeError, ValueError):
+            return False
+        if price <= 0:
+            return False
+
+        ticker = _ticker_key(ticker)
+        ts = time.time() if ts is None else float(ts)
+        if balance is None:
+            balance = self.balances.get(ticker, BALANCE_UNKNOWN)
+        day = _day_of(ts)
+        try:
+            with self._lock:
+                entry = self._entry(day, ticker)
+                ts = max(ts, entry['last'] or ts)  # 시계가 뒤로 가도 구간 검색이 가능하도록 오름차순 유지
+                path = self._ticker_dir(day, ticker, create=True)
+                for col, value in (('ts', ts), ('price', price), ('balance', int(balance))):
+                    filename, code = COLUMNS[col]
+                    with open(os.path.join(path, filename), 'ab') as f:
+                        f.write(array(code, [value]).tobytes())
+                entry['rows'] += 1
+                entry['first'] = entry['first'] or ts
+                entry['last'] = ts
+                self._dirty.add(day)
+                if time.time() - self._flushed_at >= INDEX_FLUSH_SEC:
+                    self._flush_index()
+        except Exception as e:
+            log(f"현재가 샘플 기록 실패: {e}", "⚠️")
+            return False
+
+        for listener in list(self.listeners):
+            try:
+                listener(ticker, ts, price, int(balance))
+            except Exception as e:
+                log(f"현재가 샘플 콜백 오류: {e}", "⚠️")
+        return True
+
+    def flush(self):
+        """변경된 일자 index.json 저장"""
+        with self._lock:
+            self._flush_index()
+
+    # ------------------------------------------------------------------
+    # 인덱스
+    # ------------------------------------------------------------------
+
+    def _day_dir(self, day):
+        return os.path.join(self.base_dir, day)
+
+    def _ticker_dir(self, day, ticker, create=False):
+        path = os.path.join(self._day_dir(day), ticker)
+        if create and not os.path.exists(path):
+            os.makedirs(path)
+        return path
+
+    def _entry(self, day, ticker):
+        """일자/종목 요약 (없으면 파일에서 다시 계산)"""
+        index = self._index.get(day)
+        if index is None:
+            index = self._index[day] = self._load_index(day)
+        entry = index.get(ticker)
+        if entry is None:
+            entry = index[ticker] = {'rows': 0, 'first': None, 'last': None}
+        return entry
+
+    def _load_index(self, day):
+        """
+        index.json 로드 후 실제 파일 길이와 맞춤
+        (기록 중 중단되었거나 index.json 저장 전에 종료된 경우 파일 기준으로 다시 계산)
+        """
+        index = {}
+        path = os.path.join(self._day_dir(day), "index.json")
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except Exception:
+                index = {}
+        day_dir = self._day_dir(day)
+        tickers = os.listdir(day_dir) if os.path.isdir(day_dir) else []
+        for name in tickers:
+            if not os.path.isdir(os.path.join(day_dir, name)):
+                continue
+            rows = self._rows(day, name)
+            self._truncate(day, name, rows)
+            entry = index.get(name)
+            if entry is None or entry.get('rows') != rows:
+                ts = self._map(day, name, 'ts', rows)
+                index[name] = {'rows': rows, 'first': float(ts[0]) if rows else None,
+                               'last': float(ts[rows - 1]) if rows else None}
+                self._dirty.add(day)
+        return index
+
+    def _truncate(self, day, ticker, rows):
+        """기록 중 중단된 마지막 행 제거 (컬럼 길이를 맞춰야 이후 추가한 행이 어긋나지 않음)"""
+        path = self._ticker_dir(day, ticker)
+        for filename, _ in COLUMNS.values():
+            file_path = os.path.join(path, filename)
+            if os.path.exists(file_path) and os.path.getsize(file_path) != rows * ITEM_SIZE:
+                try:
+                    with open(file_path, 'r+b') as f:
+                        f.truncate(rows * ITEM_SIZE)
+                except OSError as e:
+                    log(f"현재가 샘플 파일 정리 실패 ({file_path}): {e}", "⚠️")
+
+    def _flush_index(self):
+        for day in list(self._dirty):
+            path = os.path.join(self._day_dir(day), "index.json")
+            tmp_path = path + ".tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._index.get(day, {}), f)
+                os.replace(tmp_path, path)
+                self._dirty.discard(day)
+            except Exception as e:
+                log(f"현재가 샘플 인덱스 저장 실패: {e}", "⚠️")
+        self._flushed_at = time.time()
+
+    def _rows(self, day, ticker):
+        """완전히 기록된 행 수 (컬럼 파일 중 가장 짧은 길이)"""
+        path = self._ticker_dir(day, ticker)
+        sizes = []
+        for filename, _ in COLUMNS.values():
+            file_path = os.path.join(path, filename)
+            sizes.append(os.path.getsize(file_path) // ITEM_SIZE if os.path.exists(file_path) else 0)
+        return min(sizes)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _map(self, day, ticker, col, rows):
+        """컬럼 파일 앞부분 rows 행을 메모리 맵으로 열어 뷰 반환 (복사 없음)"""
+        filename, code = COLUMNS[col]
+        if rows <= 0:
+            return np.empty(0, dtype=code) if np is not None else memoryview(array(code))
+        with open(os.path.join(self._ticker_dir(day, ticker), filename), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), rows * ITEM_SIZE, access=mmap.ACCESS_READ)
+        if np is not None:
+            return np.frombuffer(mapped, dtype=code, count=rows)
+        return memoryview(mapped).cast(code)
+
+    def days(self, ticker=None):
+        """저장된 일자 목록 (오름차순, ticker 를 주면 해당 종목이 있는 일자만)"""
+        if not os.path.exists(self.base_dir):
+            return []
+        days = sorted(d for d in os.listdir(self.base_dir) if os.path.isdir(self._day_dir(d)))
+        if ticker is None:
+            return days
+        key = _ticker_key(ticker)
+        return [d for d in days if os.path.isdir(os.path.join(self._day_dir(d), key))]
+
+    def range(self, ticker, start=None, end=None):
+        """
+        구간 조회 (일자별 메모리 맵 뷰 목록, 복사 없음)
+
+        Args:
+            ticker: 종목 코드
+            start: 시작 시각 timestamp (포함, None이면 처음부터)
+            end: 종료 시각 timestamp (미포함, None이면 끝까지)
+
+        Returns:
+            list: SampleRange 목록 (일자 순)
+        """
+        ticker = _ticker_key(ticker)
+        first_day = _day_of(start) if start is not None else None
+        last_day = _day_of(end) if end is not None else None
+        result = []
+        for day in self.days(ticker):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            with self._lock:
+                rows = self._rows(day, ticker)
+                entry = self._entry(day, ticker)
+            if rows == 0 or (start is not None and entry['last'] is not None and entry['last'] < start):
+                continue
+            ts = self._map(day, ticker, 'ts', rows)
+            lo = _search(ts, start) if start is not None else 0
+            hi = _search(ts, end) if end is not None else rows
+            if lo >= hi:
+                continue
+            result.append(SampleRange(day, ts[lo:hi], self._map(day, ticker, 'price', rows)[lo:hi],
+                                      self._map(day, ticker, 'balance', rows)[lo:hi]))
+        return result
+
+    def prices(self, ticker, start=None, end=None):
+        """
+        구간 현재가 (일자를 이어 붙인 값, 여러 일자면 복사 발생)
+
+        Returns:
+            numpy 가 있으면 ndarray, 없으면 list
+        """
+        chunks = [r.price for r in self.range(ticker, start, end)]
+        if np is not None:
+            if len(chunks) == 1:
+                return chunks[0]
+            return np.concatenate(chunks) if chunks else np.empty(0)
+        return [p for chunk in chunks for p in chunk.tolist()]
+
+    def recent_prices(self, ticker, days=1):
+        """최근 days 일(오늘 포함) 현재가 - calculate_rsi 등 지표 계산용"""
+        start_day = date.today() - timedelta(days=days - 1)
+        start = datetime.combine(start_day, datetime.min.time()).timestamp()
+        return self.prices(ticker, start)
+
+    def summary(self, day=None):
+        """
+        일자별 종목 요약
+
+        Returns:
+            dict: {종목: {'rows', 'first', 'last'}}
+        """
+        day = day or _day_of(time.time())
+        with self._lock:
+            if day not in self._index:
+                self._index[day] = self._load_index(day)
+            return {name: dict(entry) for name, entry in self._index[day].items()}
@@ -0,0 +1,141 @@
+"""
+실행 상태 체크포인트 (재시작 시 HTS 재로그인 생략)
+메모리에만 있던 실행 상태를 주기적으로 파일에 원자적으로 저장 (tmp + fsync + rename)
+- HTS 로그인 상태, 로그인한 계정, 저장 당시 HTS 프로세스 (pid, 생성 시각)
+- 시트별 마지막 실행 시각 (재시작 후에도 작업 간격 유지)
+재시작 시 체크포인트의 HTS 프로세스가 그대로 살아 있으면 웜 스타트
+(프로세스 종료/로그인 없이 메인 창에 다시 연결, 약 80초 절약)
+"""
+
+import os
+import json
+import time
+import threading
+
+from utils import log
+from lazy_import import lazy_module
+
+psutil = lazy_module("psutil")
+
+try:
+    from config import RUNTIME_STATE_PATH, CHECKPOINT_SEC, WARM_START_MAX_AGE
+except ImportError:
+    RUNTIME_STATE_PATH = "data/runtime_state.json"  # 체크포인트 파일
+    CHECKPOINT_SEC = 30                             # 주기적 저장 간격 (초)
+    WARM_START_MAX_AGE = 600                        # 이보다 오래된 체크포인트는 웜 스타트에 사용하지 않음 (초)
+
+STATE_VERSION = 1
+
+
+def hts_processes(names):
+    """
+    실행 중인 HTS 프로세스
+
+    Args:
+        names: HTS 프로세스 이름 목록
+
+    Returns:
+        dict: {pid 문자열: 프로세스 생성 시각} (pid 재사용 구분용)
+    """
+    procs = {}
+    for proc in psutil.process_iter(['name', 'pid', 'create_time']):
+        try:
+            if proc.info['name'] in names:
+                procs[str(proc.info['pid'])] = round(proc.info['create_time'] or 0, 3)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return procs
+
+
+class RuntimeCheckpoint:
+    """실행 상태 저장/복원"""
+
+    def __init__(self, path=RUNTIME_STATE_PATH, max_age=WARM_START_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._last_saved = None  # 마지막으로 저장한 내용 (변화 없으면 쓰지 않음)
+        self._saved_at = 0       # 마지막 저장 시각 (변화가 없어도 max_age 의 절반마다 다시 저장)
+        self._lock = threading.Lock()
+
+    def save(self, state, process_names=None):
+        """
+        상태 저장 (tmp 파일에 쓰고 fsync 후 rename → 중간에 죽어도 이전 체크포인트 유지)
+
+        Args:
+            state: JSON 으로 저장 가능한 dict (saved_at 제외)
+            process_names: HTS 프로세스 이름 목록 (주면 현재 HTS 프로세스를 함께 저장)
+
+        Returns:
+            bool: 파일에 썼으면 True (내용이 같아 생략했거나 실패하면 False)
+        """
+        state = dict(state, hts_processes=hts_processes(process_names) if process_names else {})
+        body = json.dumps(state, ensure_ascii=False, sort_keys=True)
+        with self._lock:
+            now = time.time()
+            if body == self._last_saved and now - self._saved_at < self.max_age / 2:
+                return False
+            return self._write(body, dict(state, version=STATE_VERSION, saved_at=now))
+
+    def _write(self, body, record):
+        tmp_path = self.path + ".tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._last_saved = body
+            self._saved_at = record['saved_at']
+            return True
+        except Exception as e:
+            log(f"실행 상태 저장 실패: {e}", "⚠️")
+            return False
+
+    def load(self):
+        """
+        마지막 체크포인트
+
+        Returns:
+            dict: 저장된 상태 (없거나 손상/버전 불일치면 None)
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except Exception as e:
+            log(f"실행 상태 파일 로드 실패: {e}", "⚠️")
+            return None
+        if state.get('version') != STATE_VERSION:
+            return None
+        return state
+
+    def can_warm_start(self, state, process_names):
+        """
+        체크포인트로 웜 스타트 가능한지 확인
+
+        Args:
+            state: load() 결과
+            process_names: HTS 프로세스 이름 목록
+
+        Returns:
+            tuple: (가능 여부, 사유)
+        """
+        if state.get('hts_status') != "EXECUTED":
+            return False, "체크포인트 당시 HTS 미로그인"
+        age = time.time() - state.get('saved_at', 0)
+        if age > self.max_age:
+            return False, f"체크포인트가 오래됨 ({age:.0f}초 전)"
+
+        saved = state.get('hts_processes') or {}
+        running = hts_processes(process_names)
+        if not saved or not running:
+            return False, "실행 중인 HTS 없음"
+        # 마지막 저장 당시 HTS 프로세스가 하나라도 종료/교체되었으면 로그인 상태를 믿을 수 없음
+        changed = [pid for pid, created in saved.items() if running.get(pid) != created]
+        if changed:
+            return False, f"HTS 프로세스 변경됨 (pid {', '.join(changed)})"
+        return True, f"{age:.0f}초 전 체크포인트, HTS 프로세스 {len(saved)}개 일치"
@@ -0,0 +1,199 @@
+"""
+그리드 매매 작업 스케줄러
+작업별 다음 실행 시각을 최소 힙으로 관리하여 가장 빠른 실행 시각까지만 대기
+- 자정을 넘는 작업 시간대 (예: 22:00 ~ 06:00)
+- READY: 작업 시간대 안에서 간격마다 실행 / RUNNING: 시간대 무시, 즉시 반복 / PAUSED: 제외
+- 키움 주문 제한 시간(17:00 ~ 18:00)에 걸린 실행은 제한 종료 시각으로 미룸
+"""
+
+import time
+import heapq
+from datetime import datetime, timedelta
+
+from utils import log
+from market_calendar import market_calendar
+
+try:
+    from config import RUNNING_RECHECK_SEC
+except ImportError:
+    RUNNING_RECHECK_SEC = 5     # RUNNING 작업 반복 간격 (초)
+
+
+def minute_of(dt):
+    """datetime → 자정 기준 분"""
+    return dt.hour * 60 + dt.minute
+
+
+def in_window(now_min, start_min, end_min):
+    """자정 기준 분 단위 작업 시간대 포함 여부 (자정을 넘는 구간 포함)"""
+    if start_min <= end_min:
+        return start_min <= now_min <= end_min
+    return now_min >= start_min or now_min <= end_min
+
+
+def next_window_start(dt, start_min):
+    """dt 이후 처음 돌아오는 작업 시작 시각"""
+    candidate = datetime.combine(dt.date(), datetime.min.time()) + timedelta(minutes=start_min)
+    if candidate < dt:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def skip_blackout(dt):
+    """주문 제한 시간에 걸리면 제한 종료 시각으로 이동"""
+    return market_calendar.blackout_end(dt)
+
+
+class TaskScheduler:
+    """그리드 매매 작업 실행 시각 관리 (최소 힙 + 지연 삭제)"""
+
+    def __init__(self):
+        self.entries = {}   # {sheet_name: {'task': GridTask, 'due', 'seq', 'last_run'}}
+        self._heap = []     # [(due_ts, seq, sheet_name)]
+        self._seq = 0
+        self._restored = {}  # {sheet_name: last_run} 체크포인트에서 복원한 마지막 실행 시각 (sync 시 사용)
+
+    def _push(self, entry, due_ts):
+        self._seq += 1
+        entry['due'] = due_ts
+        entry['seq'] = self._seq
+        heapq.heappush(self._heap, (due_ts, self._seq, entry['task'].sheet_name))
+
+    def _next_due(self, task, earliest_ts):
+        """
+        earliest_ts 이후 실행 가능한 첫 시각 계산
+
+        Returns:
+            float: 실행 시각 (작업 시간대가 주문 제한 시간에 완전히 포함되면 None)
+        """
+        dt = datetime.fromtimestamp(earliest_ts)
+        if task.status == "RUNNING":
+            return max(skip_blackout(dt).timestamp(), earliest_ts)
+        for _ in range(3):
+            if not in_window(minute_of(dt), task.start_min, task.end_min):
+                dt = next_window_start(dt, task.start_min)
+            shifted = skip_blackout(dt)
+            if shifted == dt or in_window(minute_of(shifted), task.start_min, task.end_min):
+                return max(shifted.timestamp(), earliest_ts)
+            dt = shifted
+        return None
+
+    def _schedule(self, entry, earliest_ts):
+        """다음 실행 예약 (실행 가능한 시각이 없으면 예약하지 않음)"""
+        due_ts = self._next_due(entry['task'], earliest_ts)
+        if due_ts is None:
+            entry['due'], entry['seq'] = None, None
+            log(f"⚠️ {entry['task'].sheet_name}: 작업 시간대가 주문 제한 시간과 겹쳐 실행할 수 없음", "⚠️")
+            return
+        self._push(entry, due_ts)
+
+    def sync(self, tasks, now=None):
+        """
+        작업 목록 반영 (새 작업/변경된 작업만 다시 예약)
+
+        Args:
+            tasks: GridTask 목록 (TaskRegistry.grid_tasks)
+            now: 기준 시각 (timestamp)
+        """
+        now = now or time.time()
+        seen = set()
+        for task in tasks:
+            name = task.sheet_name
+            seen.add(name)
+
+            entry = self.entries.get(name)
+            if entry is not None and entry['task'] == task:
+                continue
+
+            last_run = entry['last_run'] if entry else self._restored.pop(name, 0)
+            if task.status == "PAUSED":
+                if entry is None or entry['task'].status != "PAUSED":
+                    log(f"⏸️ {name}: 비활성화 상태 - 스케줄에서 제외", "💤")
+                self.entries[name] = {'task': task, 'due': None, 'seq': None, 'last_run': last_run}
+                continue
+
+            if task.status == "RUNNING":
+                earliest = now
+                log(f"🔥 {name}: RUNNING 상태 - 즉시 실행 예약", "🚀")
+            else:
+                earliest = max(now, last_run + task.interval) if last_run else now
+
+            entry = {'task': task, 'due': None, 'seq': None, 'last_run': last_run}
+            self.entries[name] = entry
+            self._schedule(entry, earliest)
+            if entry['due'] is not None:
+                log(f"📅 {name}: 다음 실행 {datetime.fromtimestamp(entry['due']).strftime('%m-%d %H:%M:%S')}", "⏰")
+
+        for name in list(self.entries):
+            if name not in seen:
+                del self.entries[name]
+
+    def snapshot(self):
+        """체크포인트용 시트별 마지막 실행 시각"""
+        last_runs = dict(self._restored)
+        last_runs.update({name: e['last_run'] for name, e in self.entries.items() if e['last_run']})
+        return last_runs
+
+    def restore(self, last_runs):
+        """
+        체크포인트의 마지막 실행 시각 복원 (다음 sync 에서 작업 간격 기준으로 사용)
+
+        Args:
+            last_runs: {sheet_name: last_run timestamp}
+        """
+        now = time.time()
+        self._restored = {name: ts for name, ts in last_runs.items() if 0 < ts <= now}
+
+    def _peek(self):
+        """유효한 힙 최상단 항목 (지연 삭제된 항목 정리)"""
+        while self._heap:
+            due_ts, seq, name = self._heap[0]
+            entry = self.entries.get(name)
+            if entry is not None and entry['seq'] == seq:
+                return entry
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now=None):
+        """
+        실행 시각이 된 작업 꺼내기 (실행 시각 순)
+
+        Returns:
+            list: 실행할 작업 항목 목록 (complete/retry 로 다시 예약해야 함)
+        """
+        now = now or time.time()
+        due = []
+        while True:
+            entry = self._peek()
+            if entry is None or entry['due'] > now:
+                break
+            heapq.heappop(self._heap)
+            entry['seq'] = None
+            due.append(entry)
+        return due
+
+    def complete(self, entry, started_at):
+        """실행 완료 → 다음 실행 예약 (간격은 실행 시작 시각 기준)"""
+        entry['last_run'] = started_at
+        if self.entries.get(entry['task'].sheet_name) is not entry:
+            return  # 실행 중 작업이 변경/삭제됨
+        task = entry['task']
+        interval = RUNNING_RECHECK_SEC if task.status == "RUNNING" else task.interval
+        self._schedule(entry, max(time.time(), started_at + interval))
+
+    def retry(self, entry, delay=0):
+        """실행하지 못한 작업 재예약"""
+        if self.entries.get(entry['task'].sheet_name) is entry:
+            self._schedule(entry, time.time() + delay)
+
+    def seconds_until_next(self, now=None):
+        """
+        다음 실행까지 남은 시간
+
+        Returns:
+            tuple: (초, 작업 이름) - 예약된 작업이 없으면 (None, None)
+        """
+        entry = self._peek()
+        if entry is None:
+            return None, None
+        return max(0.0, entry['due'] - (now or time.time())), entry['task'].sheet_name
@@ -0,0 +1,293 @@
+"""
+매매 시트 레이아웃 (셀 주소 정의 한 곳)
+필드 이름 → 셀 주소/타입을 선언하고, 필요한 필드 집합을 최소 A1 범위 목록으로 변환
+- 읽기: values_batch_get 1회 요청으로 필요한 셀만 읽고 타입 변환
+- 쓰기: 코드에서는 cell('buy_stop') 처럼 필드 이름으로 주소 참조
+레이아웃이 바뀌면 FIELDS 만 수정
+"""
+
+import re
+
+from utils import safe_int, safe_float
+
+try:
+    from config import RANGE_MERGE_GAP
+except ImportError:
+    RANGE_MERGE_GAP = 1  # 같은 열에서 이 칸 수 이하로 떨어진 셀은 한 범위로 합침
+
+
+_A1_PATTERN = re.compile(r'^([A-Za-z]+)([0-9]+)$')
+
+
+def a1_to_rowcol(label):
+    """
+    A1 주소 → (row, col) (gspread.utils 와 같은 결과, gspread 로드 없이 사용)
+
+    Args:
+        label: 셀 주소 ("AC30")
+    """
+    match = _A1_PATTERN.match(label.strip())
+    if not match:
+        raise ValueError(f"잘못된 셀 주소: {label}")
+    col = 0
+    for ch in match.group(1).upper():
+        col = col * 26 + ord(ch) - ord('A') + 1
+    return int(match.group(2)), col
+
+
+def rowcol_to_a1(row, col):
+    """(row, col) → A1 주소"""
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return f"{letters}{row}"
+
+
+class Field:
+    """시트 필드 (셀 1개 또는 표 범위)"""
+
+    __slots__ = ('name', 'a1', 'kind', 'label')
+
+    def __init__(self, name, a1, kind, label):
+        """
+        Args:
+            name: 필드 이름
+            a1: 셀 주소 ("E18") 또는 범위 ("V6:AC30", kind="table")
+            kind: "str" / "int" / "float" / "bool" / "table"
+            label: 설명
+        """
+        self.name = name
+        self.a1 = a1
+        self.kind = kind
+        self.label = label
+
+    def cells(self):
+        """필드가 차지하는 (row, col) 목록"""
+        if ':' not in self.a1:
+            return [a1_to_rowcol(self.a1)]
+        start, end = self.a1.split(':')
+        r1, c1 = a1_to_rowcol(start)
+        r2, c2 = a1_to_rowcol(end)
+        return [(r, c) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1)]
+
+    def decode(self, values):
+        """
+        셀 값 → 타입 변환
+
+        Args:
+            values: {(row, col): 원본 값}
+        """
+        if self.kind == "table":
+            cells = self.cells()
+            r1, c1 = cells[0]
+            r2, c2 = cells[-1]
+            return [[values.get((r, c), "") for c in range(c1, c2 + 1)] for r in range(r1, r2 + 1)]
+        raw = values.get(self.cells()[0], "")
+        if self.kind == "bool":
+            return str(raw).strip().upper() == "TRUE"
+        if self.kind == "int":
+            text = re.sub(r'[^0-9\-]', '', str(raw))
+            return safe_int(text) if text not in ("", "-") else 0
+        if self.kind == "float":
+            return safe_float(re.sub(r'[^0-9.\-]', '', str(raw)))
+        return str(raw).strip()
+
+
+FIELDS = {f.name: f for f in (
+    Field('acc_no', 'E6', "str", "계좌번호"),
+    Field('acc_cnt', 'E7', "str", "계좌 순번"),
+    Field('ticker', 'E8', "str", "종목 코드"),
+    Field('last_tier', 'E12', "str", "직전 티어"),
+    Field('buy_stop', 'E18', "bool", "매수 중지"),
+    Field('sell_stop', 'E20', "bool", "매도 중지"),
+    Field('chat_id', 'E25', "str", "텔레그램 CHAT_ID"),
+    Field('telegram_token', 'E27', "str", "텔레그램 TOKEN"),
+    Field('tier', 'K6', "str", "현재 티어"),
+    Field('price', 'K8', "float", "현재가"),
+    Field('stock_q', 'K10', "int", "마지막으로 반영한 HTS 잔고"),
+    Field('stock_change', 'K12', "int", "잔고 변화량 (차이 해소 시 0)"),
+    Field('buy_count', 'K14', "int", "매수 체결 횟수"),
+    Field('sell_count', 'K16', "int", "매도 체결 횟수"),
+    Field('reset_date', 'K21', "str", "일일 통계 초기화 날짜"),
+    Field('tiers', 'V6:AC30', "table", "티어 표 (V:티어명 W:잔고 Y:평단가 Z:매수가 AA:매수량 AB:매도가 AC:매도량)"),
+)}
+
+# 일일 통계 초기화 범위 (K14:K17)
+DAILY_STATS_RANGE = 'K14:K17'
+
+# 매매 사이클에서 읽는 필드
+TRADING_FIELDS = ('acc_no', 'acc_cnt', 'ticker', 'last_tier', 'buy_stop', 'sell_stop',
+                  'tier', 'price', 'stock_q', 'stock_change', 'buy_count', 'sell_count', 'reset_date', 'tiers')
+TELEGRAM_FIELDS = ('chat_id', 'telegram_token')
+
+
+def cell(name):
+    """필드 이름 → 셀 주소"""
+    return FIELDS[name].a1
+
+
+def compile_ranges(names, gap=RANGE_MERGE_GAP):
+    """
+    필드 집합 → 최소 A1 범위 목록
+    같은 열의 가까운 셀을 세로로 합친 뒤, 행 구간이 같은 이웃 열을 가로로 합침
+
+    Returns:
+        list: A1 범위 목록 (예: ['E6:E8', 'E12', 'E18:E20', 'K6:K16', 'K21', 'V6:AC30'])
+    """
+    by_col = {}
+    for name in names:
+        for r, c in FIELDS[name].cells():
+            by_col.setdefault(c, set()).add(r)
+
+    spans = []  # (r1, r2, c)
+    for c, rows in by_col.items():
+        rows = sorted(rows)
+        r1 = prev = rows[0]
+        for r in rows[1:]:
+            if r - prev > gap + 1:
+                spans.append((r1, prev, c))
+                r1 = r
+            prev = r
+        spans.append((r1, prev, c))
+
+    rects = []  # [r1, r2, c1, c2]
+    for r1, r2, c in sorted(spans):
+        last = rects[-1] if rects else None
+        if last and last[0] == r1 and last[1] == r2 and last[3] == c - 1:
+            last[3] = c
+        else:
+            rects.append([r1, r2, c, c])
+
+    ranges = []
+    for r1, r2, c1, c2 in sorted(rects, key=lambda x: (x[2], x[0])):
+        start, end = rowcol_to_a1(r1, c1), rowcol_to_a1(r2, c2)
+        ranges.append(start if start == end else f"{start}:{end}")
+    return ranges
+
+
+class ReadPlan:
+    """필드 집합의 읽기 계획 (범위 목록 + 타입 변환)"""
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.ranges = compile_ranges(self.names)
+
+    def cells(self, value_ranges):
+        """
+        values_batch_get 결과 → {(row, col): 값} (범위 안의 빈 셀은 "")
+
+        Args:
+            value_ranges: 범위별 값 목록 (self.ranges 순서)
+        """
+        values = {}
+        for range_name, rows in zip(self.ranges, value_ranges):
+            start, _, end = range_name.partition(':')
+            r1, c1 = a1_to_rowcol(start)
+            r2, c2 = a1_to_rowcol(end or start)
+            for r in range(r1, r2 + 1):
+                row = rows[r - r1] if r - r1 < len(rows) else []
+                for c in range(c1, c2 + 1):
+                    values[(r, c)] = row[c - c1] if c - c1 < len(row) else ""
+        return values
+
+    def decode(self, values):
+        """{(row, col): 값} → {필드 이름: 타입 변환된 값}"""
+        return {name: FIELDS[name].decode(values) for name in self.names}
+
+
+_plans = {}
+
+
+def read_plan(names):
+    """필드 집합의 읽기 계획 (필드 집합별로 한 번만 계산)"""
+    key = tuple(names)
+    if key not in _plans:
+        _plans[key] = ReadPlan(key)
+    return _plans[key]
+
+
+def to_grid(values, rows=30, cols=29):
+    """
+    {(row, col): 값} → A1 부터의 2차원 값 목록 (읽지 않은 셀은 "")
+    티어 검색 등 행/열 번호로 접근하는 코드용
+    """
+    grid = [[""] * cols for _ in range(rows)]
+    for (r, c), value in values.items():
+        if r <= rows and c <= cols:
+            grid[r - 1][c - 1] = value
+    return grid
+
+
+def sheet_float(val):
+    """시트 숫자 정제 ("$1,234.50" → 1234.5, 빈 값은 0.0)"""
+    if not val:
+        return 0.0
+    return safe_float(re.sub(r'[^0-9.]', '', str(val)))
+
+
+def match_tier_by_quantity(sheet_data, hts_stock_q):
+    """
+    HTS 잔고에 가장 가까운 티어 찾기 + 잔고 차이만큼 주문량 보정 (로그 없음, GoogleSheetManager 와 백테스트 공용)
+
+    Args:
+        sheet_data: 시트 전체 데이터
+        hts_stock_q: HTS에서 가져온 실제 보유 수량
+
+    Returns:
+        dict: {
+            'curr_tier': 티어명,
+            'sheet_stock_q': 시트 잔고,
+            'buy_p': 매수가,
+            'buy_q': 보정된 매수량,
+            'sell_p': 매도가,
+            'sell_q': 보정된 매도량,
+            'stock_diff': 잔고 차이 (HTS - 시트),
+            'original_buy_q': 원래 매수량,
+            'original_sell_q': 원래 매도량
+        } (매칭되는 행이 없으면 None)
+    """
+    best_match = None
+    min_diff = float('inf')
+    matched_row = None
+
+    # 1. 가장 가까운 티어 찾기 (범위 매칭)
+    for i in range(5, len(sheet_data)):
+        try:
+            # 빈 행 (to_grid 가 "" 로 채운 칸) 은 0주 티어가 아니므로 건너뜀
+            if not str(sheet_data[i][21]).strip() or not str(sheet_data[i][22]).strip():
+                continue
+            sheet_stock_q = safe_int(sheet_data[i][22])  # W열 (잔고량)
+        except (ValueError, IndexError):
+            continue
+        diff = abs(hts_stock_q - sheet_stock_q)
+        if diff < min_diff:
+            min_diff = diff
+            best_match = sheet_stock_q
+            matched_row = i
+            if diff == 0:  # 정확히 일치하면 즉시 종료
+                break
+
+    if matched_row is None:
+        return None
+
+    # 2. 티어 데이터 추출
+    row = sheet_data[matched_row]
+    original_buy_q = safe_int(re.sub(r'[^0-9]', '', str(row[26])))   # AA열
+    original_sell_q = safe_int(re.sub(r'[^0-9]', '', str(row[28])))  # AC열
+
+    # 3. 잔고 차이만큼 주문량 보정 (양수: 초과보유 → 매수 차감, 음수: 부족보유 → 매도 추가)
+    stock_diff = hts_stock_q - best_match
+    return {
+        'matched_row': matched_row + 1,
+        'row_idx': matched_row + 1,
+        'curr_tier': str(row[21]),                       # V열 (티어명)
+        'sheet_stock_q': best_match,
+        'buy_p': sheet_float(row[25]),                   # Z열 (매수가)
+        'buy_q': max(0, original_buy_q - stock_diff),    # 🔥 보정된 매수량
+        'sell_p': sheet_float(row[27]),                  # AB열 (매도가)
+        'sell_q': max(0, original_sell_q + stock_diff),  # 🔥 보정된 매도량
+        'stock_diff': stock_diff,
+        'original_buy_q': original_buy_q,
+        'original_sell_q': original_sell_q
+    }
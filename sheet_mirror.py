@@ -0,0 +1,188 @@
+"""
+시트 셀 미러 (마지막으로 알려진 셀 값)
+매 사이클 읽는 셀(sheet_layout.TRADING_FIELDS)로 채우고, 쓰기마다 갱신하여
+값이 바뀌지 않는 쓰기는 보내지 않고, 이미 아는 셀 읽기는 요청 없이 반환
+- K6(티어), K8(현재가), E18/E20(매수/매도 중지) 등 매 사이클 같은 값을 쓰는 셀
+- K21(일일 초기화 날짜) 등 스냅샷에 포함된 셀 읽기
+"""
+
+import re
+import threading
+
+from utils import log
+from sheet_layout import a1_to_rowcol, rowcol_to_a1
+
+try:
+    from config import SHEET_MIRROR_ENABLED
+except ImportError:
+    SHEET_MIRROR_ENABLED = True  # 값이 같은 시트 쓰기 생략 여부
+
+
+def normalize(value):
+    """
+    비교용 셀 값 정규화 (표시 형식 차이 무시)
+    True/"TRUE" → "TRUE", 1 / "1" / "1.0" / "1,000" → 숫자 문자열, 그 외 앞뒤 공백 제거
+    """
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if value is None:
+        return ""
+    text = str(value).strip()
+    if text.upper() in ("TRUE", "FALSE"):
+        return text.upper()
+    number = re.sub(r'[,$₩\s]', '', text)
+    try:
+        return repr(float(number))
+    except ValueError:
+        return text
+
+
+def range_cells(range_name):
+    """A1 범위 → 셀 주소 목록 (행 우선) 및 열 수"""
+    if ':' not in range_name:
+        return [range_name.upper()], 1
+    start, end = range_name.split(':')
+    r1, c1 = a1_to_rowcol(start)
+    r2, c2 = a1_to_rowcol(end)
+    cells = [rowcol_to_a1(r, c) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1)]
+    return cells, c2 - c1 + 1
+
+
+class SheetMirror:
+    """워크시트별 마지막으로 알려진 셀 값"""
+
+    def __init__(self, enabled=SHEET_MIRROR_ENABLED):
+        self.enabled = enabled
+        self.cells = {}   # {sheet_name: {a1: 값}}
+        self.skipped = 0  # 생략한 쓰기 수
+        self.written = 0  # 보낸 쓰기 수
+        self._lock = threading.Lock()
+
+    def seed(self, sheet_name, values):
+        """
+        방금 읽은 셀 값으로 갱신 (읽지 않은 셀은 유지)
+
+        Args:
+            values: {(row, col): 값} (sheet_layout.ReadPlan.cells 결과)
+        """
+        with self._lock:
+            known = self.cells.setdefault(sheet_name, {})
+            for (r, c), value in values.items():
+                known[rowcol_to_a1(r, c)] = value
+
+    def lookup(self, sheet_name, cells):
+        """
+        셀 값 조회
+
+        Returns:
+            list: 값 목록 (모르는 셀이 하나라도 있으면 None)
+        """
+        with self._lock:
+            known = self.cells.get(sheet_name, {})
+            if not all(a1 in known for a1 in cells):
+                return None
+            return [known[a1] for a1 in cells]
+
+    def unchanged(self, sheet_name, cells, values):
+        """모든 셀이 이미 같은 값이면 True"""
+        if not self.enabled:
+            return False
+        current = self.lookup(sheet_name, cells)
+        if current is None:
+            return False
+        return all(normalize(a) == normalize(b) for a, b in zip(current, values))
+
+    def remember(self, sheet_name, cells, values):
+        with self._lock:
+            known = self.cells.setdefault(sheet_name, {})
+            for a1, value in zip(cells, values):
+                known[a1] = value
+
+    def forget(self, sheet_name=None):
+        with self._lock:
+            if sheet_name is None:
+                self.cells.clear()
+            else:
+                self.cells.pop(sheet_name, None)
+
+
+class MirroredWorksheet:
+    """
+    gspread Worksheet 래퍼 - 쓰기 전에 미러와 비교, 아는 셀 읽기는 미러에서 반환
+    (그 외 메서드는 원래 워크시트로 전달)
+    """
+
+    def __init__(self, ws, mirror):
+        self._ws = ws
+        self._mirror = mirror
+        self._name = ws.title
+
+    def __getattr__(self, name):
+        return getattr(self._ws, name)
+
+    def _write(self, range_name, values, send):
+        cells, _ = range_cells(range_name)
+        flat = [v for row in values for v in row][:len(cells)]
+        if len(flat) == len(cells) and self._mirror.unchanged(self._name, cells, flat):
+            self._mirror.skipped += 1
+            log(f"{self._name}!{range_name} 값 변화 없음 - 쓰기 생략", "💤")
+            return None
+        result = send()
+        self._mirror.written += 1
+        self._mirror.remember(self._name, cells, flat)
+        return result
+
+    def update(self, *args, **kwargs):
+        """update('K12', [[값]]) / update(range_name=..., values=...) 모두 지원"""
+        range_name = kwargs.get('range_name')
+        values = kwargs.get('values')
+        positional = list(args)
+        if range_name is None and positional and isinstance(positional[0], str):
+            range_name = positional.pop(0)
+        if values is None and positional:
+            values = positional.pop(0)
+        if range_name is None or not isinstance(values, list):
+            return self._ws.update(*args, **kwargs)
+        values = [row if isinstance(row, list) else [row] for row in values]
+        return self._write(range_name, values, lambda: self._ws.update(*args, **kwargs))
+
+    def update_acell(self, label, value):
+        return self._write(label, [[value]], lambda: self._ws.update_acell(label, value))
+
+    def update_cell(self, row, col, value):
+        return self._write(rowcol_to_a1(row, col), [[value]], lambda: self._ws.update_cell(row, col, value))
+
+    def acell(self, label, *args, **kwargs):
+        known = self._mirror.lookup(self._name, [label.upper()])
+        if known is not None and not args and not kwargs:
+            return _Cell(label, known[0])
+        return self._ws.acell(label, *args, **kwargs)
+
+    def get(self, range_name=None, *args, **kwargs):
+        """미러가 범위의 모든 셀을 알고 있으면 요청 없이 반환 (gspread 처럼 뒤쪽 빈 값은 잘라냄)"""
+        if range_name and not args and not kwargs:
+            cells, width = range_cells(range_name)
+            known = self._mirror.lookup(self._name, cells)
+            if known is not None:
+                rows = [list(known[i:i + width]) for i in range(0, len(known), width)]
+                rows = [_rstrip(row) for row in rows]
+                while rows and not rows[-1]:
+                    rows.pop()
+                return rows
+        return self._ws.get(range_name, *args, **kwargs)
+
+
+class _Cell:
+    """acell 결과 대용 (.value 만 사용)"""
+
+    __slots__ = ('label', 'value')
+
+    def __init__(self, label, value):
+        self.label = label
+        self.value = value
+
+
+def _rstrip(row):
+    while row and row[-1] in ("", None):
+        row.pop()
+    return row
@@ -0,0 +1,113 @@
+"""
+시트 I/O 파이프라인
+HTS 화면 조작(GUI)은 메인 스레드에서 순서대로 처리하고,
+구글 시트 읽기/쓰기와 텔레그램 전송은 작업 스레드 풀에서 처리
+- 시트 N의 HTS 조작 중에 시트 N+1 데이터를 미리 읽기 (prefetch)
+- 시트 N의 쓰기는 GUI 단계가 끝나면 비동기로 전송
+- 같은 시트의 작업(읽기/쓰기)은 제출 순서대로 실행 (시트별 레인)
+- 결과는 Future 로 반환
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import log
+from tracer import tracer
+
+try:
+    from config import SHEET_IO_WORKERS, SHEET_IO_TIMEOUT
+except ImportError:
+    SHEET_IO_WORKERS = 4     # 시트/텔레그램 작업 스레드 수
+    SHEET_IO_TIMEOUT = 60    # 결과 대기 최대 시간 (초)
+
+
+# HTS 화면 조작은 한 번에 한 스레드만 (마우스/키보드/클립보드 공유)
+gui_lock = threading.RLock()
+
+
+class SheetPipeline:
+    """시트별 순서를 지키는 비동기 시트 I/O"""
+
+    def __init__(self, sheet_manager, workers=SHEET_IO_WORKERS):
+        self.sheet_manager = sheet_manager
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sheet-io")
+        self._lanes = {}  # {lane: 마지막으로 제출한 Future}
+        self._lock = threading.Lock()
+
+    def submit(self, lane, fn, *args, **kwargs):
+        """
+        작업 제출 (같은 lane 의 이전 작업이 끝난 뒤 실행)
+
+        Args:
+            lane: 순서를 보장할 단위 (시트 이름 등, None이면 순서 무관)
+            fn: 실행할 함수
+
+        Returns:
+            Future: fn 의 반환값
+        """
+        with self._lock:
+            prev = self._lanes.get(lane) if lane is not None else None
+
+            def run():
+                if prev is not None:
+                    # 먼저 제출된 작업이 먼저 꺼내지므로 prev 는 이미 실행 중이거나 완료됨
+                    try:
+                        prev.result()
+                    except Exception:
+                        pass
+                with tracer.span(f"pipeline.{getattr(fn, '__name__', 'task')}"):
+                    return fn(*args, **kwargs)
+
+            future = self.executor.submit(run)
+            if lane is not None:
+                self._lanes[lane] = future
+        return future
+
+    def write(self, sheet_name, fn, *args, **kwargs):
+        """시트 쓰기 (실패는 로그만 남김)"""
+        def guarded():
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                log(f"⚠️ {sheet_name}: 시트 쓰기 실패 ({getattr(fn, '__name__', 'write')}): {e}", "⚠️")
+                return None
+        guarded.__name__ = getattr(fn, '__name__', 'write')
+        return self.submit(sheet_name, guarded)
+
+    def prefetch(self, sheet_name, after_load=None):
+        """
+        시트 데이터 미리 읽기 (같은 시트의 대기 중인 쓰기가 끝난 뒤 읽음)
+
+        Args:
+            sheet_name: 시트 이름
+            after_load: 읽은 뒤 작업 스레드에서 이어서 실행할 함수 fn(data) (일일 초기화 등)
+
+        Returns:
+            Future: load_trading_data 결과
+        """
+        def load():
+            data = self.sheet_manager.load_trading_data(sheet_name)
+            if data and after_load:
+                after_load(data)
+            return data
+        return self.submit(sheet_name, load)
+
+    def result(self, future, default=None, timeout=SHEET_IO_TIMEOUT):
+        """Future 결과 대기 (오류/시간 초과 시 default)"""
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            log(f"⚠️ 시트 작업 결과 대기 실패: {e}", "⚠️")
+            return default
+
+    def flush(self, timeout=SHEET_IO_TIMEOUT):
+        """제출된 모든 작업 완료 대기"""
+        with self._lock:
+            pending = list(self._lanes.values())
+        for future in pending:
+            self.result(future, timeout=timeout)
+
+    def shutdown(self):
+        """남은 작업 완료 후 종료"""
+        self.flush()
+        self.executor.shutdown(wait=True)
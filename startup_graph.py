@@ -0,0 +1,94 @@
+"""
+시작 단계 병렬 실행 (의존성 그래프)
+시트 연결, task.json 검증, HWID 조회, 라이선스 체크 등 서로 독립적인 I/O 단계를
+스레드 풀에서 동시에 실행하고 결과를 다음 단계에 전달
+- 각 단계는 의존 단계가 모두 끝나면 바로 시작 (의존 단계 결과가 인자로 전달됨)
+- 한 단계라도 실패하면 시작하지 않은 단계는 취소하고 예외를 그대로 전달
+- 단계별 시작/종료 시각 로그 (전체 시간 vs 순차 실행 시 예상 시간)
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils import log
+
+try:
+    from config import STARTUP_WORKERS
+except ImportError:
+    STARTUP_WORKERS = 4  # 시작 단계 동시 실행 수
+
+
+class StartupGraph:
+    """시작 단계 의존성 그래프"""
+
+    def __init__(self, workers=STARTUP_WORKERS):
+        self.workers = workers
+        self.steps = {}    # {name: {'label', 'fn', 'deps'}} (추가 순서 유지)
+        self.results = {}  # {name: 결과}
+        self.timings = {}  # {name: (시작, 종료)} (그래프 시작 기준 초, 실행 중이면 종료 None)
+
+    def add(self, name, label, fn, deps=()):
+        """
+        단계 추가
+
+        Args:
+            name: 단계 이름 (결과 키)
+            label: 로그용 이름
+            fn: 실행 함수 (deps 순서대로 의존 단계 결과를 인자로 받음)
+            deps: 먼저 끝나야 하는 단계 이름 목록
+        """
+        for dep in deps:
+            if dep not in self.steps:
+                raise ValueError(f"'{name}' 단계의 의존 단계 '{dep}' 가 먼저 추가되어야 합니다.")
+        self.steps[name] = {'label': label, 'fn': fn, 'deps': tuple(deps)}
+
+    def _call(self, name, origin):
+        step = self.steps[name]
+        start = time.perf_counter()
+        self.timings[name] = (start - origin, None)
+        try:
+            return step['fn'](*(self.results[dep] for dep in step['deps']))
+        finally:
+            self.timings[name] = (start - origin, time.perf_counter() - origin)
+
+    def run(self):
+        """
+        모든 단계 실행
+
+        Returns:
+            dict: {단계 이름: 결과}
+        """
+        origin = time.perf_counter()
+        pending = dict(self.steps)
+        running = {}  # {future: name}
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="startup")
+        try:
+            while pending or running:
+                for name, step in list(pending.items()):
+                    if all(dep in self.results for dep in step['deps']):
+                        running[executor.submit(self._call, name, origin)] = name
+                        del pending[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.results[name] = future.result()  # 실패 시 예외 전달
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.log_timings(time.perf_counter() - origin)
+        return self.results
+
+    def log_timings(self, total):
+        """단계별 소요 시간 로그"""
+        if not self.timings:
+            return
+        serial = sum(end - start for start, end in self.timings.values() if end is not None)
+        lines = [f"시작 단계 완료: {total:.2f}초 (순차 실행 시 {serial:.2f}초)"]
+        for name, step in self.steps.items():
+            start, end = self.timings.get(name, (None, None))
+            if end is not None:
+                lines.append(f"  {step['label']:<14} {start:5.2f}s → {end:5.2f}s ({end - start:.2f}초)")
+            elif start is not None:
+                lines.append(f"  {step['label']:<14} {start:5.2f}s → 중단")
+            else:
+                lines.append(f"  {step['label']:<14} 실행 안 됨")
+        log("\n".join(lines), "⏱️")
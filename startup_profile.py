@@ -0,0 +1,111 @@
+"""
+시작 시간 측정 (python main.py --profile-startup)
+- 모듈별 import 시간 (python -X importtime 과 같은 자기/누적 시간)
+- 시작 단계별 소요 시간 (시트 연결, task.json 검증, 라이선스 체크 등)
+- 지연 로드 대상 모듈 중 시작 시점까지 로드된 모듈
+표준 라이브러리만 사용 (다른 모듈보다 먼저 import 되어야 측정 가능)
+"""
+
+import sys
+import time
+import builtins
+import threading
+from contextlib import contextmanager
+
+PROFILE_FLAG = "--profile-startup"
+REPORT_TOP = 15  # 누적 시간 상위 몇 개 모듈을 보여줄지
+
+# lazy_import 로 지연 로드하는 모듈 (시작 시점에 로드되어 있으면 지연 로드가 깨진 것)
+DEFERRED_MODULES = ("pyautogui", "pyperclip", "pywinauto", "pygetwindow", "psutil", "win32api",
+                    "gspread", "google.oauth2", "telepot", "tkinter", "wmi")
+
+
+class StartupProfiler:
+    """import 시간 및 시작 단계 소요 시간 기록"""
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.imports = []  # [(모듈 이름, 자기 시간 ms, 누적 시간 ms, 깊이)]
+        self.phases = []   # [(단계 이름, 소요 시간 ms)]
+        self._import = None
+        self._local = threading.local()
+
+    def install_if_requested(self, argv):
+        """명령줄에 --profile-startup 이 있으면 import 계측 시작"""
+        if PROFILE_FLAG in argv:
+            self.install()
+
+    def install(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        if self.enabled and builtins.__import__ is self._timed_import:
+            builtins.__import__ = self._import
+        self.enabled = False
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # 이미 로드된 모듈(대부분의 import 문)은 그대로 통과
+        if level or name in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [0.0]  # 하위 import 누적 시간
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            self.imports.append((name, elapsed - frame[0], elapsed, len(stack)))
+
+    @contextmanager
+    def phase(self, name):
+        """시작 단계 소요 시간 측정 (계측 중이 아니면 기록만 생략)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def mark(self, name):
+        """프로세스 시작(이 모듈 로드) 이후 지금까지를 한 단계로 기록"""
+        if self.enabled:
+            done = sum(ms for _, ms in self.phases)
+            self.phases.append((name, (time.perf_counter() - self.origin) * 1000 - done))
+
+    def format_report(self):
+        total = (time.perf_counter() - self.origin) * 1000
+        lines = [f"시작 완료까지 {total:.0f}ms"]
+        for name, ms in self.phases:
+            lines.append(f"  {name:<20} {ms:8.1f}ms")
+
+        top_level = sum(cum for _, _, cum, depth in self.imports if depth == 0)
+        lines.append(f"import {len(self.imports)}개 모듈, {top_level:.0f}ms (누적 상위 {REPORT_TOP}개, 자기 시간 | 누적 시간)")
+        for name, own, cum, depth in sorted(self.imports, key=lambda x: -x[2])[:REPORT_TOP]:
+            lines.append(f"  {own:8.1f} | {cum:8.1f}  {'  ' * depth}{name}")
+
+        loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+        lines.append(f"지연 로드 모듈 중 로드됨: {', '.join(loaded) if loaded else '없음'}")
+        return "\n".join(lines)
+
+    def report(self):
+        """결과 로그 출력 후 계측 종료"""
+        if not self.enabled:
+            return
+        from utils import log
+        self.uninstall()
+        log(f"시작 시간 측정 결과\n{self.format_report()}", "⏱️")
+
+
+startup_profiler = StartupProfiler()
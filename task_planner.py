@@ -0,0 +1,142 @@
+"""
+매매 사이클 실행 순서 계획
+실행 시각이 된 작업을 계좌/종목 전환 비용이 가장 적은 순서로 재배열
+- 전환 비용: HTS 에서 측정한 계좌 선택/종목 입력 소요 시간 (지수 이동 평균)
+- 시트 처리 시간: 전환을 뺀 나머지 (현재가/잔고 조회, 탭 이동, 주문 등)
+- 각 작업은 마감 시각(예약 시각 + 최대 지연) 안에 시작해야 함 → 마감이 급한 작업 우선
+"""
+
+import time
+
+from utils import safe_int
+
+try:
+    from config import PLAN_MAX_DELAY_SEC
+except ImportError:
+    PLAN_MAX_DELAY_SEC = 60  # 재배열로 작업 시작을 늦출 수 있는 최대 시간 (초, 작업 간격이 더 짧으면 간격)
+
+DEFAULT_COSTS = {"account": 3.0, "ticker": 7.5, "sheet": 20.0}  # 측정 전 기본값 (초)
+EWMA_ALPHA = 0.3
+
+
+class TaskPlanner:
+    """계좌/종목 전환 비용 기반 작업 순서 계획"""
+
+    def __init__(self, sheets, max_delay=PLAN_MAX_DELAY_SEC, skip_account=False, skip_ticker=False):
+        """
+        Args:
+            sheets: {sheet_name: {'acc_cnt', 'ticker', ...}} (FillDetector.sheets - 시트를 한 번 읽은 뒤 채워짐)
+            max_delay: 작업별 최대 지연 (초)
+            skip_account: 같은 계좌면 다시 선택하지 않는지 여부 (아니면 시트마다 계좌 선택 비용 발생)
+            skip_ticker: 같은 종목이면 다시 입력하지 않는지 여부 (아니면 시트마다 종목 입력 비용 발생)
+        """
+        self.sheets = sheets
+        self.max_delay = max_delay
+        self.skip_account = skip_account
+        self.skip_ticker = skip_ticker
+        self.costs = dict(DEFAULT_COSTS)
+        self._switch_sec = 0.0   # 현재 시트 처리 중 측정된 전환 시간
+
+    def observe_switch(self, kind, seconds):
+        """HTS 전환 소요 시간 반영 (HTSController.switch_listeners 콜백)"""
+        self._ewma(kind, seconds)
+        self._switch_sec += seconds
+
+    def begin_sheet(self):
+        self._switch_sec = 0.0
+
+    def observe_sheet(self, seconds):
+        """시트 1개 처리 시간 반영 (전환 시간을 뺀 나머지)"""
+        self._ewma("sheet", max(0.0, seconds - self._switch_sec))
+
+    def _ewma(self, kind, seconds):
+        prev = self.costs.get(kind)
+        self.costs[kind] = seconds if prev is None else prev + EWMA_ALPHA * (seconds - prev)
+
+    def position(self, sheet_name):
+        """시트의 (계좌, 종목) - 아직 읽지 않은 시트는 None"""
+        info = self.sheets.get(sheet_name)
+        if info is None:
+            return None
+        return str(safe_int(info['acc_cnt'], 8)), info['ticker']
+
+    def transition_cost(self, current, target):
+        """
+        (계좌, 종목) 상태 전환 비용 (초)
+
+        Args:
+            current: 현재 (계좌, 종목) - 알 수 없으면 None
+            target: 다음 시트의 (계좌, 종목) - 알 수 없으면 None
+        """
+        if current is None or target is None:
+            return self.costs["account"] + self.costs["ticker"]
+        cost = 0.0
+        if current[0] != target[0] or not self.skip_account:
+            cost += self.costs["account"]
+        if current[1] != target[1] or not self.skip_ticker:
+            cost += self.costs["ticker"]
+        return cost
+
+    def estimate(self, entries, current):
+        """순서대로 실행할 때 예상 소요 시간 (초)"""
+        total = 0.0
+        for entry in entries:
+            target = self.position(entry['task'].sheet_name)
+            total += self.transition_cost(current, target) + self.costs["sheet"]
+            current = target
+        return total
+
+    def _deadline(self, entry):
+        task = entry['task']
+        if task.status == "RUNNING":
+            return entry['due']
+        return entry['due'] + min(self.max_delay, task.interval)
+
+    def plan(self, entries, current, now=None):
+        """
+        실행 순서 결정 (탐욕법: 마감을 지킬 수 있는 작업 중 전환 비용이 가장 적은 작업부터)
+
+        Args:
+            entries: TaskScheduler.pop_due 결과 (예약 시각 순)
+            current: HTS 의 현재 (계좌, 종목) - 알 수 없으면 None
+            now: 기준 시각 (timestamp)
+
+        Returns:
+            tuple: (정렬된 항목 목록, 예상 소요 시간, 원래 순서 예상 소요 시간)
+        """
+        now = now or time.time()
+        baseline = self.estimate(entries, current)
+        if len(entries) < 2:
+            return list(entries), baseline, baseline
+
+        remaining = list(entries)
+        ordered = []
+        clock = now
+        state = current
+        while remaining:
+            sheet_cost = self.costs["sheet"]
+
+            def finish(entry):
+                return clock + self.transition_cost(state, self.position(entry['task'].sheet_name)) + sheet_cost
+
+            # 한 작업 더 미루면 마감을 넘기는 작업이 있으면 그중 마감이 가장 빠른 작업
+            urgent = [e for e in remaining if finish(e) > self._deadline(e)]
+            if urgent:
+                chosen = min(urgent, key=lambda e: (self._deadline(e), e['due']))
+            else:
+                chosen = min(remaining, key=lambda e: (finish(e), e['due']))
+            remaining.remove(chosen)
+            ordered.append(chosen)
+            clock = finish(chosen)
+            state = self.position(chosen['task'].sheet_name)
+
+        return ordered, self.estimate(ordered, current), baseline
+
+    def describe(self, entries):
+        """로그용 실행 순서 문자열"""
+        parts = []
+        for entry in entries:
+            name = entry['task'].sheet_name
+            pos = self.position(name)
+            parts.append(f"{name}({pos[0]}|{pos[1]})" if pos else f"{name}(?)")
+        return " → ".join(parts)
@@ -0,0 +1,216 @@
+"""
+작업 파일(task.json) 레지스트리
+파일이 바뀌었을 때만(mtime/size 변경) 다시 읽고, 작업마다 한 번만 파싱/검증하여 레코드로 보관
+- 그리드 매매: "시트명 / 시작 / 종료 / 간격"
+- 자동 로그인: "아이디 / 인증서순번 / 시작 / HTS경로 / 인증서비밀번호"
+- 형식이 잘못된 작업은 파일이 바뀔 때 한 번만 오류를 남기고 제외
+"""
+
+import os
+import json
+
+from utils import log
+
+try:
+    from config import GRID_CONFIG_PATH
+except ImportError:
+    GRID_CONFIG_PATH = "task.json"
+
+
+GRID_TYPE = "그리드 매매"
+LOGIN_TYPE = "자동 로그인"
+
+GRID_STATUSES = ("READY", "RUNNING", "PAUSED")
+LOGIN_STATUSES = ("READY", "RUNNING", "EXECUTED", "PAUSED")
+
+
+class TaskError(ValueError):
+    """작업 형식 오류"""
+
+
+def parse_minutes(text):
+    """
+    "HH:MM" / "HH:MM:SS" → 자정 기준 분
+
+    Raises:
+        TaskError: 형식 오류
+    """
+    parts = str(text).strip().split(':')
+    if len(parts) not in (2, 3) or not all(p.isdigit() for p in parts):
+        raise TaskError(f"시간 형식 오류 '{text}' (HH:MM:SS)")
+    hour, minute = int(parts[0]), int(parts[1])
+    second = int(parts[2]) if len(parts) == 3 else 0
+    if hour > 23 or minute > 59 or second > 59:
+        raise TaskError(f"시간 범위 오류 '{text}'")
+    return hour * 60 + minute
+
+
+def split_details(details):
+    """details 문자열 분리 (구분자 ' / ')"""
+    return [i.strip() for i in str(details or "").split(' / ')]
+
+
+class GridTask:
+    """그리드 매매 작업"""
+
+    __slots__ = ('key', 'sheet_name', 'start_min', 'end_min', 'interval', 'status', 'details')
+
+    def __init__(self, key, task):
+        """
+        Args:
+            key: task.json 내 작업 키 (dict면 키, list면 순번)
+            task: 작업 원본 dict
+
+        Raises:
+            TaskError: 형식 오류
+        """
+        items = split_details(task.get('details'))
+        if len(items) < 4:
+            raise TaskError("details 항목 부족 (시트명 / 시작 / 종료 / 간격)")
+        sheet_name, start_t, end_t, interval = items[:4]
+        if not sheet_name:
+            raise TaskError("시트명 없음")
+        if not interval.isdigit() or int(interval) <= 0:
+            raise TaskError(f"간격 오류 '{interval}' (1초 이상 정수)")
+        status = task.get('status', 'READY')
+        if status not in GRID_STATUSES:
+            raise TaskError(f"상태 오류 '{status}' ({'/'.join(GRID_STATUSES)})")
+
+        self.key = key
+        self.sheet_name = sheet_name
+        self.start_min = parse_minutes(start_t)
+        self.end_min = parse_minutes(end_t)
+        self.interval = int(interval)
+        self.status = status
+        self.details = task.get('details')
+
+    def __eq__(self, other):
+        return isinstance(other, GridTask) and all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    def __repr__(self):
+        return (f"GridTask({self.sheet_name}, {self.start_min // 60:02d}:{self.start_min % 60:02d}"
+                f"~{self.end_min // 60:02d}:{self.end_min % 60:02d}, {self.interval}s, {self.status})")
+
+
+class LoginTask:
+    """자동 로그인 작업"""
+
+    __slots__ = ('key', 'user_id', 'cert_order', 'start_min', 'hts_path', 'cert_pw', 'status')
+
+    def __init__(self, key, task):
+        items = split_details(task.get('details'))
+        if len(items) < 5:
+            raise TaskError("details 항목 부족 (아이디 / 인증서순번 / 시작 / HTS경로 / 인증서비밀번호)")
+        user_id, cert_order, start_t, hts_path, cert_pw = items[:5]
+        if not user_id:
+            raise TaskError("아이디 없음")
+        status = task.get('status', 'READY')
+        if status not in LOGIN_STATUSES:
+            raise TaskError(f"상태 오류 '{status}' ({'/'.join(LOGIN_STATUSES)})")
+
+        self.key = key
+        self.user_id = user_id
+        self.cert_order = cert_order
+        self.start_min = parse_minutes(start_t)
+        self.hts_path = hts_path
+        self.cert_pw = cert_pw
+        self.status = status
+
+    def __repr__(self):
+        return f"LoginTask({self.user_id}, {self.status})"
+
+
+TASK_TYPES = {GRID_TYPE: GridTask, LOGIN_TYPE: LoginTask}
+
+
+class TaskRegistry:
+    """task.json 변경 감지 + 검증된 작업 레코드 보관"""
+
+    def __init__(self, path=GRID_CONFIG_PATH):
+        self.path = path
+        self.grid_tasks = []    # [GridTask]
+        self.login_tasks = []   # [LoginTask]
+        self.errors = []        # [(key, 사유)]
+        self._signature = None  # (mtime_ns, size)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def refresh(self):
+        """
+        파일이 바뀌었으면 다시 읽기
+
+        Returns:
+            bool: 작업 목록이 바뀌었는지 여부
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+
+        if signature is None:
+            log(f"작업 파일({self.path})이 없습니다.", "⚠️")
+            self.grid_tasks, self.login_tasks, self.errors = [], [], []
+            return True
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except Exception as e:
+            # 저장 도중 읽었을 수 있음 → 기존 작업 유지, 다음 변경 때 다시 시도
+            log(f"작업 파일 로드 오류: {e} (기존 작업 유지)", "❌")
+            return False
+
+        self._compile(raw)
+        return True
+
+    def _compile(self, raw):
+        """원본 작업 목록 → 레코드 (잘못된 작업은 오류 1회 기록 후 제외)"""
+        items = raw.items() if isinstance(raw, dict) else enumerate(raw if isinstance(raw, list) else [])
+        grid_tasks, login_tasks, errors = [], [], []
+        sheet_names = set()
+
+        for key, task in items:
+            if not isinstance(task, dict):
+                errors.append((key, "작업 형식 오류 (객체가 아님)"))
+                continue
+            task_type = task.get('type')
+            cls = TASK_TYPES.get(task_type)
+            if cls is None:
+                errors.append((key, f"알 수 없는 작업 종류 '{task_type}'"))
+                continue
+            try:
+                record = cls(key, task)
+            except TaskError as e:
+                errors.append((key, f"{task_type}: {e} - '{task.get('details', '')}'"))
+                continue
+
+            if cls is GridTask:
+                if record.sheet_name in sheet_names:
+                    errors.append((key, f"{task_type}: 시트 '{record.sheet_name}' 중복"))
+                    continue
+                sheet_names.add(record.sheet_name)
+                grid_tasks.append(record)
+            else:
+                login_tasks.append(record)
+
+        self.grid_tasks, self.login_tasks, self.errors = grid_tasks, login_tasks, errors
+        log(f"📋 작업 파일 로드: 그리드 매매 {len(grid_tasks)}개 / 자동 로그인 {len(login_tasks)}개", "📋")
+        for key, reason in errors:
+            log(f"❌ 작업 [{key}] 제외: {reason}", "🚨")
+
+    @property
+    def has_tasks(self):
+        return bool(self.grid_tasks or self.login_tasks)
+
+    def first_user_name(self, default="사용자"):
+        """첫 번째 자동 로그인 작업의 아이디"""
+        return self.login_tasks[0].user_id if self.login_tasks else default
+
+    def first_sheet_name(self):
+        """첫 번째 그리드 매매 작업의 시트명"""
+        return self.grid_tasks[0].sheet_name if self.grid_tasks else None
@@ -5,9 +5,12 @@
 - 일반 사용자: 정의된 메시지만 시트 토큰으로 수신
 """
 
-import telepot
 import time
 from utils import log
+from tracer import traced
+from lazy_import import lazy_module
+
+telepot = lazy_module("telepot")  # 첫 봇 생성 시 로드
 
 # config import는 함수 내에서 동적으로 처리
 
@@ -27,15 +30,8 @@ class TelegramBot:
         self.is_admin = config.IS_ADMIN
         self.admin_token = config.ADMIN_TELEGRAM_TOKEN
         self.admin_chat_id = config.ADMIN_CHAT_ID
-        self.admin_bot = None
-        
-        # 관리자 봇 초기화
-        if self.is_admin and self.admin_token and self.admin_chat_id:
-            try:
-                self.admin_bot = telepot.Bot(self.admin_token)
-                print(f"✅ 관리자 텔레그램 봇 초기화 완료")
-            except Exception as e:
-                print(f"⚠️ 관리자 봇 초기화 실패: {e}")
+        self.admin_bot = None  # 첫 전송 시 생성 (시작 시 telepot 로드 방지)
+        self._admin_pending = bool(self.is_admin and self.admin_token and self.admin_chat_id)
         
         # [사용자용 봇] 동적으로 설정됨 (시트별)
         self.user_token = None
@@ -69,6 +65,18 @@ class TelegramBot:
             print(f"⚠️ 사용자 봇 설정 실패: {e}")
             return False
     
+    def _admin_client(self):
+        """관리자 봇 (첫 사용 시 초기화, 실패하면 다시 시도하지 않음)"""
+        if self._admin_pending:
+            self._admin_pending = False
+            try:
+                self.admin_bot = telepot.Bot(self.admin_token)
+                print(f"✅ 관리자 텔레그램 봇 초기화 완료")
+            except Exception as e:
+                print(f"⚠️ 관리자 봇 초기화 실패: {e}")
+        return self.admin_bot
+    
+    @traced("telegram.send_admin_log")
     def send_admin_log(self, message):
         """
         [관리자에게 로그 전송] 모든 로그 메시지
@@ -79,7 +87,7 @@ class TelegramBot:
         Returns:
             bool: 성공 여부
         """
-        if not self.is_admin or not self.admin_bot:
+        if not self.is_admin or not self._admin_client():
             return False
         
         try:
@@ -98,6 +106,7 @@ class TelegramBot:
             print(f"⚠️ 관리자 로그 전송 실패: {e}")
             return False
     
+    @traced("telegram.send_user_message")
     def send_user_message(self, message):
         """
         [사용자에게 정의된 메시지 전송]
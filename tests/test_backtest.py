@@ -0,0 +1,52 @@
+"""
+backtest.load_tier_csv / GridBacktest 테스트
+티어 표가 25행보다 짧을 때 빈 행이 0주 티어로 매칭되지 않는지 확인
+"""
+
+import csv
+
+import pytest
+
+pytest.importorskip("config")  # order_manager 가 config.py (HTS 좌표) 를 읽음
+
+import backtest
+from backtest import GridBacktest, load_tier_csv
+
+HEADER = ["티어", "잔고", "X", "평단가", "매수가", "매수량", "매도가", "매도량"]
+TIERS = [
+    ["T1", "10", "", "100.00", "$98.00", "10", "$102.00", "10"],
+    ["T2", "20", "", "98.00", "$96.00", "10", "$100.00", "10"],
+    ["T3", "30", "", "96.00", "$94.00", "10", "$98.00", "10"],
+    ["T4", "40", "", "94.00", "$92.00", "10", "$96.00", "10"],
+    ["T5", "50", "", "92.00", "$90.00", "10", "$94.00", "10"],
+]
+
+
+@pytest.fixture
+def tier_csv(tmp_path):
+    path = tmp_path / "tiers.csv"
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows([HEADER] + TIERS)
+    return str(path)
+
+
+def test_grid_keeps_only_rows_read(tier_csv):
+    grid = load_tier_csv(tier_csv)
+    assert len(grid) == 5 + len(TIERS)  # 표 위 5행 + 읽은 티어 행
+    assert [row[21] for row in grid[5:]] == ["T1", "T2", "T3", "T4", "T5"]
+
+
+def test_balance_below_lowest_tier_matches_first_tier(tier_csv):
+    tier = GridBacktest(load_tier_csv(tier_csv), fee_rate=0, cash=0).tier_for(3)
+    assert tier['curr_tier'] == "T1"
+    assert (tier['buy_p'], tier['sell_p'], tier['avg_price']) == (98.0, 102.0, 100.0)
+
+
+@pytest.mark.parametrize("numpy_module", {backtest.np, None})
+def test_run_from_small_balance_buys_first_tier(tier_csv, monkeypatch, numpy_module):
+    monkeypatch.setattr(backtest, "np", numpy_module)
+    engine = GridBacktest(load_tier_csv(tier_csv), fee_rate=0, cash=0)
+    result = engine.run([100.0, 99.0, 97.5, 97.0], balance=3)
+    # 빈 행 (가격 0.0) 에 매칭되면 가격 차이 과다로 매수 금지가 걸림
+    assert result['stop_events'] == []
+    assert result['fills'][0][1:5] == ("BUY", "T1", 98.0, 17)
@@ -0,0 +1,179 @@
+"""
+cluster.Coordinator / WorkerClient 테스트
+XML-RPC 대신 워커의 proxy 를 코디네이터 객체로 바꿔 같은 프로세스에서 여러 워커를 흉내냄
+시각은 가짜 시계로 진행
+"""
+
+import pytest
+
+import cluster
+from task_registry import GridTask, GRID_TYPE
+
+LEASE = 60
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeRegistry:
+    """task.json 대신 메모리의 그리드 매매 작업 목록"""
+
+    def __init__(self, sheet_names):
+        self.grid_tasks = []
+        for name in sheet_names:
+            self.add(name)
+
+    def add(self, sheet_name, status="READY"):
+        task = {'type': GRID_TYPE, 'status': status, 'details': f"{sheet_name} / 00:00 / 23:59 / 60"}
+        self.grid_tasks.append(GridTask(sheet_name, task))
+
+    def refresh(self):
+        return False
+
+
+class BrokenProxy:
+    """연결이 끊긴 코디네이터"""
+
+    def heartbeat(self, *args):
+        raise ConnectionRefusedError("coordinator down")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cluster, "time", fake)
+    monkeypatch.setattr(cluster, "log", lambda *args, **kwargs: None)
+    return fake
+
+
+def make_worker(coordinator, worker_id):
+    worker = cluster.WorkerClient(worker_id=worker_id, heartbeat_sec=15)
+    worker.proxy = coordinator
+    return worker
+
+
+def names(tasks):
+    return sorted(t.sheet_name for t in tasks)
+
+
+def assert_no_overlap(*workers):
+    seen = {}
+    for worker in workers:
+        for name in names(worker.current_tasks()):
+            assert name not in seen, f"{name}: {seen.get(name)} 와 {worker.worker_id} 에 동시 배정"
+            seen[name] = worker.worker_id
+
+
+def test_same_account_ticker_goes_to_same_worker(clock):
+    coordinator = cluster.Coordinator(FakeRegistry(["S1", "S2"]), lease_sec=LEASE)
+    a, b = make_worker(coordinator, "A"), make_worker(coordinator, "B")
+    a.beat()
+    b.beat()
+    a.beat()
+    assert coordinator.leases == {"S1": "A", "S2": "B"}
+
+    # S3 은 S2 와 같은 계좌|종목 → 시트 수가 같아도 (이름 순으로는 A 지만) B 에 배정
+    b.beat({"S2": "2|TQQQ", "S3": "2|TQQQ"})
+    coordinator.registry.add("S3")
+    a.beat()
+    b.beat()
+    assert coordinator.leases["S3"] == "B"
+    assert names(b.current_tasks()) == ["S2", "S3"]
+    assert_no_overlap(a, b)
+
+
+def test_rebalance_waits_for_old_worker_to_hand_back(clock):
+    coordinator = cluster.Coordinator(FakeRegistry(["S1", "S2", "S3", "S4"]), lease_sec=LEASE)
+    a, b = make_worker(coordinator, "A"), make_worker(coordinator, "B")
+    a.beat({"S1": "1|SOXL", "S3": "1|SOXL"})
+    assert names(a.current_tasks()) == ["S1", "S2", "S3", "S4"]
+
+    # B 참여 → A 의 시트 일부가 재배치 대기 (같은 계좌|종목인 S1, S3 은 옮기지 않음)
+    b.beat()
+    assert set(coordinator.draining) == {"S2", "S4"}
+    assert b.current_tasks() == []
+    assert all(coordinator.leases[s] == "A" for s in ("S2", "S4"))
+    assert_no_overlap(a, b)
+
+    # A 가 반납하기 전까지는 B 가 하트비트를 보내도 받지 못함
+    clock.advance(15)
+    b.beat()
+    assert b.current_tasks() == []
+
+    # A 의 하트비트 응답에서 빠짐 → 반납, 다음 B 하트비트에서 배정
+    a.beat()
+    assert names(a.current_tasks()) == ["S1", "S3"]
+    assert_no_overlap(a, b)
+    b.beat()
+    assert names(b.current_tasks()) == ["S2", "S4"]
+    assert coordinator.draining == {}
+    assert_no_overlap(a, b)
+
+
+def test_running_sheet_stays_leased_until_next_beat(clock):
+    coordinator = cluster.Coordinator(FakeRegistry(["S1", "S2"]), lease_sec=LEASE)
+    a, b = make_worker(coordinator, "A"), make_worker(coordinator, "B")
+    a.beat()
+    b.beat()  # A 가 S1, S2 를 가진 상태에서 B 참여 → S2 재배치 대기
+    assert coordinator.draining == {"S2": "A"}
+
+    # A 가 S2 를 실행 중인 채로 하트비트 → 반납 보류
+    a.running = "S2"
+    a.beat()
+    b.beat()
+    assert coordinator.leases["S2"] == "A"
+    assert b.current_tasks() == []
+
+    # 실행이 끝난 뒤 하트비트에서 반납
+    a.running = None
+    a.beat()
+    b.beat()
+    assert names(b.current_tasks()) == ["S2"]
+    assert names(a.current_tasks()) == ["S1"]
+
+
+def test_dead_worker_is_expired_and_sheets_reassigned(clock):
+    coordinator = cluster.Coordinator(FakeRegistry(["S1", "S2"]), lease_sec=LEASE)
+    a, b = make_worker(coordinator, "A"), make_worker(coordinator, "B")
+    a.beat()
+    b.beat()
+    a.beat()
+    b.beat()
+    assert coordinator.leases == {"S1": "A", "S2": "B"}
+
+    # A 응답 없음: LEASE_SEC * DEAD_FACTOR 까지는 유지
+    clock.advance(LEASE * cluster.DEAD_FACTOR)
+    b.beat()
+    assert coordinator.leases["S1"] == "A"
+
+    clock.advance(1)
+    b.beat()
+    assert "A" not in coordinator.workers
+    assert names(b.current_tasks()) == ["S1", "S2"]
+
+
+def test_expired_lease_runs_nothing(clock):
+    coordinator = cluster.Coordinator(FakeRegistry(["S1"]), lease_sec=LEASE)
+    a = make_worker(coordinator, "A")
+    a.beat()
+    assert names(a.current_tasks()) == ["S1"]
+
+    # 코디네이터 연결 끊김 → 임대 갱신 실패
+    a.proxy = BrokenProxy()
+    clock.advance(LEASE - 1)
+    assert a.beat() is False
+    assert names(a.current_tasks()) == ["S1"]
+
+    clock.advance(2)
+    assert a.current_tasks() == []
+    assert a.seconds_until_expiry() is None
+    # 코디네이터는 워커 쪽 만료보다 늦게 (DEAD_FACTOR) 시트를 재배정
+    assert coordinator.leases == {"S1": "A"}
@@ -0,0 +1,46 @@
+"""
+indicators.RSI / rsi_series 가 utils.calculate_rsi 와 같은 값을 내는지 확인
+(Python 3.12+ 의 sum() 보정 합산 포함)
+"""
+
+import random
+
+import indicators
+from indicators import RSI, rsi_series
+from utils import calculate_rsi
+
+# Python 3.13 에서 += 누적 합과 sum() 결과가 달라 46.87 / 46.88 로 갈리던 입력
+SEED_SUM_CASE = [2.2, 1.0, 2.2, 8.8, 5.6, 1.1, 0.4, 2.0999999999999996, 0.2, 1.2000000000000002,
+                 0.4, 4.8999999999999995, 4.199999999999999, 0.7, 0.2]
+
+
+def random_series(rng, length):
+    return [round(rng.uniform(0, 10), 1) + rng.choice((0, 1e-15, -1e-15)) for _ in range(length)]
+
+
+def streaming(prices, period=14):
+    rsi = RSI(period)
+    return [rsi.update(p) for p in prices]
+
+
+def test_seed_sum_matches_builtin_sum():
+    assert streaming(SEED_SUM_CASE)[-1] == calculate_rsi(SEED_SUM_CASE)
+    assert rsi_series(SEED_SUM_CASE)[-1] == calculate_rsi(SEED_SUM_CASE)
+
+
+def test_streaming_matches_calculate_rsi():
+    rng = random.Random(49)
+    for _ in range(2000):
+        prices = random_series(rng, 15 + rng.randrange(20))
+        values = streaming(prices)
+        for i in range(len(prices)):
+            assert values[i] == calculate_rsi(prices[:i + 1]), prices[:i + 1]
+
+
+def test_batch_matches_calculate_rsi(monkeypatch):
+    rng = random.Random(50)
+    series = [random_series(rng, 15 + rng.randrange(30)) for _ in range(500)]
+    for numpy_module in {indicators.np, None}:
+        monkeypatch.setattr(indicators, "np", numpy_module)
+        for prices in series:
+            assert rsi_series(prices) == [calculate_rsi(prices[:i + 1]) for i in range(len(prices))]
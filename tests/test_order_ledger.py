@@ -0,0 +1,130 @@
+"""
+order_ledger.OrderLedger / fill_detector.FillDetector 테스트
+두 시트가 같은 종목을 서로 다른 계좌로 매매할 때 주문/잔고/체결이 섞이지 않는지 확인
+"""
+
+import pytest
+
+import fill_detector
+import order_ledger
+from fill_detector import FillDetector
+from order_ledger import OrderLedger, PENDING, WORKING, FILLED
+
+TICKER = "TQQQ"
+
+
+class FakeWorksheet:
+    def __init__(self):
+        self.writes = []
+
+    def update(self, a1, values):
+        self.writes.append((a1, values[0][0]))
+
+
+class FakeHTS:
+    """계좌별 잔고 / 미체결 목록을 돌려주는 HTS"""
+
+    def __init__(self, accounts):
+        self.accounts = accounts  # {acc_cnt: {'balance': 잔고, 'orders': 미체결 목록}}
+        self.account = None
+
+    def select_account(self, acc_cnt):
+        self.account = acc_cnt
+        return True
+
+    def get_stock_quantity(self, ticker):
+        return self.accounts[self.account]['balance']
+
+
+class FakeOrderManager:
+    def __init__(self, hts, ledger):
+        self.hts = hts
+        self.ledger = ledger
+
+    def check_unfilled_orders(self, ticker):
+        return {'orders': list(self.hts.accounts[self.hts.account]['orders']), 'error': False}
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    monkeypatch.setattr(order_ledger, "log", lambda *args, **kwargs: None)
+    monkeypatch.setattr(fill_detector, "log", lambda *args, **kwargs: None)
+
+
+def place(ledger, acc_cnt, sheet, side, price, qty, balance):
+    order = ledger.record_order(acc_cnt, TICKER, side, price, qty, PENDING, sheet=sheet, balance=balance)
+    ledger.sync_unfilled(acc_cnt, TICKER, [{'side': side, 'price': price, 'remaining': qty, 'order_no': sheet}], balance)
+    return order
+
+
+def test_other_account_sync_leaves_order_working():
+    ledger = OrderLedger(path=None)
+    buy = place(ledger, "1", "A", "BUY", 50.0, 10, balance=10)
+    assert buy['state'] == WORKING
+
+    # 계좌 2 의 미체결 목록 (비어 있음) 과 잔고 → 계좌 1 주문은 체결로 보면 안 됨
+    assert ledger.sync_unfilled("2", TICKER, [], 20) == []
+    assert buy['state'] == WORKING
+    assert ledger.working_orders("1", TICKER) == [buy]
+    assert ledger.working_orders("2", TICKER) == []
+    assert (ledger.balance("1", TICKER), ledger.balance("2", TICKER)) == (10, 20)
+    assert ledger.needs_unfilled_check("1", TICKER, 10) == (True, "미체결 가능 주문 존재")
+    assert ledger.needs_unfilled_check("2", TICKER, 20)[0] is False
+
+    # 계좌 1 에서 미체결이 사라지고 잔고가 늘면 체결
+    fills = ledger.sync_unfilled("1", TICKER, [], 20)
+    assert [(f['acc_cnt'], f['sheet'], f['qty']) for f in fills] == [("1", "A", 10)]
+    assert buy['state'] == FILLED
+
+
+def test_ledger_replay_keeps_accounts_apart(tmp_path):
+    path = str(tmp_path / "ledger.jsonl")
+    ledger = OrderLedger(path=path)
+    place(ledger, "1", "A", "BUY", 50.0, 10, balance=10)
+    place(ledger, "2", "B", "SELL", 55.0, 5, balance=20)
+
+    replayed = OrderLedger(path=path)
+    assert [o['sheet'] for o in replayed.working_orders("1", TICKER)] == ["A"]
+    assert [o['sheet'] for o in replayed.working_orders("2", TICKER)] == ["B"]
+
+
+def test_fill_detector_updates_only_the_account_sheet():
+    ledger = OrderLedger(path=None)
+    hts = FakeHTS({"1": {'balance': 10, 'orders': []}, "2": {'balance': 20, 'orders': []}})
+    detector = FillDetector(hts, FakeOrderManager(hts, ledger))
+    ws_a, ws_b = FakeWorksheet(), FakeWorksheet()
+    detector.register("A", TICKER, "1", ws_a, 10, counts={"BUY": 0, "SELL": 0})
+    detector.register("B", TICKER, "2", ws_b, 20, counts={"BUY": 0, "SELL": 0})
+
+    buy = place(ledger, "1", "A", "BUY", 50.0, 10, balance=10)
+    hts.accounts["1"]['orders'] = [{'side': "BUY", 'price': 50.0, 'remaining': 10, 'order_no': "A"}]
+
+    # 시트 B 체결 확인 → 계좌 2 조회, 시트 A 의 매수 주문은 그대로
+    assert detector.poll("B") == []
+    assert buy['state'] == WORKING
+    assert ws_a.writes == [] and ws_b.writes == []
+
+    # 시트 A 체결 확인 → 계좌 1 에서 체결
+    hts.accounts["1"] = {'balance': 20, 'orders': []}
+    fills = detector.poll("A")
+    assert [(f['sheet'], f['qty']) for f in fills] == [("A", 10)]
+    assert ("K14", 1) in ws_a.writes
+    assert ws_b.writes == []
+
+
+def test_hts_order_fill_goes_to_sheet_of_same_account():
+    ledger = OrderLedger(path=None)
+    hts = FakeHTS({"1": {'balance': 10, 'orders': []}, "2": {'balance': 20, 'orders': []}})
+    detector = FillDetector(hts, FakeOrderManager(hts, ledger))
+    ws_a, ws_b = FakeWorksheet(), FakeWorksheet()
+    detector.register("A", TICKER, "1", ws_a, 10, counts={"BUY": 0, "SELL": 0})
+    detector.register("B", TICKER, "2", ws_b, 20, counts={"BUY": 0, "SELL": 0})
+
+    # 원장에 없던 계좌 2 의 HTS 주문 (시트 정보 없음) → 편입 후 체결되면 시트 B 에 반영
+    hts.accounts["2"]['orders'] = [{'side': "SELL", 'price': 55.0, 'qty': 5, 'remaining': 5, 'order_no': "X1"}]
+    detector.poll("B")
+    hts.accounts["2"] = {'balance': 15, 'orders': []}
+    fills = detector.poll("B")
+    assert [(f['acc_cnt'], f['sheet'], f['qty']) for f in fills] == [("2", None, 5)]
+    assert ("K16", 1) in ws_b.writes
+    assert ws_a.writes == []
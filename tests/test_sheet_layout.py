@@ -0,0 +1,52 @@
+"""
+sheet_layout.match_tier_by_quantity 테스트
+load_trading_data 와 같이 to_grid 로 만든 30×29 격자 (빈 칸은 "") 를 사용
+"""
+
+from sheet_layout import FIELDS, a1_to_rowcol, to_grid, match_tier_by_quantity
+
+# 티어명, 잔고, X, 평단가, 매수가, 매수량, 매도가, 매도량 (V:AC)
+TIERS = [
+    ["T1", "10", "", "$100.00", "$98.00", "10", "$102.00", "10"],
+    ["T2", "20", "", "$98.00", "$96.00", "10", "$100.00", "10"],
+    ["T3", "30", "", "$96.00", "$94.00", "10", "$98.00", "10"],
+    ["T4", "40", "", "$94.00", "$92.00", "10", "$96.00", "10"],
+    ["T5", "50", "", "$92.00", "$90.00", "10", "$94.00", "10"],
+]
+
+
+def tier_grid(rows):
+    top, left = a1_to_rowcol(FIELDS['tiers'].a1.split(':')[0])
+    values = {}
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            values[(top + r, left + c)] = value
+    return to_grid(values)
+
+
+def test_balance_below_lowest_tier_matches_first_tier():
+    # 티어 표 아래 빈 행 (잔고 "") 이 0주 티어로 매칭되면 안 됨
+    tier = match_tier_by_quantity(tier_grid(TIERS), 3)
+    assert tier['curr_tier'] == "T1"
+    assert tier['sheet_stock_q'] == 10
+    assert (tier['buy_p'], tier['sell_p']) == (98.0, 102.0)
+    assert tier['stock_diff'] == -7
+    assert (tier['buy_q'], tier['sell_q']) == (17, 3)
+
+
+def test_exact_and_range_match():
+    grid = tier_grid(TIERS)
+    assert match_tier_by_quantity(grid, 30)['curr_tier'] == "T3"
+    tier = match_tier_by_quantity(grid, 52)
+    assert (tier['curr_tier'], tier['stock_diff'], tier['buy_q'], tier['sell_q']) == ("T5", 2, 8, 12)
+
+
+def test_zero_share_tier_still_matches():
+    rows = [["T0", "0", "", "", "$100.00", "10", "", "0"]] + TIERS
+    tier = match_tier_by_quantity(tier_grid(rows), 0)
+    assert tier['curr_tier'] == "T0"
+    assert tier['row_idx'] == 6
+
+
+def test_empty_table_matches_nothing():
+    assert match_tier_by_quantity(tier_grid([]), 3) is None
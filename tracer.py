@@ -0,0 +1,228 @@
+"""
+구간(span) 계측 모듈
+HTS 조작, 주문, 시트 I/O, 텔레그램 전송 등 핫패스 구간별 소요 시간 기록
+- 비활성화 시 거의 오버헤드 없음 (플래그 확인 1회)
+- 사이클 단위 링버퍼 + 구간별 롤링 히스토그램
+- Chrome trace-event JSON 내보내기 (chrome://tracing, Perfetto 에서 열기)
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+
+try:
+    from config import TRACE_ENABLED, TRACE_MAX_CYCLES, TRACE_HISTOGRAM_SIZE
+except ImportError:
+    TRACE_ENABLED = False
+    TRACE_MAX_CYCLES = 50
+    TRACE_HISTOGRAM_SIZE = 500
+
+
+class _NullSpan:
+    """비활성화 상태에서 사용하는 빈 컨텍스트 매니저"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """실제 계측 구간"""
+
+    __slots__ = ('tracer', 'name', 'start', 'depth')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+        self.start = 0
+        self.depth = 0
+
+    def __enter__(self):
+        local = self.tracer._local
+        self.depth = getattr(local, 'depth', 0)
+        local.depth = self.depth + 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.tracer._local.depth = self.depth
+        self.tracer._record(self.name, self.start, end - self.start, self.depth, exc_type is not None)
+        return False
+
+
+class SpanTracer:
+    """구간 계측기 (사이클별 링버퍼 + 구간별 히스토그램)"""
+
+    def __init__(self, enabled=TRACE_ENABLED, max_cycles=TRACE_MAX_CYCLES, histogram_size=TRACE_HISTOGRAM_SIZE):
+        self.enabled = bool(enabled)
+        self.cycles = deque(maxlen=max_cycles)  # [{'cycle': n, 'start': ns, 'events': [...]}]
+        self.histograms = {}  # {span_name: deque(소요시간 ms)}
+        self.histogram_size = histogram_size
+        self.cycle_no = 0
+        self._current = None
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, enabled=True):
+        """계측 활성화/비활성화"""
+        self.enabled = bool(enabled)
+
+    def span(self, name):
+        """
+        구간 계측 컨텍스트 매니저
+
+        사용 예:
+            with tracer.span("sheet.load"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def begin_cycle(self):
+        """새 사이클 시작 (이전 사이클은 링버퍼에 보관)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.cycle_no += 1
+            self._current = {'cycle': self.cycle_no, 'start': time.perf_counter_ns(), 'events': []}
+            self.cycles.append(self._current)
+
+    def end_cycle(self):
+        """현재 사이클 종료 및 소요 시간 반환 (ms)"""
+        if not self.enabled or self._current is None:
+            return None
+        with self._lock:
+            elapsed_ms = (time.perf_counter_ns() - self._current['start']) / 1e6
+            self._current['elapsed_ms'] = elapsed_ms
+            self._current = None
+        return elapsed_ms
+
+    def _record(self, name, start_ns, dur_ns, depth, failed):
+        """구간 종료 시 이벤트 기록"""
+        dur_ms = dur_ns / 1e6
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = deque(maxlen=self.histogram_size)
+            hist.append(dur_ms)
+
+            if self._current is not None:
+                self._current['events'].append({
+                    'name': name,
+                    'ts': start_ns,
+                    'dur': dur_ns,
+                    'depth': depth,
+                    'tid': threading.get_ident(),
+                    'error': failed
+                })
+
+    def summary(self):
+        """
+        구간별 통계
+
+        Returns:
+            dict: {span_name: {'count', 'mean', 'p50', 'p95', 'max'}} (단위 ms)
+        """
+        with self._lock:
+            snapshot = {name: sorted(hist) for name, hist in self.histograms.items()}
+
+        result = {}
+        for name, values in snapshot.items():
+            if not values:
+                continue
+            n = len(values)
+            result[name] = {
+                'count': n,
+                'mean': sum(values) / n,
+                'p50': values[(n - 1) // 2],
+                'p95': values[min(n - 1, int(n * 0.95))],
+                'max': values[-1]
+            }
+        return result
+
+    def format_summary(self, top=15):
+        """로그 출력용 통계 문자열 (총 소요 시간 기준 상위 N개)"""
+        stats = self.summary()
+        ordered = sorted(stats.items(), key=lambda kv: kv[1]['mean'] * kv[1]['count'], reverse=True)
+        lines = [f"{'구간':<36}{'횟수':>6}{'평균':>10}{'p50':>10}{'p95':>10}{'최대':>10}"]
+        for name, s in ordered[:top]:
+            lines.append(
+                f"{name:<36}{s['count']:>6}{s['mean']:>10.1f}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['max']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def to_chrome_trace(self, cycle_no=None):
+        """
+        Chrome trace-event 형식으로 변환
+
+        Args:
+            cycle_no: 내보낼 사이클 번호 (None이면 링버퍼 전체)
+
+        Returns:
+            dict: {'traceEvents': [...]}
+        """
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            cycles = [c for c in self.cycles if cycle_no is None or c['cycle'] == cycle_no]
+            for cycle in cycles:
+                for ev in cycle['events']:
+                    events.append({
+                        'name': ev['name'],
+                        'cat': ev['name'].split('.', 1)[0],
+                        'ph': 'X',
+                        'ts': (ev['ts'] - self._origin) / 1000.0,
+                        'dur': ev['dur'] / 1000.0,
+                        'pid': pid,
+                        'tid': ev['tid'],
+                        'args': {'cycle': cycle['cycle'], 'depth': ev['depth'], 'error': ev['error']}
+                    })
+        events.sort(key=lambda e: (e['ts'], -e['dur']))
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path, cycle_no=None):
+        """Chrome trace-event JSON 파일로 저장"""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(cycle_no), f, ensure_ascii=False)
+        return path
+
+    def traced(self, name=None):
+        """
+        함수/메서드 계측 데코레이터
+
+        Args:
+            name: 구간 이름 (None이면 함수의 qualname)
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, span_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+        return decorator
+
+
+# 전역 계측기 인스턴스
+tracer = SpanTracer()
+traced = tracer.traced
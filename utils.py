@@ -4,46 +4,22 @@ RSI 계산, 시장 시간 체크, 해상도 관리, 로그 저장 등
 """
 
 import os
-import json
 from datetime import datetime
-import win32con
-from win32api import EnumDisplaySettings, ChangeDisplaySettings
-from win32con import ENUM_CURRENT_SETTINGS
+
+from lazy_import import lazy_module
+
+win32api = lazy_module("win32api")  # 해상도 변경 시에만 로드
+win32con = lazy_module("win32con")
 
 # 설정값 로드
 try:
-    from config import MARKET_TIMES, RESOLUTION_WIDTH, RESOLUTION_HEIGHT, USER_NAME, GRID_CONFIG_PATH
+    from config import RESOLUTION_WIDTH, RESOLUTION_HEIGHT, USER_NAME, GRID_CONFIG_PATH
 except ImportError:
-    MARKET_TIMES = {"PRE": ["18:00", "23:30"], "REGULAR": ["23:30", "06:00"], "AFTER": ["06:00", "10:00"]}
     RESOLUTION_WIDTH, RESOLUTION_HEIGHT = 1280, 720
     USER_NAME = "사용자"
     GRID_CONFIG_PATH = "task.json"
 
 
-def get_first_user_name():
-    """task.json의 첫 번째 자동 로그인 항목에서 사용자 이름을 추출"""
-    if not os.path.exists(GRID_CONFIG_PATH):
-        return "사용자"
-
-    try:
-        with open(GRID_CONFIG_PATH, 'r', encoding='utf-8') as f:
-            tasks = json.load(f)
-
-        task_list = list(tasks.values()) if isinstance(tasks, dict) else tasks
-
-        for task in task_list:
-            if task.get('type') == "자동 로그인":
-                details = task.get('details', "")
-                items = [i.strip() for i in details.split(' / ')]  # 🔥 구분자 통일
-                if items:
-                    return items[0]
-
-        return "사용자"
-    except Exception as e:
-        print(f"❌ 사용자 이름 추출 오류: {e}")
-        return "사용자"
-
-
 def calculate_rsi(prices, period=14):
     """순수 파이썬 RSI 계산 (Wilder's Smoothing)"""
     if not prices or len(prices) <= period:
@@ -68,19 +44,10 @@ def calculate_rsi(prices, period=14):
     return round(rsi, 2)
 
 
-def get_market_session():
-    """현재 미국 시장 세션 반환"""
-    now = datetime.now()
-    current_time = now.strftime("%H:%M")
-
-    if MARKET_TIMES["PRE"][0] <= current_time < MARKET_TIMES["PRE"][1]:
-        return "PRE"
-    elif current_time >= MARKET_TIMES["REGULAR"][0] or current_time < MARKET_TIMES["REGULAR"][1]:
-        return "REGULAR"
-    elif MARKET_TIMES["AFTER"][0] <= current_time < MARKET_TIMES["AFTER"][1]:
-        return "AFTER"
-    else:
-        return "CLOSED"
+def get_market_session(now=None):
+    """현재 미국 시장 세션 반환 (PRE / REGULAR / AFTER / CLOSED - 휴장일, 서머타임 반영)"""
+    from market_calendar import market_calendar
+    return market_calendar.session(now)
 
 
 class DisplayManager:
@@ -88,7 +55,7 @@ class DisplayManager:
 
     def __init__(self):
         try:
-            self.original_settings = EnumDisplaySettings(None, ENUM_CURRENT_SETTINGS)
+            self.original_settings = win32api.EnumDisplaySettings(None, win32con.ENUM_CURRENT_SETTINGS)
             print(f"   >> 원래 해상도 저장: {self.original_settings.PelsWidth}x{self.original_settings.PelsHeight}")
         except:
             self.original_settings = None
@@ -98,11 +65,11 @@ class DisplayManager:
         height = height or RESOLUTION_HEIGHT
 
         try:
-            devmode = EnumDisplaySettings(None, ENUM_CURRENT_SETTINGS)
+            devmode = win32api.EnumDisplaySettings(None, win32con.ENUM_CURRENT_SETTINGS)
             devmode.PelsWidth = width
             devmode.PelsHeight = height
             devmode.Fields = win32con.DM_PELSWIDTH | win32con.DM_PELSHEIGHT
-            ChangeDisplaySettings(devmode, 0)
+            win32api.ChangeDisplaySettings(devmode, 0)
             log(f"🖥️ 해상도 변경 완료: {width}x{height}", "✅")
         except Exception as e:
             print(f"   ⚠️ 해상도 변경 실패: {e}")
@@ -110,7 +77,7 @@ class DisplayManager:
     def restore_resolution(self):
         if not self.original_settings: return
         try:
-            ChangeDisplaySettings(self.original_settings, 0)
+            win32api.ChangeDisplaySettings(self.original_settings, 0)
             log("🖥️ 해상도 복구 완료", "✅")
         except Exception as e:
             print(f"   >> 해상도 복구 오류: {e}")